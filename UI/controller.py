@@ -1,18 +1,20 @@
+from database.DAO import DAO
+from database.DAO_async import DAOAsync
 from model.creascheda import Model as CreaSchedaModel
 from model.adattaScheda import TrainingAlgorithm, PerformanceData, DOMSData
 from model.trainingweek import TrainingWeek
-from copy import deepcopy
 from collections import defaultdict
+from datetime import datetime
+import random
 import re
-import traceback
 from model.daily_readiness_adjuster import DailyReadinessAdjuster, ReadinessInput, WorkoutAdjustment
-import re
-from collections import defaultdict
-import traceback
+from model.logging_config import get_logger
 
 from UI.progress_view import *
 from model.workoutday import WorkoutDay
 
+logger = get_logger("controller")
+
 
 class Controller:
     def __init__(self):
@@ -26,12 +28,20 @@ class Controller:
         self.current_day_index = -1
         self.config_values = {}
         self.volume_history = {}
+        self.volume_overrides = None  # volumi con cui è stata generata la settimana corrente (None in settimana 1)
+        self.seme_mesociclo = None  # seme da cui derivano le settimane del mesociclo, per rigenerarle alla ripresa
         # Aggiunta per la nuova vista
         self.progress_view = None
         self.exercise_name_map = {}
         self.exercise_details_map = {}  # Mappa con i dettagli completi degli esercizi
         self.nutrition_view = None  # Aggiungi riferimento alla TDEE View
         self.context = None
+        # Progressi salvati sul database: l'app non ha ancora utenti, si usa un utente unico
+        self.utente = "default"
+        self.mesociclo_id = None  # id del mesociclo attivo sul database (None finché non è stato aperto)
+        # Scritture non riuscite, come (operazione, argomenti senza mesociclo_id), ritentate in ordine
+        # prima di ogni nuovo salvataggio: i progressivi restano contigui e gli inserimenti sono ripetibili
+        self._scritture_in_sospeso = []
 
     def handle_navigation_change(self, e):
         selected_index = e.control.selected_index
@@ -48,9 +58,7 @@ class Controller:
             try:
                 self._prepare_and_show_progress()
             except Exception as ex:
-                print("--- ERRORE DURANTE LA PREPARAZIONE DELLA VISTA PROGRESSI ---")
-                traceback.print_exc()
-                print("---------------------------------------------------------")
+                logger.exception("Errore durante la preparazione della vista progressi")
                 if hasattr(self.progress_view, 'show_error'):
                     self.progress_view.show_error(f"Impossibile caricare i dati: {ex}")
 
@@ -83,7 +91,7 @@ class Controller:
             for ex_id in exercise_ids:
                 exercise_obj = self.exercise_details_map.get(ex_id)
                 if exercise_obj and exercise_obj.range_ripetizioni:
-                    low_rep, _ = CreaSchedaModel.parse_rep_range(exercise_obj.range_ripetizioni)
+                    low_rep, _ = exercise_obj.range_ripetizioni
                     if low_rep < min_rep:
                         min_rep = low_rep
                         heavy_exercise_id = ex_id
@@ -132,6 +140,8 @@ class Controller:
     def set_view(self, view):
         self.view = view
         self.carica_opzioni_iniziali()
+        # la ripresa legge dal database: gira sull'event loop di Flet senza bloccare l'interfaccia
+        self.view.page.run_task(self.carica_mesociclo_attivo)
 
     def carica_opzioni_iniziali(self):
         try:
@@ -144,20 +154,116 @@ class Controller:
             if self.view:
                 self.view.show_snackbar(f"Errore nel caricamento iniziale: {ex}", ft.Colors.RED)
 
-    def aggiorna_opzioni_frequenza(self, esperienza: str):
+    async def carica_mesociclo_attivo(self):
+        """
+        Riprende il mesociclo attivo dell'utente: performance e DOMS sono letti con una sola query in un
+        thread del DAO e l'algoritmo viene ricostruito su quei dati. Se col mesociclo è salvato anche lo stato
+        del piano (configurazione, seme, settimana e giorno), la settimana corrente viene rigenerata con lo
+        stesso seme e si riparte dal giorno in cui ci si era fermati.
+        """
         try:
-            if esperienza == "principiante":
-                self.view.dd_frequenza.options = [ft.dropdown.Option("2"), ft.dropdown.Option("3")]
-                self.view.dd_frequenza.value = "3"
+            salvato = await DAOAsync.caricaMesocicloAttivo(self.utente)
+        except Exception as ex:
+            logger.warning("Caricamento del mesociclo attivo non riuscito: %s", ex)
+            if self.view:
+                self.view.show_snackbar(f"Progressi salvati non disponibili: {ex}", ft.Colors.ORANGE)
+            return
+        if salvato is None:
+            return
+        self.mesociclo_id, stato, performance_data, doms_data = salvato
+        if not self.exercise_details_map:
+            self.exercise_details_map = await self.crea_scheda_model.get_all_exercises_details_map_async()
+            self.exercise_name_map = {ex_id: ex.nome for ex_id, ex in self.exercise_details_map.items()}
+        self.training_algo = TrainingAlgorithm(performance_data=performance_data, doms_data=doms_data,
+                                               exercise_details_map=self.exercise_details_map)
+        logger.info("Mesociclo %s ricaricato: %d sessioni, %d valori DOMS", self.mesociclo_id,
+                    self.training_algo.archivio.numero_sessioni, self.training_algo.archivio.numero_doms)
+        if stato and self.view:
+            await self._riprendi_mesociclo(stato)
+
+    async def _riprendi_mesociclo(self, stato):
+        """Ripristina dallo stato salvato la posizione nel piano e rigenera la settimana corrente."""
+        try:
+            self.config_values = stato["config_values"]
+            self.seme_mesociclo = stato["seme"]
+            self.volume_history = {int(settimana): volumi for settimana, volumi in stato["volume_history"].items()}
+            self.volume_overrides = stato["volume_overrides"]
+            self.current_week_num = stato["settimana_corrente"]
+            data_inizio = datetime.fromisoformat(stato["data_inizio"]) if stato["data_inizio"] else None
+            params = self._get_scheda_params(self.volume_overrides, self.current_week_num, data_inizio)
+            if self.config_values["esperienza"] == "principiante":
+                self.training_week = await self.crea_scheda_model.getSchedaFullBodyPrincipiante_async(**params)
             else:
-                self.view.dd_frequenza.options = [ft.dropdown.Option("3"), ft.dropdown.Option("4")]
-                self.view.dd_frequenza.value = "3"
+                self.training_week = await self.crea_scheda_model.getSchedaFullBodyIntermedio_async(**params)
+            if self.current_week_num > 1:
+                # la fine delle settimane successive usa gli SFR della settimana 1
+                self.training_algo.calcola_sfr_settimana_1()
+        except Exception as ex:
+            logger.exception("Ripresa del mesociclo %s non riuscita", self.mesociclo_id)
+            self.view.show_snackbar(f"Impossibile riprendere il mesociclo salvato: {ex}", ft.Colors.ORANGE)
+            return
+        self.view.show_snackbar(f"Mesociclo ripreso dalla settimana {self.current_week_num}", ft.Colors.GREEN)
+        # prosegui_al_prossimo_giorno avanza di uno: si riparte dal giorno salvato
+        self.current_day_index = stato["giorno_corrente"] - 1
+        self.prosegui_al_prossimo_giorno()
+
+    def _stato_mesociclo(self) -> dict:
+        """Stato del piano salvato col mesociclo; copiato qui perché le scritture possono essere ritentate più tardi."""
+        return {"config_values": dict(self.config_values), "seme": self.seme_mesociclo,
+                "settimana_corrente": self.current_week_num, "giorno_corrente": self.current_day_index,
+                "volume_history": {str(settimana): dict(volumi) for settimana, volumi in self.volume_history.items()},
+                "volume_overrides": dict(self.volume_overrides) if self.volume_overrides else None,
+                "data_inizio": self.training_week.start_date.isoformat() if self.training_week else None}
+
+    def _salva_stato(self):
+        self._scrivi_su_db(DAO.salvaStatoMesociclo, self._stato_mesociclo())
+
+    def _scrivi_su_db(self, operazione, *args) -> bool:
+        """
+        Accoda una scrittura dei progressi sul mesociclo attivo e prova a eseguire tutte quelle in sospeso.
+        Dello stato conta solo l'ultimo: quello ancora in coda viene sostituito. Restituisce True se il
+        database è allineato.
+        """
+        if operazione is DAO.salvaStatoMesociclo:
+            self._scritture_in_sospeso = [(o, a) for o, a in self._scritture_in_sospeso
+                                          if o is not DAO.salvaStatoMesociclo]
+        self._scritture_in_sospeso.append((operazione, args))
+        return self._svuota_scritture_in_sospeso()
+
+    def _svuota_scritture_in_sospeso(self) -> bool:
+        """
+        Esegue in ordine le scritture in sospeso, aprendo prima il mesociclo sul database se non è ancora
+        stato aperto. Al primo errore si ferma: le scritture rimaste vengono ritentate al prossimo salvataggio
+        e l'allenamento prosegue in memoria. Restituisce True se non resta nulla in sospeso.
+        """
+        try:
+            if self.mesociclo_id is None:
+                self.mesociclo_id = DAO.apriMesociclo(self.utente, self._stato_mesociclo())
+            while self._scritture_in_sospeso:
+                operazione, args = self._scritture_in_sospeso[0]
+                operazione(self.mesociclo_id, *args)
+                self._scritture_in_sospeso.pop(0)
+            return True
+        except Exception as ex:
+            logger.warning("Salvataggio dei progressi sul database non riuscito (%d scritture in sospeso): %s",
+                           len(self._scritture_in_sospeso), ex)
+            if self.view:
+                self.view.show_snackbar(f"Progressi non sincronizzati con il database, verranno ritentati "
+                                        f"al prossimo salvataggio: {ex}", ft.Colors.ORANGE)
+            return False
+
+    def aggiorna_opzioni_frequenza(self, esperienza: str):
+        try:
+            livello = "principiante" if esperienza == "principiante" else "intermedio"
+            frequenze = self.crea_scheda_model.FREQUENZE_SUPPORTATE[livello]
+            self.view.dd_frequenza.options = [ft.dropdown.Option(str(giorni)) for giorni in frequenze]
+            self.view.dd_frequenza.value = "3"
             self.view.update_view()
         except Exception as ex:
             if self.view:
                 self.view.show_snackbar(f"Errore nell'aggiornamento frequenza: {ex}", ft.Colors.RED)
 
-    def handle_crea_scheda(self, e):
+    async def handle_crea_scheda(self, e):
         self.config_values = self.view.get_config_values()
         if not all(self.config_values.values()):
             self.view.show_snackbar("Per favore, compila tutti i campi!", "error")
@@ -167,18 +273,19 @@ class Controller:
         self.view.update_view()
 
         try:
-            # Carica i dettagli degli esercizi se non già presenti
+            # Carica i dettagli degli esercizi se non già presenti (senza bloccare l'interfaccia)
             if not self.exercise_details_map:
-                self.exercise_details_map = self.crea_scheda_model.get_all_exercises_details_map()
+                self.exercise_details_map = await self.crea_scheda_model.get_all_exercises_details_map_async()
                 self.exercise_name_map = {ex_id: ex.nome for ex_id, ex in self.exercise_details_map.items()}
 
-            # Genera la scheda in base all'esperienza
+            # Genera la scheda in base all'esperienza, con un seme nuovo per il mesociclo
             esperienza = self.config_values["esperienza"]
-            params = self._get_scheda_params()
+            seme = random.randrange(2 ** 31)
+            params = self._get_scheda_params(seme=seme)
             if esperienza == "principiante":
-                self.training_week = self.crea_scheda_model.getSchedaFullBodyPrincipiante(**params)
+                self.training_week = await self.crea_scheda_model.getSchedaFullBodyPrincipiante_async(**params)
             else:
-                self.training_week = self.crea_scheda_model.getSchedaFullBodyIntermedio(**params)
+                self.training_week = await self.crea_scheda_model.getSchedaFullBodyIntermedio_async(**params)
 
             # Controlla che la scheda sia stata creata correttamente
             if not self.training_week or not any(day.esercizi for day in self.training_week.workout_days):
@@ -188,6 +295,7 @@ class Controller:
                 self.view.update_view()
                 return
 
+            self.seme_mesociclo = seme
             self._reset_ciclo()
             self.view.show_snackbar("Scheda creata con successo!", "success")
             self.prosegui_al_prossimo_giorno()
@@ -201,7 +309,7 @@ class Controller:
             self.view.update_view()
 
     def handle_salva_performance(self, e):
-        print("\n--- DEBUG: Chiamato handle_salva_performance ---")  # <--- AGGIUNGI
+        logger.debug("Chiamato handle_salva_performance")
         performance_list_raw = self.view.get_performance_data_from_cards()
         if not performance_list_raw:
             self.view.show_snackbar("Nessuna performance inserita. Compila almeno una serie.", ft.Colors.ORANGE)
@@ -209,6 +317,7 @@ class Controller:
         self.view.btn_salva_performance.disabled = True
         self.view.update_view()
         try:
+            performances = []
             for p_data in performance_list_raw:
                 if not p_data["sets"]: continue
                 if "muscolo_primario" not in p_data:
@@ -221,15 +330,23 @@ class Controller:
                                               mmc=int(p_data["controls"]["mmc"].value),
                                               pump=int(p_data["controls"]["pump"].value),
                                               dolori_articolari=int(p_data["controls"]["dolori"].value))
+                performances.append(performance)
+            primo_progressivo = self.training_algo.archivio.numero_sessioni + 1
+            for performance in performances:
                 self.training_algo.aggiungi_performance(self.current_week_num, performance)
-            self.view.show_snackbar("Performance del giorno salvate!", ft.Colors.GREEN)
-            print("--- DEBUG: Performance salvate, chiamo prosegui_al_prossimo_giorno ---") # <--- AGGIUNGI
+            # tutte le serie della giornata in un unico inserimento batch
+            if performances and not self._scrivi_su_db(DAO.salvaPerformance, self.current_week_num,
+                                                        primo_progressivo, performances):
+                self.view.show_snackbar("Performance del giorno salvate solo in locale.", ft.Colors.ORANGE)
+            else:
+                self.view.show_snackbar("Performance del giorno salvate!", ft.Colors.GREEN)
+            logger.debug("Performance salvate, chiamo prosegui_al_prossimo_giorno")
             self.prosegui_al_prossimo_giorno()
         except (ValueError, TypeError) as ex:
-            print(f"--- DEBUG: ERRORE in handle_salva_performance: {ex} ---")  # <--- AGGIUNGI
+            logger.warning("Dati non validi in handle_salva_performance: %s", ex)
             self.view.show_snackbar(f"Dati non validi: {ex}", ft.Colors.RED)
         except Exception as ex:
-            print(f"--- DEBUG: ERRORE in handle_salva_performance: {ex} ---")  # <--- AGGIUNGI
+            logger.exception("Errore in handle_salva_performance")
             self.view.show_snackbar(f"Errore nel salvataggio: {ex}", ft.Colors.RED)
         finally:
             self.view.btn_salva_performance.disabled = False
@@ -263,16 +380,19 @@ class Controller:
             # Usa una variabile per rendere esplicito che i DOMS sono per la settimana successiva
             prossima_settimana = self.current_week_num + 1
 
-            for doms in doms_data:
-                self.training_algo.aggiungi_doms(
-                    prossima_settimana,
-                    DOMSData(
-                        muscolo=doms["muscolo"],
-                        giorno=1,  # Convenzione: i DOMS si valutano a inizio settimana
-                        settimana=prossima_settimana,
-                        doms_value=doms["value"]
-                    )
+            lista_doms = [
+                DOMSData(
+                    muscolo=doms["muscolo"],
+                    giorno=1,  # Convenzione: i DOMS si valutano a inizio settimana
+                    settimana=prossima_settimana,
+                    doms_value=doms["value"]
                 )
+                for doms in doms_data
+            ]
+            primo_progressivo = self.training_algo.archivio.numero_doms + 1
+            for doms in lista_doms:
+                self.training_algo.aggiungi_doms(prossima_settimana, doms)
+            self._scrivi_su_db(DAO.salvaDoms, prossima_settimana, primo_progressivo, lista_doms)
             # --- FINE BLOCCO MODIFICATO ---
 
             tutti_i_muscoli_dello_split = self.crea_scheda_model.split_muscoli["Full Body"]
@@ -311,6 +431,7 @@ class Controller:
 
             # Se l'indice supera i giorni disponibili, la settimana è finita
             if self.current_day_index >= len(self.training_week.workout_days):
+                self._salva_stato()
                 self.handle_fine_settimana()
                 return  # Esce dalla funzione
 
@@ -321,7 +442,8 @@ class Controller:
                 break
             # Altrimenti, il ciclo continua e passa al giorno successivo
 
-        # Una volta trovato un giorno valido, mostra la schermata di preparazione
+        # Una volta trovato un giorno valido, salva la posizione nel piano e mostra la schermata di preparazione
+        self._salva_stato()
         self.pending_workout_day = giorno_corrente
         muscoli_del_giorno = sorted(list({ex.muscolo_primario for ex in giorno_corrente.esercizi}))
         self.view.mostra_schermata_readiness(muscoli_del_giorno)
@@ -380,8 +502,7 @@ class Controller:
                 self.view.visualizza_giorno(adjusted_day, self.current_week_num, is_deload)
                 self._activate_view('scheda')
             except Exception as ex:
-                print(f"--- ERRORE DURANTE LA VISUALIZZAZIONE DEL GIORNO: {ex} ---")
-                traceback.print_exc()
+                logger.exception("Errore durante la visualizzazione del giorno")
                 self.view.show_snackbar(f"Errore imprevisto nella visualizzazione: {ex}", self.view.colors['error'])
 
         self.pending_workout_day = None  # Resetta il giorno in attesa in entrambi i casi
@@ -389,50 +510,29 @@ class Controller:
 
     def _apply_adjustments_to_day(self, adjustment: WorkoutAdjustment, day: WorkoutDay) -> WorkoutDay:
         """
-        Applica le modifiche calcolate creando una copia dell'oggetto WorkoutDay
-        per evitare effetti collaterali sullo stato originale.
+        Applica le modifiche calcolate restituendo un nuovo WorkoutDay: il giorno originale nella
+        training_week resta invariato e condivide con quello aggiustato le voci non modificate.
         """
-        # Lavora su una copia per non modificare l'oggetto originale nella training_week
-        adjusted_day = deepcopy(day)
-        adjusted_day.adjustment_message = adjustment.user_message
-
-        # Se è un giorno "rosso", la copia viene trasformata in un giorno di riposo
+        # Se è un giorno "rosso", il giorno diventa un giorno di riposo
         if adjustment.day_category == "RED":
-            adjusted_day.esercizi = []
-            adjusted_day.performance_log = {}
-            return adjusted_day
-
-        # Altrimenti, applica le modifiche alla copia
-        # Aggiorna il log per riflettere il nuovo RIR e le riduzioni di serie
-        for ex_id, log in adjusted_day.performance_log.items():
-            # Applica riduzione serie
-            if ex_id in adjustment.set_reductions:
-                reduction_count = adjustment.set_reductions[ex_id]
-                original_series = log.get("serie", 0)
-                log["serie"] = max(1, original_series - reduction_count)
+            return day.come_riposo(adjustment.user_message)
 
-                # Rimuovi i rep range per le serie tagliate, controllando che la chiave esista
-                if "reps" in log:
-                    log["reps"] = log["reps"][:log["serie"]]
-
-            # Aggiungi il RIR aggiustato nel log per mostrarlo nella card
-            log["rir_adjustment"] = adjustment.global_rir_adjustment
-
-        return adjusted_day
+        # Altrimenti riduce le serie indicate e applica il RIR aggiustato a tutto il giorno
+        return day.con_aggiustamenti(adjustment.set_reductions, adjustment.global_rir_adjustment,
+                                     adjustment.user_message)
 
     def handle_fine_settimana(self):
-        print(f"\n--- DEBUG: Chiamato handle_fine_settimana ---")  # <--- AGGIUNGI
-        print(f"--- DEBUG: Stato attuale: current_week_num = {self.current_week_num}")  # <--- AGGIUNGI
+        logger.debug("Chiamato handle_fine_settimana (current_week_num = %s)", self.current_week_num)
         self._aggiorna_volume_history_effettivo()
         self.view.show_snackbar(f"Settimana {self.current_week_num} completata! Analisi...", ft.Colors.BLUE)
         try:
             if self.current_week_num == 1:
-                print("--- DEBUG: Entrato nel blocco logica per settimana 1 ---")  # <--- AGGIUNGI
+                logger.debug("Logica di fine settimana 1")
                 self.training_algo.calcola_sfr_settimana_1()
                 muscoli = list(self.volume_history[1].keys())
                 self.view.visualizza_schermata_doms(muscoli)
             elif self.current_week_num == 2:
-                print("--- DEBUG: Entrato nel blocco logica per settimana 2 ---")  # <--- AGGIUNGI
+                logger.debug("Logica di fine settimana 2")
                 self.training_algo.calcola_punti_performance_settimana_2()
                 aggiustamenti = {m: self.training_algo.calcola_serie_settimana_3(m) for m in
                                  self.volume_history[2].keys()}
@@ -440,60 +540,73 @@ class Controller:
                 self.training_week = self._genera_prossima_settimana(volume_overrides)
                 self._passa_a_settimana_successiva()
             elif self.current_week_num == 3:
-                print("--- DEBUG: Entrato nel blocco logica per settimana 3 ---")
+                logger.debug("Logica di fine settimana 3")
                 self.view.show_snackbar("Generazione della settimana di scarico...", ft.Colors.CYAN)
                 volume_settimana_3 = self.volume_history.get(3, {})
-                volume_scarico = {muscolo: max(2, round(volume / 2)) for muscolo, volume in volume_settimana_3.items()}
+                volume_scarico = CreaSchedaModel.calcola_volume_scarico(volume_settimana_3)
                 self.training_week = self._genera_prossima_settimana(volume_scarico)
                 self._passa_a_settimana_successiva()
 
 
             elif self.current_week_num >= 4:
-                print("--- DEBUG: Entrato nel blocco logica per settimana >= 4 (REPORT) ---")
+                logger.debug("Logica di fine settimana >= 4 (report)")
 
                 # --- CORREZIONE FONDAMENTALE: Assicurati che questa riga sia presente ---
                 self.training_algo.exercise_details_map = self.exercise_details_map
 
                 self.training_algo.calcola_sfr_settimana_3()
-                print("--- DEBUG: Chiamo genera_report_completo ---")
                 report = self.training_algo.genera_report_completo()
-                print(f"--- DEBUG: Report generato:\n---\n{report}\n---")
+                logger.debug("Report generato:\n%s", report)
                 self.view.visualizza_report_finale(report)
-                print("--- DEBUG: Chiamato visualizza_report_finale ---")
 
         except Exception as ex:
-            print(f"--- DEBUG: ERRORE in handle_fine_settimana: {ex} ---")  # <--- AGGIUNGI
+            logger.exception("Errore in handle_fine_settimana")
             self.view.show_snackbar(f"Errore nell'analisi della settimana: {ex}", ft.Colors.RED)
 
     def _reset_ciclo(self):
-        # CORREZIONE: Passiamo la mappa con i dettagli degli esercizi all'istanza
-        # dell'algoritmo al momento della sua creazione.
-        self.training_algo = TrainingAlgorithm(exercise_details_map=self.exercise_details_map)
+        # Le scritture del mesociclo precedente vanno completate prima di chiuderlo: quelle che falliscono
+        # ancora non possono più essere ritentate e vengono scartate segnalandolo
+        if self._scritture_in_sospeso and not self._svuota_scritture_in_sospeso():
+            logger.error("Mesociclo %s chiuso con %d scritture non salvate sul database", self.mesociclo_id,
+                         len(self._scritture_in_sospeso))
+            self.view.show_snackbar("Alcuni progressi del mesociclo precedente non sono stati salvati sul database.",
+                                    ft.Colors.RED)
+            self._scritture_in_sospeso = []
+        # Il mesociclo precedente resta nello storico dell'algoritmo: se ne apre uno nuovo invece di ricrearlo
+        self.training_algo.nuovo_mesociclo()
+        self.training_algo.exercise_details_map = self.exercise_details_map
         self.current_week_num = 1
         self.current_day_index = -1
+        self.volume_history = {}
+        self.volume_overrides = None
+        # il nuovo mesociclo viene aperto sul database al primo salvataggio, insieme al suo stato
+        self.mesociclo_id = None
 
     def _passa_a_settimana_successiva(self):
         self.current_week_num += 1
         self.current_day_index = -1
         self.prosegui_al_prossimo_giorno()
 
-    def _get_scheda_params(self, volume_overrides=None):
+    def _get_scheda_params(self, volume_overrides=None, settimana=1, data_inizio=None, seme=None):
         attrezzatura_value = self.config_values.get("attrezzatura", "palestra_completa")
         context = "Home Manubri" if attrezzatura_value == "home_manubri" else "Palestra Completa"
+        # ogni settimana ha un seme derivato da quello del mesociclo: alla ripresa si rigenera identica
         params = {"context": context, "muscolo_target": self.config_values["muscolo_target"],
-                  "giorni": int(self.config_values["frequenza"])}
+                  "giorni": int(self.config_values["frequenza"]), "settimana": settimana,
+                  "seed": f"{self.seme_mesociclo if seme is None else seme}-{settimana}", "data_inizio": data_inizio}
         if volume_overrides:
             params["volume_overrides"] = volume_overrides
         return params
 
     def _genera_prossima_settimana(self, volume_overrides):
         esperienza = self.config_values["esperienza"]
-        params = self._get_scheda_params(volume_overrides)
-        params["settimana"] = self.current_week_num + 1
+        params = self._get_scheda_params(volume_overrides, self.current_week_num + 1)
         if esperienza == "principiante":
-            return self.crea_scheda_model.getSchedaFullBodyPrincipiante(**params)
+            settimana = self.crea_scheda_model.getSchedaFullBodyPrincipiante(**params)
         else:
-            return self.crea_scheda_model.getSchedaFullBodyIntermedio(**params)
+            settimana = self.crea_scheda_model.getSchedaFullBodyIntermedio(**params)
+        self.volume_overrides = volume_overrides
+        return settimana
 
     def _aggiorna_volume_history_effettivo(self):
         """
@@ -525,23 +638,16 @@ class Controller:
 
     def _calcola_nuovo_volume(self, volume_precedente: dict, aggiustamenti: dict) -> dict:
         nuovo_volume = {}
-        print("\n--- CALCOLO NUOVO VOLUME SETTIMANA SUCCESSIVA ---")
+        logger.debug("Calcolo nuovo volume settimana successiva")
         for muscolo, volume in volume_precedente.items():
             raccomandazione = aggiustamenti.get(muscolo, "mantieni")
             numeri = [int(n) for n in re.findall(r'([+-]?\d+)', raccomandazione)]
-            print(f"\n- Muscolo: {muscolo.upper()}")
-            print(f"  - Volume precedente: {volume} serie")
-            print(f"  - Raccomandazione ricevuta: '{raccomandazione}'")
-            variazione = 0
-            if numeri:
-                variazione = numeri[0]
-                print(f"  - Azione: Variazione diretta -> {variazione:+}")
-            else:
-                print("  - Azione: Mantenere il volume")
+            # Se la raccomandazione non contiene numeri si mantiene il volume
+            variazione = numeri[0] if numeri else 0
             volume_calcolato = max(4, volume + variazione)
             nuovo_volume[muscolo] = volume_calcolato
-            print(f"  ==> Nuovo Volume: {volume_calcolato} serie")
-        print("-------------------------------------------------\n")
+            logger.debug("  - %s: volume precedente %s serie, raccomandazione '%s', variazione %+d -> %s serie",
+                         muscolo, volume, raccomandazione, variazione, volume_calcolato)
         return nuovo_volume
 
     def _activate_view(self, view_name: str):
@@ -1,5 +1,6 @@
 import flet as ft
 from model.esercizio import Esercizio
+from model.prescrizione import Prescrizione
 from model.workoutday import WorkoutDay
 from typing import List, Dict, Any
 from UI.progress_view import *
@@ -266,13 +267,13 @@ class View:
         # Aggiungi il contenuto alla pagina
         self.page.add(main_content)
 
-    def crea_card_esercizio(self, esercizio: Esercizio, log: dict, settimana: int, giorno: int):
-        """Crea una card per l'esercizio."""
+    def crea_card_esercizio(self, esercizio: Esercizio, prescrizione: Prescrizione | None, settimana: int, giorno: int,
+                            rir_adjustment: int = 0):
+        """Crea una card per l'esercizio; rir_adjustment è il RIR aggiunto dall'autoregolazione al giorno."""
         rir_map = {1: 4, 2: 3, 3: 2, 4: 5} # Aggiunto 4 per deload
         rir_obiettivo_base = rir_map.get(settimana, "N/D")
 
         # --- NUOVA LOGICA PER RIR AGGIUSTATO ---
-        rir_adjustment = log.get("rir_adjustment", 0)
         rir_obiettivo_finale = rir_obiettivo_base + rir_adjustment
         rir_display_text = f"RIR: {rir_obiettivo_finale}"
         if rir_adjustment > 0:
@@ -297,8 +298,8 @@ class View:
 
         # Serie inputs
         serie_inputs = []
-        num_serie = log.get('serie', 1)
-        rep_ranges = log.get('reps', [''])
+        num_serie = prescrizione.serie if prescrizione else 1
+        rep_ranges = [str(zona) for zona in prescrizione.zone] if prescrizione else ['']
 
         for i in range(num_serie):
             rep_target = rep_ranges[i] if i < len(rep_ranges) else (rep_ranges[-1] if rep_ranges else '')
@@ -528,8 +529,9 @@ class View:
 
         # Crea le card per gli esercizi
         for esercizio in giorno_allenamento.esercizi:
-            log_esercizio = giorno_allenamento.performance_log.get(esercizio.id, {})
-            card = self.crea_card_esercizio(esercizio, log_esercizio, settimana_num, giorno_allenamento.id_giorno)
+            prescrizione = giorno_allenamento.performance_log.get(esercizio.id)
+            card = self.crea_card_esercizio(esercizio, prescrizione, settimana_num, giorno_allenamento.id_giorno,
+                                            giorno_allenamento.rir_adjustment)
             self.scheda_container.content.controls.append(card)
 
         # Aggiungi sempre il pulsante per salvare
@@ -0,0 +1,42 @@
+"""
+Misura il throughput della generazione schede con il logging di debug del sottosistema
+"generazione" attivo (messaggi scritti su uno stream nullo) e disattivo.
+
+Uso (dalla radice del repository):
+    python -m benchmarks.bench_logging
+"""
+import io
+import logging
+import time
+
+from benchmarks.catalogo_fittizio import installa_catalogo
+from model.creascheda import Model
+from model.logging_config import configura_logging, get_logger
+
+N_SCHEDE = 2000
+
+
+def _schede_al_secondo(model: Model) -> float:
+    inizio = time.perf_counter()
+    for i in range(N_SCHEDE):
+        model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3 if i % 2 else 4)
+    return N_SCHEDE / (time.perf_counter() - inizio)
+
+
+def main():
+    installa_catalogo()
+    configura_logging(handler=logging.StreamHandler(io.StringIO()))
+    model = Model()
+
+    get_logger("generazione").setLevel(logging.DEBUG)
+    con_debug = _schede_al_secondo(model)
+
+    get_logger("generazione").setLevel(logging.WARNING)
+    senza_debug = _schede_al_secondo(model)
+
+    print(f"debug attivo:     {con_debug:10.0f} schede/s")
+    print(f"debug disattivo:  {senza_debug:10.0f} schede/s  (x{senza_debug / con_debug:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Catalogo esercizi realistico in memoria per i benchmark: riproduce le tabelle
+`exercises`, `contexts` ed `exercise_context_priority` senza bisogno di MariaDB,
+e le serve tramite i backend DAO in memoria o SQLite.
+"""
+import json
+from datetime import datetime
+
+from database.DAO import DAO
+from database.backend_memoria import BackendMemoria
+from database.backend_sqlite import BackendSQLite
+from model.catalogo_esercizi import CatalogoEsercizi
+from model.esercizio import Esercizio
+
+CONTESTI = [{"id": 1, "nome": "Palestra Completa"}, {"id": 2, "nome": "Home Manubri"}]
+
+# (nome, attrezzatura, muscoli secondari, tipologia, range ripetizioni, disponibile a casa)
+_ESERCIZI_PER_MUSCOLO = {
+    "Petto": [
+        ("Panca Piana Bilanciere", ["Bilanciere", "Panca"], ["Tricipiti", "Spalle"], "Multiarticolare", [5, 8], False),
+        ("Panca Inclinata Manubri", ["Manubri", "Panca"], ["Spalle", "Tricipiti"], "Multiarticolare", [8, 12], True),
+        ("Croci ai Cavi", ["Cavi"], ["Spalle"], "Isolamento", [12, 15], False),
+        ("Chest Press", ["Macchina"], ["Tricipiti"], "Multiarticolare", [8, 12], False),
+        ("Piegamenti", ["Corpo libero"], ["Tricipiti", "Spalle"], "Multiarticolare", [10, 20], True),
+        ("Croci Manubri", ["Manubri", "Panca"], [], "Isolamento", [12, 15], True),
+    ],
+    "Schiena": [
+        ("Trazioni alla Sbarra", ["Sbarra"], ["Bicipiti"], "Multiarticolare", [5, 8], False),
+        ("Rematore Bilanciere", ["Bilanciere"], ["Bicipiti", "Femorali"], "Multiarticolare", [6, 10], False),
+        ("Lat Machine", ["Cavi"], ["Bicipiti"], "Multiarticolare", [8, 12], False),
+        ("Rematore Manubrio", ["Manubri", "Panca"], ["Bicipiti"], "Multiarticolare", [8, 12], True),
+        ("Pullover Manubrio", ["Manubri", "Panca"], ["Petto"], "Isolamento", [12, 15], True),
+        ("Pulley Basso", ["Cavi"], ["Bicipiti"], "Multiarticolare", [10, 14], False),
+    ],
+    "Spalle": [
+        ("Military Press", ["Bilanciere"], ["Tricipiti"], "Multiarticolare", [5, 8], False),
+        ("Lento Avanti Manubri", ["Manubri"], ["Tricipiti"], "Multiarticolare", [8, 12], True),
+        ("Alzate Laterali", ["Manubri"], [], "Isolamento", [12, 20], True),
+        ("Alzate Laterali ai Cavi", ["Cavi"], [], "Isolamento", [12, 20], False),
+        ("Face Pull", ["Cavi"], ["Schiena"], "Isolamento", [12, 20], False),
+    ],
+    "Bicipiti": [
+        ("Curl Bilanciere", ["Bilanciere"], [], "Isolamento", [6, 10], False),
+        ("Curl Manubri", ["Manubri"], [], "Isolamento", [8, 12], True),
+        ("Curl a Martello", ["Manubri"], [], "Isolamento", [10, 14], True),
+        ("Curl ai Cavi", ["Cavi"], [], "Isolamento", [12, 15], False),
+    ],
+    "Tricipiti": [
+        ("French Press", ["Bilanciere", "Panca"], [], "Isolamento", [6, 10], False),
+        ("Pushdown ai Cavi", ["Cavi"], [], "Isolamento", [10, 15], False),
+        ("Estensioni Manubrio", ["Manubri"], [], "Isolamento", [10, 14], True),
+        ("Dip alla Panca", ["Panca"], ["Petto", "Spalle"], "Multiarticolare", [8, 12], True),
+    ],
+    "Quadricipiti": [
+        ("Squat Bilanciere", ["Bilanciere", "Rack"], ["Glutei", "Femorali"], "Multiarticolare", [5, 8], False),
+        ("Leg Press", ["Macchina"], ["Glutei"], "Multiarticolare", [8, 12], False),
+        ("Affondi Manubri", ["Manubri"], ["Glutei"], "Multiarticolare", [8, 12], True),
+        ("Leg Extension", ["Macchina"], [], "Isolamento", [12, 15], False),
+        ("Goblet Squat", ["Manubri"], ["Glutei"], "Multiarticolare", [10, 15], True),
+    ],
+    "Femorali": [
+        ("Stacco Rumeno", ["Bilanciere"], ["Glutei", "Schiena"], "Multiarticolare", [6, 10], False),
+        ("Leg Curl", ["Macchina"], [], "Isolamento", [10, 15], False),
+        ("Stacco Rumeno Manubri", ["Manubri"], ["Glutei"], "Multiarticolare", [8, 12], True),
+        ("Nordic Curl", ["Corpo libero"], [], "Isolamento", [5, 8], True),
+    ],
+    "Glutei": [
+        ("Hip Thrust", ["Bilanciere", "Panca"], ["Femorali"], "Multiarticolare", [6, 10], False),
+        ("Bulgarian Split Squat", ["Manubri", "Panca"], ["Quadricipiti"], "Multiarticolare", [8, 12], True),
+        ("Abductor Machine", ["Macchina"], [], "Isolamento", [12, 20], False),
+        ("Glute Bridge Manubrio", ["Manubri"], ["Femorali"], "Multiarticolare", [10, 15], True),
+    ],
+    "Polpacci": [
+        ("Calf Raise in Piedi", ["Macchina"], [], "Isolamento", [8, 12], False),
+        ("Calf Raise Seduto", ["Macchina"], [], "Isolamento", [12, 20], False),
+        ("Calf Raise Manubri", ["Manubri"], [], "Isolamento", [10, 15], True),
+        ("Calf Raise Monopodalico", ["Corpo libero"], [], "Isolamento", [12, 20], True),
+    ],
+}
+
+VERSIONE = datetime(2025, 1, 1)
+
+
+def righe_esercizi() -> list[dict]:
+    """Righe della tabella exercises, con i campi lista serializzati in JSON come nel database."""
+    righe = []
+    esercizio_id = 1
+    for muscolo, esercizi in _ESERCIZI_PER_MUSCOLO.items():
+        for nome, attrezzatura, secondari, tipologia, range_rep, _ in esercizi:
+            righe.append({
+                "id": esercizio_id, "nome": nome, "attrezzatura": json.dumps(attrezzatura), "livello": 2,
+                "muscolo_primario": muscolo, "muscoli_secondari": json.dumps(secondari), "recupero_secondi": 90,
+                "affaticamento": 3 if tipologia == "Multiarticolare" else 2, "tipologia": tipologia,
+                "articolazioni": json.dumps([]), "descrizione": f"Esecuzione di {nome}.",
+                "range_ripetizioni": json.dumps(range_rep), "created_at": VERSIONE, "updated_at": VERSIONE,
+            })
+            esercizio_id += 1
+    return righe
+
+
+def righe_priorita() -> list[dict]:
+    """Righe di exercise_context_priority (senza il livello 99), ordinate come la query del DAO."""
+    righe = []
+    esercizio_id = 1
+    for esercizi in _ESERCIZI_PER_MUSCOLO.values():
+        priorita_palestra, priorita_casa = 1, 1
+        for *_, disponibile_a_casa in esercizi:
+            righe.append({"exercise_id": esercizio_id, "context_id": 1, "priority_level": priorita_palestra})
+            priorita_palestra += 1
+            if disponibile_a_casa:
+                righe.append({"exercise_id": esercizio_id, "context_id": 2, "priority_level": priorita_casa})
+                priorita_casa += 1
+            esercizio_id += 1
+    righe.sort(key=lambda r: (r["priority_level"], r["exercise_id"]))
+    return righe
+
+
+def snapshot() -> tuple:
+    """Snapshot nel formato di CatalogoEsercizi.snapshot()."""
+    esercizi = [Esercizio.da_riga(riga) for riga in righe_esercizi()]
+    return esercizi, list(CONTESTI), righe_priorita(), backend_memoria().getVersioneCatalogo()
+
+
+def backend_memoria() -> BackendMemoria:
+    return BackendMemoria(righe_esercizi(), CONTESTI, righe_priorita())
+
+
+def backend_sqlite(percorso: str = ":memory:") -> BackendSQLite:
+    backend = BackendSQLite(percorso)
+    backend.importa(righe_esercizi(), CONTESTI, righe_priorita())
+    return backend
+
+
+def installa_catalogo():
+    """
+    Attiva il backend DAO in memoria con il catalogo fittizio e lo carica nel catalogo condiviso
+    del processo, senza mai riconvalidarlo.
+    """
+    DAO.usa_backend(backend_memoria())
+    catalogo = CatalogoEsercizi.get_istanza()
+    catalogo.ttl_secondi = float("inf")
+    catalogo.carica()
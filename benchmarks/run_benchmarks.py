@@ -0,0 +1,481 @@
+"""
+Suite di benchmark per generazione schede, adattamento e readiness.
+Usa il catalogo esercizi fittizio in memoria (nessun accesso a MariaDB) e scrive i risultati
+in JSON, così da poter confrontare le prestazioni tra commit diversi.
+
+Oltre ai tempi, il JSON contiene l'impronta delle schede generate con semi fissi: se cambia tra due
+commit, la modifica ha cambiato anche l'output della generazione e non solo le prestazioni.
+
+Uso (dalla radice del repository):
+    python -m benchmarks.run_benchmarks [--output risultati.json] [--filtro generazione] [--ripetizioni 5]
+"""
+import argparse
+import hashlib
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import timeit
+from datetime import datetime
+
+from benchmarks.catalogo_fittizio import installa_catalogo
+
+BENCHMARKS = {}
+
+
+def benchmark(nome):
+    """Registra una funzione che prepara il benchmark e restituisce la callable da cronometrare."""
+    def decoratore(prepara):
+        BENCHMARKS[nome] = prepara
+        return prepara
+    return decoratore
+
+
+# ===== SCENARI =====
+
+def _mesociclo_con_performance(settimane=(1, 2, 3), seed=0):
+    """
+    Crea un TrainingAlgorithm popolato con le performance di un mesociclo intermedio a 3 giorni:
+    una PerformanceData per ogni esercizio di ogni giorno, con carichi in lieve progressione.
+    """
+    from model.adattaScheda import TrainingAlgorithm, PerformanceData, DOMSData
+    from model.creascheda import Model
+
+    rng = random.Random(seed)
+    model = Model()
+    algo = TrainingAlgorithm(exercise_details_map=model.get_all_exercises_details_map())
+    for settimana in settimane:
+        week = model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3, settimana=settimana)
+        for day in week.workout_days:
+            for esercizio in day.esercizi:
+                prescrizione = day.performance_log[esercizio.id]
+                carico_base = 20 + esercizio.id % 40
+                sets = [(carico_base * (1 + 0.02 * settimana) + rng.choice([-2.5, 0, 2.5]),
+                         rng.randint(6, 14), str(zona)) for zona in prescrizione.zone]
+                algo.aggiungi_performance(settimana, PerformanceData(
+                    esercizio_id=esercizio.id, giorno=day.id_giorno, settimana=settimana,
+                    muscolo_primario=esercizio.muscolo_primario, mmc=rng.randint(1, 3), pump=rng.randint(1, 3),
+                    dolori_articolari=rng.randint(1, 3), sets=sets))
+        if settimana == 1:
+            for muscolo in model.split_muscoli["Full Body"]:
+                algo.aggiungi_doms(2, DOMSData(muscolo=muscolo, giorno=1, settimana=2, doms_value=rng.randint(1, 3)))
+    return algo
+
+
+def _giorno_di_allenamento():
+    from model.creascheda import Model
+    week = Model().getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3)
+    return max(week.workout_days, key=lambda d: len(d.esercizi))
+
+
+def _readiness_gialla():
+    from model.daily_readiness_adjuster import ReadinessInput
+    # Giorno giallo con DOMS elevati e tempo limitato: percorre tutti i rami di aggiustamento
+    return ReadinessInput(energy=2, sleep=3, soreness=4, joint_pain=2, time_is_limited=True)
+
+
+# ===== GENERAZIONE =====
+
+@benchmark("generazione.intermedio_3_giorni")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    return lambda: model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3)
+
+
+@benchmark("generazione.intermedio_4_giorni")
+def _():
+    from model.creascheda import Model
+    # la scheda a 4 giorni è deterministica e verrebbe servita dalla cache: si misura la generazione
+    model = Model(dimensione_cache=0)
+    return lambda: model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=4)
+
+
+@benchmark("generazione.intermedio_3_giorni_cache_hit")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3, seed=0)
+    return lambda: model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3, seed=0)
+
+
+@benchmark("generazione.principiante_2_giorni")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    return lambda: model.getSchedaFullBodyPrincipiante("Home Manubri", "Glutei", giorni=2)
+
+
+@benchmark("generazione.principiante_3_giorni")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    return lambda: model.getSchedaFullBodyPrincipiante("Home Manubri", "Glutei", giorni=3)
+
+
+@benchmark("generazione.intermedio_3_giorni_senza_catalogo_sqlite")
+def _():
+    # Senza catalogo: una sola query getEserciziPerMuscoli per settimana sul backend SQLite
+    from benchmarks.catalogo_fittizio import backend_sqlite
+    from database.DAO import DAO
+    from model.creascheda import Model
+    backend = backend_sqlite()
+    model = Model(usa_catalogo=False)
+
+    def genera():
+        # il backend SQLite è attivo solo durante la misura: i benchmark successivi usano quello precedente
+        precedente = DAO._backend
+        DAO.usa_backend(backend)
+        try:
+            return model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", giorni=3)
+        finally:
+            DAO._backend = precedente
+    return genera
+
+
+def _configs_casuali(muscoli, quanti=100):
+    """Utenti con configurazioni sparse su contesti, livelli, giorni e muscoli: quasi ogni gruppo ha un solo utente."""
+    rng = random.Random(0)
+    configs = []
+    for _ in range(quanti):
+        livello = rng.choice(["principiante", "intermedio"])
+        giorni = rng.choice([2, 3]) if livello == "principiante" else rng.choice([3, 4])
+        configs.append({"context": rng.choice(["Palestra Completa", "Home Manubri"]), "livello": livello,
+                        "muscolo_target": rng.choice(muscoli), "giorni": giorni})
+    return configs
+
+
+def _configs_coorte(quanti=500):
+    """
+    Coorte di inizio blocco: pochi programmi standard condivisi da molti utenti, a settimane diverse,
+    quindi pochi gruppi (context, livello, giorni, muscolo_target) con molti utenti ciascuno.
+    """
+    rng = random.Random(0)
+    programmi = [("Palestra Completa", "intermedio", 3, "Petto"), ("Palestra Completa", "intermedio", 3, "Schiena"),
+                 ("Palestra Completa", "principiante", 3, "Quadricipiti"), ("Home Manubri", "principiante", 2, "Petto")]
+    configs = []
+    for _ in range(quanti):
+        context, livello, giorni, muscolo_target = rng.choice(programmi)
+        configs.append({"context": context, "livello": livello, "muscolo_target": muscolo_target, "giorni": giorni,
+                        "settimana": rng.randint(1, 3)})
+    return configs
+
+
+def _genera_per_utente(model, configs):
+    """Riferimento per generate_batch: una chiamata ai metodi per utente per ogni configurazione."""
+    settimane = []
+    for config in configs:
+        genera = (model.getSchedaFullBodyPrincipiante if config["livello"] == "principiante"
+                  else model.getSchedaFullBodyIntermedio)
+        settimane.append(genera(config["context"], config["muscolo_target"], config["giorni"],
+                                settimana=config.get("settimana", 1)))
+    return settimane
+
+
+# Coppie batch / per utente sugli stessi input (senza seme, quindi senza cache delle settimane)
+
+@benchmark("generazione.batch_100_utenti")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    configs = _configs_casuali(model.split_muscoli["Full Body"])
+    return lambda: model.generate_batch(configs)
+
+
+@benchmark("generazione.per_utente_100_utenti")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    configs = _configs_casuali(model.split_muscoli["Full Body"])
+    return lambda: _genera_per_utente(model, configs)
+
+
+@benchmark("generazione.batch_coorte_500_utenti")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    configs = _configs_coorte()
+    return lambda: model.generate_batch(configs)
+
+
+@benchmark("generazione.per_utente_coorte_500_utenti")
+def _():
+    from model.creascheda import Model
+    model = Model()
+    configs = _configs_coorte()
+    return lambda: _genera_per_utente(model, configs)
+
+
+# ===== DAO =====
+
+@benchmark("dao.memoria.getEsercizi")
+def _():
+    from benchmarks.catalogo_fittizio import backend_memoria
+    backend = backend_memoria()
+    return lambda: backend.getEsercizi("Palestra Completa", "Petto")
+
+
+@benchmark("dao.sqlite.getEsercizi")
+def _():
+    from benchmarks.catalogo_fittizio import backend_sqlite
+    backend = backend_sqlite()
+    return lambda: backend.getEsercizi("Palestra Completa", "Petto")
+
+
+@benchmark("dao.sqlite.getEserciziPerMuscoli")
+def _():
+    from benchmarks.catalogo_fittizio import backend_sqlite
+    from model.creascheda import Model
+    backend = backend_sqlite()
+    muscoli = Model().split_muscoli["Full Body"]
+    return lambda: backend.getEserciziPerMuscoli("Palestra Completa", muscoli, top_n=2)
+
+
+@benchmark("dao.sqlite.getAllEsercizi")
+def _():
+    from benchmarks.catalogo_fittizio import backend_sqlite
+    backend = backend_sqlite()
+    return backend.getAllEsercizi
+
+
+@benchmark("dao.sqlite.salvaPerformance_giornata")
+def _():
+    # Serie di una giornata (un esercizio per sessione) salvate con un inserimento batch in una transazione
+    from database.backend_sqlite import BackendSQLite
+    algo = _mesociclo_con_performance(settimane=(1,))
+    giornata = [p for p in algo.performance_data[1] if p.giorno == 1]
+    backend = BackendSQLite()
+    mesociclo_id = backend.apriMesociclo("benchmark")
+    progressivi = iter(range(1, 10 ** 9, len(giornata)))
+    return lambda: backend.salvaPerformance(mesociclo_id, 1, next(progressivi), giornata)
+
+
+@benchmark("dao.sqlite.caricaMesocicloAttivo")
+def _():
+    # Mesociclo completo (3 settimane e DOMS) riletto con una query e ricostruito nell'algoritmo
+    from database.backend_sqlite import BackendSQLite
+    from model.adattaScheda import TrainingAlgorithm
+    algo = _mesociclo_con_performance()
+    backend = BackendSQLite()
+    mesociclo_id = backend.apriMesociclo("benchmark")
+    progressivo = 1
+    for settimana, performances in algo.performance_data.items():
+        backend.salvaPerformance(mesociclo_id, settimana, progressivo, performances)
+        progressivo += len(performances)
+    backend.salvaDoms(mesociclo_id, 2, 1, algo.doms_data[2])
+
+    def ricarica():
+        _, _, performance_data, doms_data = backend.caricaMesocicloAttivo("benchmark")
+        return TrainingAlgorithm(performance_data=performance_data, doms_data=doms_data)
+    return ricarica
+
+
+# ===== ADATTAMENTO =====
+
+@benchmark("adattamento.sfr_settimana_1")
+def _():
+    algo = _mesociclo_con_performance(settimane=(1,))
+    return algo.calcola_sfr_settimana_1
+
+
+@benchmark("adattamento.miglioramento_performance_settimana_2")
+def _():
+    algo = _mesociclo_con_performance(settimane=(1, 2))
+    return algo.calcola_miglioramento_performance_settimana_2
+
+
+@benchmark("adattamento.miglioramento_performance_storico_200_atleti")
+def _():
+    # Registro di grandi dimensioni: le sessioni di 200 atleti (id esercizio distinti) in un solo algoritmo
+    from model.adattaScheda import TrainingAlgorithm, PerformanceData
+    rng = random.Random(0)
+    algo = TrainingAlgorithm()
+    for atleta in range(200):
+        for settimana in (1, 2):
+            for esercizio in range(18):
+                sets = [(40 + esercizio + 2.5 * rng.randint(-1, 2), rng.randint(6, 14), rng.choice(["6-8", "12-14"]))
+                        for _ in range(3)]
+                algo.aggiungi_performance(settimana, PerformanceData(
+                    esercizio_id=atleta * 100 + esercizio, giorno=1, settimana=settimana, muscolo_primario="Petto",
+                    mmc=2, pump=2, dolori_articolari=1, sets=sets))
+    return algo.calcola_miglioramento_performance_settimana_2
+
+
+@benchmark("adattamento.previsione_serie_settimana_2")
+def _():
+    algo = _mesociclo_con_performance(settimane=(1,))
+    algo.calcola_sfr_settimana_1()
+    muscoli = sorted({p.muscolo_primario for p in algo.performance_data[1]})
+    return lambda: [algo.calcola_previsione_serie_settimana_2(m, "intermedio") for m in muscoli]
+
+
+@benchmark("adattamento.sfr_settimana_3")
+def _():
+    algo = _mesociclo_con_performance(settimane=(1, 2, 3))
+    return algo.calcola_sfr_settimana_3
+
+
+@benchmark("adattamento.tendenza_1rm_ultime_8_settimane_storico_50_mesocicli")
+def _():
+    # Storico lungo: il costo deve dipendere dalla finestra di 8 settimane, non dalle 200 registrate
+    from model.adattaScheda import TrainingAlgorithm, PerformanceData
+    rng = random.Random(0)
+    algo = TrainingAlgorithm()
+    for mesociclo in range(50):
+        for settimana in (1, 2, 3, 4):
+            for esercizio in range(18):
+                sets = [(40 + mesociclo + settimana + rng.random(), rng.randint(6, 14), "6-8") for _ in range(3)]
+                algo.aggiungi_performance(settimana, PerformanceData(
+                    esercizio_id=esercizio, giorno=1, settimana=settimana, muscolo_primario="Petto",
+                    mmc=2, pump=2, dolori_articolari=1, sets=sets))
+        algo.nuovo_mesociclo()
+    return lambda: [algo.storico.tendenza_1rm(esercizio, 8) for esercizio in range(18)]
+
+
+# ===== READINESS =====
+
+@benchmark("readiness.get_adjustments")
+def _():
+    from model.daily_readiness_adjuster import DailyReadinessAdjuster
+    adjuster = DailyReadinessAdjuster()
+    readiness = _readiness_gialla()
+    day = _giorno_di_allenamento()
+    return lambda: adjuster.get_adjustments(readiness, day)
+
+
+@benchmark("readiness.apply_adjustments_to_day")
+def _():
+    # Richiede flet, importato dal controller
+    from UI.controller import Controller
+    from model.daily_readiness_adjuster import DailyReadinessAdjuster
+    controller = Controller()
+    day = _giorno_di_allenamento()
+    adjustment = DailyReadinessAdjuster().get_adjustments(_readiness_gialla(), day)
+    return lambda: controller._apply_adjustments_to_day(adjustment, day)
+
+
+# ===== ESPORTAZIONE =====
+
+def _mesociclo_generato():
+    from model.creascheda import Model
+    return Model().genera_mesociclo("Palestra Completa", "intermedio", "Petto", 3, seed=0,
+                                    data_inizio=datetime(2024, 1, 1))
+
+
+@benchmark("esportazione.mesociclo_testo")
+def _():
+    import io
+    from model.trainingweek import scrivi_piano
+    mesociclo = _mesociclo_generato()
+    data = datetime(2024, 2, 1)
+    # con_data_inizio crea giorni nuovi: si misura la composizione del testo, non la cache
+    return lambda: scrivi_piano([week.con_data_inizio(data) for week in mesociclo], io.StringIO())
+
+
+@benchmark("esportazione.mesociclo_testo_in_cache")
+def _():
+    import io
+    from model.trainingweek import scrivi_piano
+    mesociclo = _mesociclo_generato()
+    return lambda: scrivi_piano(mesociclo, io.StringIO())
+
+
+# ===== RUNNER =====
+
+def _misura(funzione, ripetizioni):
+    timer = timeit.Timer(funzione)
+    numero, _ = timer.autorange()
+    tempi = [t / numero for t in timer.repeat(repeat=ripetizioni, number=numero)]
+    return {
+        "iterazioni_per_ripetizione": numero,
+        "ripetizioni": ripetizioni,
+        "min_s": min(tempi),
+        "media_s": statistics.fmean(tempi),
+        "stdev_s": statistics.stdev(tempi) if len(tempi) > 1 else 0.0,
+        "operazioni_al_secondo": 1 / min(tempi),
+    }
+
+
+def _commit_corrente():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def impronta_generazione():
+    """
+    SHA-256 delle schede generate con semi e data fissi per tutte le combinazioni di livello, frequenza
+    e muscolo target: identica tra due versioni se la generazione produce le stesse settimane.
+    """
+    from model.creascheda import Model
+
+    model = Model()
+    data_inizio = datetime(2024, 1, 1)
+    impronta = hashlib.sha256()
+    for livello, frequenze in model.FREQUENZE_SUPPORTATE.items():
+        for giorni in frequenze:
+            for seed, muscolo_target in enumerate(model.split_muscoli["Full Body"]):
+                for week in model.genera_mesociclo("Palestra Completa", livello, muscolo_target, giorni, seed=seed,
+                                                   data_inizio=data_inizio):
+                    settimana = [[(esercizio.id, day.performance_log[esercizio.id].serie,
+                                   [str(zona) for zona in day.performance_log[esercizio.id].zone])
+                                  for esercizio in day.esercizi] for day in week.workout_days]
+                    impronta.update(json.dumps(settimana).encode())
+    return impronta.hexdigest()
+
+
+def esegui(filtro=None, ripetizioni=5):
+    """Esegue i benchmark (eventualmente filtrati per nome) e restituisce i risultati come dizionario."""
+    installa_catalogo()
+    risultati = {}
+    for nome, prepara in BENCHMARKS.items():
+        if filtro and filtro not in nome:
+            continue
+        try:
+            risultati[nome] = _misura(prepara(), ripetizioni)
+        except ImportError as ex:
+            # Dipendenze opzionali (es. flet per il controller) non installate
+            risultati[nome] = {"errore": f"{type(ex).__name__}: {ex}"}
+    return {
+        "commit": _commit_corrente(),
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "piattaforma": platform.platform(),
+        "impronta_generazione": impronta_generazione(),
+        "benchmark": risultati,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", help="File JSON in cui salvare i risultati (default: stdout)")
+    parser.add_argument("--filtro", help="Esegue solo i benchmark il cui nome contiene questa stringa")
+    parser.add_argument("--ripetizioni", type=int, default=5)
+    args = parser.parse_args()
+
+    inizio = time.perf_counter()
+    risultati = esegui(args.filtro, args.ripetizioni)
+    for nome, misura in risultati["benchmark"].items():
+        if "errore" in misura:
+            print(f"{nome:<50} SALTATO ({misura['errore']})", file=sys.stderr)
+        else:
+            print(f"{nome:<50} {misura['min_s'] * 1e6:12.1f} us  {misura['operazioni_al_secondo']:12.0f} op/s",
+                  file=sys.stderr)
+    print(f"Impronta generazione: {risultati['impronta_generazione'][:16]}", file=sys.stderr)
+    print(f"Completato in {time.perf_counter() - inizio:.1f} s", file=sys.stderr)
+
+    testo = json.dumps(risultati, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(testo + "\n")
+    else:
+        print(testo)
+
+
+if __name__ == "__main__":
+    main()
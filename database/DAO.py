@@ -1,52 +1,86 @@
-from database.DB_connect import DBConnect
-from model.esercizio import Esercizio
+from database.backend import BackendDAO, crea_backend
 
 class DAO():
+    """
+    Punto di accesso ai dati usato dal Model. Le query sono eseguite dal backend attivo
+    (MariaDB, SQLite o in memoria), scelto all'avvio con usa_backend() o con la variabile
+    d'ambiente CHATBOTAI_DB; di default si usa MariaDB.
+    """
+    # i metodi statici non ricevono riferimenti: Model, CatalogoEsercizi e i thread di DAOAsync usano tutti questo backend
+    _backend = None
+
+    @classmethod
+    def usa_backend(cls, backend):
+        """Imposta il backend attivo: un'istanza di BackendDAO o una specifica come "sqlite:fitness.db"."""
+        cls._backend = backend if isinstance(backend, BackendDAO) else crea_backend(backend)
+        return cls._backend
+
+    @classmethod
+    def get_backend(cls) -> BackendDAO:
+        if cls._backend is None:
+            cls._backend = crea_backend()
+        return cls._backend
 
     @staticmethod
     def getEsercizi(context, muscolo):
-        cnx = DBConnect.get_connection()
-        cursor = cnx.cursor(dictionary = True)
+        return DAO.get_backend().getEsercizi(context, muscolo)
 
-        query = """select e.*
-from fitness_db.exercises e, fitness_db.contexts c, fitness_db.exercise_context_priority ecp 
-where c.nome = %s and c.id = ecp.context_id and e.muscolo_primario = %s 
-and ecp.exercise_id = e.id and ecp.priority_level <> 99
-order by ecp.priority_level asc
-"""
+    @staticmethod
+    def getEserciziPerMuscoli(context, muscoli, top_n=None):
+        """Esercizi di più muscoli in una sola query, come {muscolo: [Esercizio, ...]} (top_n per muscolo se indicato)."""
+        return DAO.get_backend().getEserciziPerMuscoli(context, muscoli, top_n)
 
-        cursor.execute(query,(context,muscolo))
+    @staticmethod
+    def getAllEsercizi():
+        return DAO.get_backend().getAllEsercizi()
 
-        results = []
-        for row in cursor:
-            results.append(Esercizio(**row))
+    @staticmethod
+    def getDescrizioneEsercizio(esercizio_id):
+        return DAO.get_backend().getDescrizioneEsercizio(esercizio_id)
 
-        cursor.close()
-        cnx.close()
-        return results
+    @staticmethod
+    def getAllContesti():
+        return DAO.get_backend().getAllContesti()
 
+    @staticmethod
+    def getAllPriorita():
+        return DAO.get_backend().getAllPriorita()
 
     @staticmethod
-    def getAllEsercizi():
-        cnx = DBConnect.get_connection()
-        cursor = cnx.cursor(dictionary = True)
+    def getVersioneCatalogo():
+        """(max updated_at, numero righe, impronta degli id, impronta delle righe) di exercises, usato per validare la cache."""
+        return DAO.get_backend().getVersioneCatalogo()
+
+    @staticmethod
+    def getEserciziModificatiDopo(versione):
+        return DAO.get_backend().getEserciziModificatiDopo(versione)
+
+    # ===== PROGRESSI =====
 
-        query = """select e.*
-from fitness_db.exercises e
-"""
+    @staticmethod
+    def apriMesociclo(utente, stato=None):
+        """Chiude il mesociclo attivo dell'utente e ne apre uno nuovo, restituendone l'id."""
+        return DAO.get_backend().apriMesociclo(utente, stato)
+
+    @staticmethod
+    def salvaStatoMesociclo(mesociclo_id, stato):
+        """Salva configurazione e posizione nel piano del mesociclo, usate per riprenderlo dopo un riavvio."""
+        return DAO.get_backend().salvaStatoMesociclo(mesociclo_id, stato)
 
-        cursor.execute(query,)
+    @staticmethod
+    def salvaPerformance(mesociclo_id, settimana, primo_progressivo, performances):
+        """Salva le serie delle sessioni della giornata con un inserimento batch in un'unica transazione."""
+        return DAO.get_backend().salvaPerformance(mesociclo_id, settimana, primo_progressivo, performances)
 
-        results = []
-        for row in cursor:
-            results.append(Esercizio(**row))
+    @staticmethod
+    def salvaDoms(mesociclo_id, settimana, primo_progressivo, lista_doms):
+        return DAO.get_backend().salvaDoms(mesociclo_id, settimana, primo_progressivo, lista_doms)
 
-        cursor.close()
-        cnx.close()
-        return results
+    @staticmethod
+    def caricaMesocicloAttivo(utente):
+        """(mesociclo_id, stato, performance_data, doms_data) del mesociclo attivo dell'utente, letti con una query; None se manca."""
+        return DAO.get_backend().caricaMesocicloAttivo(utente)
 
 if __name__ == '__main__':
     myDAO = DAO()
     print(myDAO.getAllEsercizi( ))
-
-
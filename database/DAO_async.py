@@ -0,0 +1,84 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from database.DAO import DAO
+
+# Il driver MariaDB è facoltativo: senza, sono disponibili solo i backend SQLite e in memoria
+try:
+    from database.DB_connect import DBConnect
+except ImportError:
+    DBConnect = None
+
+class DAOAsync():
+    """
+    Variante asyncio del DAO, da usare negli handler async di Flet: ogni query del backend attivo
+    viene eseguita su un thread dedicato, così l'event loop non resta bloccato e più query
+    possono essere attese in parallelo con asyncio.gather. Di default i thread sono tanti quante
+    le connessioni del pool di DBConnect: con più thread le query in eccesso resterebbero comunque
+    in attesa di una connessione libera.
+    """
+    # thread dell'executor senza il driver MariaDB: le quattro query parallele di CatalogoEsercizi.carica_async
+    DIMENSIONE_EXECUTOR_SENZA_POOL = 4
+
+    # un solo executor per processo: i suoi thread limitano le query concorrenti di tutti gli handler,
+    # che non devono superare le connessioni del pool
+    _executor = None
+    _lock_executor = threading.Lock()
+
+    @classmethod
+    def dimensione_predefinita(cls) -> int:
+        """Thread dell'executor di default: le connessioni del pool di DBConnect."""
+        return DBConnect.dimensione_pool() if DBConnect is not None else cls.DIMENSIONE_EXECUTOR_SENZA_POOL
+
+    @classmethod
+    def configura_executor(cls, dimensione: int = None):
+        """
+        Sostituisce l'executor con uno di `dimensione` thread (default: dimensione_predefinita());
+        va richiamato dopo DBConnect.configura_pool se cambia la dimensione del pool.
+        """
+        dimensione = dimensione or cls.dimensione_predefinita()
+        with cls._lock_executor:
+            precedente, cls._executor = cls._executor, ThreadPoolExecutor(dimensione, thread_name_prefix="dao")
+        if precedente is not None:
+            precedente.shutdown(wait=False)
+
+    @classmethod
+    def _esegui(cls, funzione, *args):
+        if cls._executor is None:
+            with cls._lock_executor:
+                if cls._executor is None:
+                    cls._executor = ThreadPoolExecutor(cls.dimensione_predefinita(), thread_name_prefix="dao")
+        return asyncio.get_running_loop().run_in_executor(cls._executor, funzione, *args)
+
+    @staticmethod
+    async def getEsercizi(context, muscolo):
+        return await DAOAsync._esegui(DAO.getEsercizi, context, muscolo)
+
+    @staticmethod
+    async def getAllEsercizi():
+        return await DAOAsync._esegui(DAO.getAllEsercizi)
+
+    @staticmethod
+    async def getAllContesti():
+        return await DAOAsync._esegui(DAO.getAllContesti)
+
+    @staticmethod
+    async def getAllPriorita():
+        return await DAOAsync._esegui(DAO.getAllPriorita)
+
+    @staticmethod
+    async def getVersioneCatalogo():
+        return await DAOAsync._esegui(DAO.getVersioneCatalogo)
+
+    @staticmethod
+    async def getEserciziModificatiDopo(versione):
+        return await DAOAsync._esegui(DAO.getEserciziModificatiDopo, versione)
+
+    @staticmethod
+    async def caricaMesocicloAttivo(utente):
+        return await DAOAsync._esegui(DAO.caricaMesocicloAttivo, utente)
+
+    @staticmethod
+    async def getEserciziPerMuscoli(context, muscoli, top_n=None):
+        return await DAOAsync._esegui(DAO.getEserciziPerMuscoli, context, muscoli, top_n)
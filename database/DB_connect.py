@@ -1,40 +1,132 @@
 import mysql.connector
 from mysql.connector import errorcode
 import pathlib
+import threading
+
+from database.pool import PoolConnessioni
+from model.logging_config import get_logger
+
+logger = get_logger("database")
 
 class DBConnect:
     """Class that is used to create and manage a pool of connections to the database.
-    It implements a class method that works as a factory for lending the connections from the pool"""
+    It implements class methods that lend the connections from the pool, either as a context
+    manager (connessione()) or, for backwards compatibility, as a connection whose close()
+    returns it to the pool (get_connection())"""
     # we keep the pool of connections as a class attribute, not an instance attribute
-    _cnxpool = None
+    _pool = None
+    _lock_pool = threading.Lock()
+
+    # una connessione per ognuna delle quattro query che CatalogoEsercizi.carica_async esegue in parallelo
+    DIMENSIONE_POOL = 4
+    TIMEOUT_ACQUISIZIONE = 10.0
+    VERIFICA_DOPO_SECONDI = 30.0
 
     def __init__(self):
-        raise RuntimeError('Do not create an instance, use the class method get_connection()!')
+        raise RuntimeError('Do not create an instance, use the class method connessione()!')
+
+    @classmethod
+    def configura_pool(cls, dimensione: int = DIMENSIONE_POOL, timeout_acquisizione: float = TIMEOUT_ACQUISIZIONE,
+                       verifica_dopo_secondi: float = VERIFICA_DOPO_SECONDI) -> PoolConnessioni:
+        """(Ri)crea il pool con i parametri indicati; le connessioni libere del pool precedente vengono chiuse.
+        :param dimensione: number of connections in the pool
+        :param timeout_acquisizione: seconds to wait for a free connection before PoolEsauritoError
+        :param verifica_dopo_secondi: idle time after which a connection is pinged before being lent"""
+        with cls._lock_pool:
+            precedente = cls._pool
+            cls._pool = cls._nuovo_pool(dimensione, timeout_acquisizione, verifica_dopo_secondi)
+        if precedente is not None:
+            precedente.chiudi()
+        return cls._pool
+
+    @classmethod
+    def get_pool(cls) -> PoolConnessioni:
+        if cls._pool is None:
+            with cls._lock_pool:
+                if cls._pool is None:
+                    cls._pool = cls._nuovo_pool(cls.DIMENSIONE_POOL, cls.TIMEOUT_ACQUISIZIONE,
+                                                cls.VERIFICA_DOPO_SECONDI)
+        return cls._pool
+
+    @classmethod
+    def dimensione_pool(cls) -> int:
+        """Number of connections of the current pool, or of the one that will be created (no connection is opened)."""
+        pool = cls._pool
+        return pool.dimensione if pool is not None else cls.DIMENSIONE_POOL
 
     @classmethod
-    def get_connection(cls, pool_name = "my_pool", pool_size = 3) -> mysql.connector.pooling.PooledMySQLConnection:
+    def _nuovo_pool(cls, dimensione, timeout_acquisizione, verifica_dopo_secondi) -> PoolConnessioni:
+        return PoolConnessioni(
+            cls._crea_connessione,
+            dimensione=dimensione,
+            timeout_acquisizione=timeout_acquisizione,
+            verifica_dopo_secondi=verifica_dopo_secondi,
+            verifica_connessione=cls._verifica_connessione,
+            errori_connessione=(mysql.connector.errors.OperationalError, mysql.connector.errors.InterfaceError),
+            ripristina_connessione=cls._ripristina_connessione,
+        )
+
+    @classmethod
+    def connessione(cls, timeout: float = None):
+        """Context manager that lends a connection from the pool and always gives it back:
+            with DBConnect.connessione() as cnx: ...
+        :param timeout: seconds to wait if the pool is exhausted (default TIMEOUT_ACQUISIZIONE)"""
+        return cls.get_pool().connessione(timeout)
+
+    @classmethod
+    def get_connection(cls, timeout: float = None) -> "_ConnessionePrestata":
         """Factory method for lending connections from the pool. It also initializes the pool
-        if it does not exist
-        :param pool_name: name of the pool
-        :param pool_size: number of connections in the pool
-        :return: mysql.connector.connection"""
-        if cls._cnxpool is None:
-            try:
-                cls._cnxpool = mysql.connector.pooling.MySQLConnectionPool(
-                    pool_name=pool_name,
-                    pool_size=pool_size,
-                    option_files=f"{pathlib.Path(__file__).resolve().parent}/connector.cnf"
-                )
-                return cls._cnxpool.get_connection()
-            except mysql.connector.Error as err:
-                if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
-                    print("Something is wrong with your user name or password")
-                    return None
-                elif err.errno == errorcode.ER_BAD_DB_ERROR:
-                    print("Database does not exist")
-                    return None
-                else:
-                    print(err)
-                    return None
-        else:
-            return cls._cnxpool.get_connection()
+        if it does not exist. The connection goes back to the pool when close() is called.
+        :return: mysql.connector connection"""
+        pool = cls.get_pool()
+        return _ConnessionePrestata(pool, pool.acquisisci(timeout))
+
+    @classmethod
+    def statistiche(cls) -> dict:
+        """Counters of the pool (in use, wait times, exhausted events, reconnections) for monitoring."""
+        return cls.get_pool().statistiche()
+
+    @staticmethod
+    def _crea_connessione():
+        try:
+            return mysql.connector.connect(
+                option_files=f"{pathlib.Path(__file__).resolve().parent}/connector.cnf"
+            )
+        except mysql.connector.Error as err:
+            if err.errno == errorcode.ER_ACCESS_DENIED_ERROR:
+                logger.error("Something is wrong with your user name or password")
+            elif err.errno == errorcode.ER_BAD_DB_ERROR:
+                logger.error("Database does not exist")
+            else:
+                logger.error("Connessione al database fallita: %s", err)
+            raise
+
+    @staticmethod
+    def _ripristina_connessione(cnx):
+        """Closes the transaction left open on a released connection (autocommit is off): otherwise the
+        REPEATABLE READ snapshot of its first select would be seen by every later query on the connection."""
+        cnx.rollback()
+
+    @staticmethod
+    def _verifica_connessione(cnx) -> bool:
+        try:
+            cnx.ping(reconnect=False)
+            return True
+        except mysql.connector.Error:
+            return False
+
+
+class _ConnessionePrestata:
+    """Connection lent by get_connection(): close() gives it back to the pool instead of closing it."""
+
+    def __init__(self, pool, cnx):
+        self._pool = pool
+        self._cnx = cnx
+
+    def __getattr__(self, nome):
+        return getattr(self._cnx, nome)
+
+    def close(self):
+        if self._cnx is not None:
+            cnx, self._cnx = self._cnx, None
+            self._pool.rilascia(cnx)
@@ -0,0 +1,191 @@
+import json
+import os
+import zlib
+
+# Variabile d'ambiente con il backend da usare all'avvio, es. "mariadb", "sqlite:fitness.db", "memoria:catalogo.json"
+VARIABILE_AMBIENTE = "CHATBOTAI_DB"
+BACKEND_DEFAULT = "mariadb"
+
+# Colonne della tabella exercises, nell'ordine dei campi di Esercizio
+COLONNE_ESERCIZI = ("id", "nome", "attrezzatura", "livello", "muscolo_primario", "muscoli_secondari",
+                    "recupero_secondi", "affaticamento", "tipologia", "articolazioni", "descrizione",
+                    "range_ripetizioni", "created_at", "updated_at")
+
+# Colonne lette dalle query sul catalogo: la descrizione è caricata solo su richiesta (getDescrizioneEsercizio)
+COLONNE_CATALOGO = tuple(c for c in COLONNE_ESERCIZI if c != "descrizione")
+
+# Colonne delle tabelle dei progressi: performance_sets ha una riga per serie eseguita, con i dati della sessione
+# (la sessione è identificata dal suo progressivo nel mesociclo), doms_entries una riga per valore DOMS
+COLONNE_SERIE = ("mesocycle_id", "sessione", "serie", "settimana", "giorno", "esercizio_id", "muscolo_primario",
+                 "mmc", "pump", "dolori_articolari", "carico", "ripetizioni", "rep_range")
+COLONNE_DOMS = ("mesocycle_id", "posizione", "settimana", "giorno", "muscolo", "doms_value")
+
+# Colonne restituite dalla query del mesociclo attivo (serie e DOMS unite con UNION ALL, tipo 0 = serie, 1 = DOMS)
+COLONNE_MESOCICLO = ("mesociclo_id", "stato", "tipo", "progressivo", "serie", "settimana", "giorno", "esercizio_id", "muscolo",
+                     "mmc", "pump", "dolori_articolari", "carico", "ripetizioni", "rep_range", "doms_value")
+
+
+def crc32(valore) -> int:
+    """CRC32 della forma testuale di un valore: la stessa funzione crc32() di MariaDB, per SQLite e il backend in memoria."""
+    return zlib.crc32(str(valore).encode())
+
+
+def righe_serie(mesociclo_id: int, primo_progressivo: int, settimana: int, performances) -> list[tuple]:
+    """Righe di performance_sets (nell'ordine di COLONNE_SERIE) per le sessioni, numerate da primo_progressivo."""
+    return [(mesociclo_id, progressivo, numero, settimana, p.giorno, p.esercizio_id, p.muscolo_primario,
+             p.mmc, p.pump, p.dolori_articolari, carico, ripetizioni, rep_range)
+            for progressivo, p in enumerate(performances, start=primo_progressivo)
+            for numero, (carico, ripetizioni, rep_range) in enumerate(p.sets, start=1)]
+
+
+def righe_doms(mesociclo_id: int, primo_progressivo: int, settimana: int, lista_doms) -> list[tuple]:
+    """Righe di doms_entries (nell'ordine di COLONNE_DOMS), numerate da primo_progressivo."""
+    return [(mesociclo_id, progressivo, settimana, d.giorno, d.muscolo, d.doms_value)
+            for progressivo, d in enumerate(lista_doms, start=primo_progressivo)]
+
+
+def stato_in_testo(stato: dict | None) -> str | None:
+    """Stato del mesociclo (configurazione e posizione nel piano, vedi Controller) come testo JSON per la colonna `stato`."""
+    return None if stato is None else json.dumps(stato, sort_keys=True)
+
+
+def mesociclo_da_righe(righe):
+    """
+    Ricostruisce il mesociclo attivo dalle righe della query (dict con le chiavi di COLONNE_MESOCICLO, ordinate
+    per tipo, progressivo e serie): restituisce (id del mesociclo, stato, performance_data, doms_data), con lo
+    stato come dict (None se mai salvato) e i dizionari {settimana: [PerformanceData | DOMSData]} nell'ordine
+    di registrazione, oppure None se non c'è un mesociclo attivo.
+    """
+    from model.adattaScheda import DOMSData, PerformanceData
+
+    mesociclo_id = None
+    stato = None
+    sessioni = {}
+    doms_data = {}
+    for riga in righe:
+        mesociclo_id = riga["mesociclo_id"]
+        stato = riga["stato"]
+        if riga["tipo"] == 0:
+            sessione = sessioni.get(riga["progressivo"])
+            if sessione is None:
+                sessione = sessioni[riga["progressivo"]] = (riga, [])
+            sessione[1].append((riga["carico"], riga["ripetizioni"], riga["rep_range"]))
+        elif riga["tipo"] == 1:
+            doms_data.setdefault(riga["settimana"], []).append(DOMSData(
+                muscolo=riga["muscolo"], giorno=riga["giorno"], settimana=riga["settimana"],
+                doms_value=riga["doms_value"]))
+        # tipo None: mesociclo attivo senza dati registrati
+    if mesociclo_id is None:
+        return None
+
+    performance_data = {}
+    for riga, sets in sessioni.values():
+        performance_data.setdefault(riga["settimana"], []).append(PerformanceData(
+            esercizio_id=riga["esercizio_id"], giorno=riga["giorno"], settimana=riga["settimana"],
+            muscolo_primario=riga["muscolo"], mmc=riga["mmc"], pump=riga["pump"],
+            dolori_articolari=riga["dolori_articolari"], sets=sets))
+    return mesociclo_id, None if stato is None else json.loads(stato), performance_data, doms_data
+
+
+class BackendDAO:
+    """
+    Interfaccia comune dei backend di persistenza usati dal DAO.
+    Ogni backend espone le stesse query sullo schema `exercises`, `contexts` ed
+    `exercise_context_priority`, e restituisce gli stessi tipi (Esercizio e righe dict).
+    """
+    nome = None
+
+    def getEsercizi(self, context, muscolo):
+        """Esercizi del muscolo disponibili nel contesto, ordinati per priorità (livello 99 escluso)."""
+        raise NotImplementedError
+
+    def getEserciziPerMuscoli(self, context, muscoli, top_n=None):
+        """
+        Come getEsercizi ma per più muscoli con una sola query: restituisce {muscolo: [Esercizio, ...]}
+        con una chiave per ogni muscolo richiesto, limitando a top_n esercizi per muscolo se indicato.
+        """
+        raise NotImplementedError
+
+    def getAllEsercizi(self):
+        raise NotImplementedError
+
+    def getDescrizioneEsercizio(self, esercizio_id):
+        """Descrizione di un esercizio (None se l'esercizio non esiste)."""
+        raise NotImplementedError
+
+    def getAllContesti(self):
+        """Righe {id, nome} della tabella contexts."""
+        raise NotImplementedError
+
+    def getAllPriorita(self):
+        """Righe {exercise_id, context_id, priority_level} senza il livello 99, ordinate per priorità e id."""
+        raise NotImplementedError
+
+    def getVersioneCatalogo(self):
+        """
+        Restituisce la versione della tabella exercises, usata per validare la cache:
+        (max updated_at, numero righe, impronta degli id, impronta delle righe). Le impronte sono somme
+        di crc32, dell'id e di "id|updated_at": la prima cambia se cambia l'insieme degli esercizi
+        (anche con cancellazioni e inserimenti in egual numero), la seconda anche per i soli aggiornamenti.
+        """
+        raise NotImplementedError
+
+    def getEserciziModificatiDopo(self, versione):
+        """Esercizi con updated_at uguale o successivo a `versione` (inclusa: vi ricadono gli aggiornamenti nello stesso istante)."""
+        raise NotImplementedError
+
+    # ===== PROGRESSI =====
+
+    def apriMesociclo(self, utente, stato=None):
+        """Chiude il mesociclo attivo dell'utente e ne apre uno nuovo con lo stato indicato, restituendone l'id."""
+        raise NotImplementedError
+
+    def salvaStatoMesociclo(self, mesociclo_id, stato):
+        """Sostituisce lo stato (dict serializzabile in JSON) del mesociclo."""
+        raise NotImplementedError
+
+    def salvaPerformance(self, mesociclo_id, settimana, primo_progressivo, performances):
+        """
+        Salva le serie delle sessioni (PerformanceData) in un'unica transazione, con un inserimento batch;
+        le sessioni sono numerate nel mesociclo a partire da primo_progressivo. Ripetere lo stesso salvataggio
+        non ha effetto (le righe già presenti vengono ignorate), così un batch può essere ritentato senza rischi.
+        """
+        raise NotImplementedError
+
+    def salvaDoms(self, mesociclo_id, settimana, primo_progressivo, lista_doms):
+        """Salva i valori DOMS (DOMSData) in un'unica transazione, numerati a partire da primo_progressivo; ripetibile."""
+        raise NotImplementedError
+
+    def caricaMesocicloAttivo(self, utente):
+        """
+        Legge con una sola query stato, serie e DOMS del mesociclo attivo dell'utente;
+        restituisce (mesociclo_id, stato, performance_data, doms_data) o None (vedi mesociclo_da_righe).
+        """
+        raise NotImplementedError
+
+
+def crea_backend(specifica: str = None) -> BackendDAO:
+    """
+    Crea il backend descritto da una stringa "nome[:argomento]":
+        "mariadb"                -> MariaDB tramite DBConnect e connector.cnf
+        "sqlite[:percorso]"      -> SQLite embedded (default ":memory:")
+        "memoria:percorso.json"  -> tabelle in memoria caricate da un dump JSON
+
+    Se la specifica non è indicata viene letta dalla variabile d'ambiente CHATBOTAI_DB (default "mariadb").
+    I moduli dei backend sono importati solo se usati, così SQLite e memoria non richiedono mysql-connector.
+    """
+    if specifica is None:
+        specifica = os.getenv(VARIABILE_AMBIENTE, BACKEND_DEFAULT)
+    nome, _, argomento = specifica.partition(":")
+    nome = nome.strip().lower()
+
+    if nome == "mariadb":
+        from database.backend_mariadb import BackendMariaDB
+        return BackendMariaDB()
+    if nome == "sqlite":
+        from database.backend_sqlite import BackendSQLite
+        return BackendSQLite(argomento or ":memory:")
+    if nome == "memoria":
+        from database.backend_memoria import BackendMemoria
+        return BackendMemoria.da_json(argomento) if argomento else BackendMemoria()
+    raise ValueError(f"Backend di persistenza sconosciuto: {specifica}")
@@ -0,0 +1,245 @@
+from contextlib import contextmanager
+from datetime import datetime
+
+from database.DB_connect import DBConnect
+from database.backend import (BackendDAO, COLONNE_CATALOGO, COLONNE_DOMS, COLONNE_SERIE,
+                              mesociclo_da_righe, righe_doms, righe_serie, stato_in_testo)
+from model.esercizio import Esercizio
+
+# Colonne selezionate per gli esercizi del catalogo (senza descrizione, caricata al primo accesso)
+_SELECT_ESERCIZI = ", ".join(f"e.{colonna}" for colonna in COLONNE_CATALOGO)
+
+# Tabelle dei progressi (stesso schema del backend SQLite), create al primo utilizzo se mancano
+SCHEMA_PROGRESSI = {
+    "mesocycles": """create table if not exists fitness_db.mesocycles (
+    id int auto_increment primary key,
+    utente varchar(100) not null,
+    creato_il datetime not null,
+    attivo tinyint not null default 1,
+    stato text,
+    index idx_mesocycles_utente (utente, attivo)
+)""",
+    "performance_sets": """create table if not exists fitness_db.performance_sets (
+    mesocycle_id int not null,
+    sessione int not null,
+    serie int not null,
+    settimana int not null,
+    giorno int not null,
+    esercizio_id int not null,
+    muscolo_primario varchar(100) not null,
+    mmc tinyint not null,
+    pump tinyint not null,
+    dolori_articolari tinyint not null,
+    carico double not null,
+    ripetizioni int not null,
+    rep_range varchar(20) not null,
+    primary key (mesocycle_id, sessione, serie),
+    foreign key (mesocycle_id) references fitness_db.mesocycles(id)
+)""",
+    "doms_entries": """create table if not exists fitness_db.doms_entries (
+    mesocycle_id int not null,
+    posizione int not null,
+    settimana int not null,
+    giorno int not null,
+    muscolo varchar(100) not null,
+    doms_value tinyint not null,
+    primary key (mesocycle_id, posizione),
+    foreign key (mesocycle_id) references fitness_db.mesocycles(id)
+)""",
+}
+
+# Un batch ritentato dopo un errore non deve fallire sulle righe già salvate: "on duplicate key update" senza
+# modifiche invece di "insert ignore", che produrrebbe un warning (errore con raise_on_warnings)
+_INSERT_SERIE = (f"insert into fitness_db.performance_sets ({', '.join(COLONNE_SERIE)}) "
+                 f"values ({', '.join('%s' for _ in COLONNE_SERIE)}) on duplicate key update serie = serie")
+_INSERT_DOMS = (f"insert into fitness_db.doms_entries ({', '.join(COLONNE_DOMS)}) "
+                f"values ({', '.join('%s' for _ in COLONNE_DOMS)}) on duplicate key update posizione = posizione")
+
+
+class BackendMariaDB(BackendDAO):
+    """
+    Backend MariaDB: ogni query prende in prestito una connessione dal pool di DBConnect (connector.cnf)
+    con il context manager connessione(), che la restituisce al pool anche in caso di errore.
+    """
+    nome = "mariadb"
+    # le tabelle dei progressi vengono verificate una sola volta per processo
+    _schema_progressi_pronto = False
+
+    @staticmethod
+    def _esegui(query, parametri=()):
+        with DBConnect.connessione() as cnx:
+            cursor = cnx.cursor(dictionary = True)
+            try:
+                cursor.execute(query, parametri)
+                return cursor.fetchall()
+            finally:
+                cursor.close()
+
+    @classmethod
+    def _crea_schema_progressi(cls):
+        """
+        Crea le tabelle dei progressi mancanti. Si creano solo quelle assenti da information_schema:
+        "create table if not exists" su una tabella esistente genera una nota, trattata come errore
+        da raise_on_warnings in connector.cnf. Alle tabelle mesocycles create prima dello stato del piano
+        si aggiunge la colonna stato.
+        """
+        if cls._schema_progressi_pronto:
+            return
+        with DBConnect.connessione() as cnx:
+            cursor = cnx.cursor()
+            try:
+                cursor.execute("""select t.table_name
+from information_schema.tables t
+where t.table_schema = 'fitness_db'
+""")
+                esistenti = {nome.lower() for nome, in cursor.fetchall()}
+                for tabella, istruzione in SCHEMA_PROGRESSI.items():
+                    if tabella not in esistenti:
+                        cursor.execute(istruzione)
+                if "mesocycles" in esistenti:
+                    cursor.execute("""select count(*)
+from information_schema.columns c
+where c.table_schema = 'fitness_db' and c.table_name = 'mesocycles' and c.column_name = 'stato'
+""")
+                    if not cursor.fetchone()[0]:
+                        cursor.execute("alter table fitness_db.mesocycles add column stato text")
+            finally:
+                cursor.close()
+        cls._schema_progressi_pronto = True
+
+    @classmethod
+    @contextmanager
+    def _transazione(cls):
+        """Cursore su una connessione del pool: commit alla fine del blocco, rollback se il blocco fallisce."""
+        cls._crea_schema_progressi()
+        with DBConnect.connessione() as cnx:
+            cursor = cnx.cursor()
+            try:
+                yield cursor
+                cnx.commit()
+            except BaseException:
+                cnx.rollback()
+                raise
+            finally:
+                cursor.close()
+
+    def getEsercizi(self, context, muscolo):
+        query = f"""select {_SELECT_ESERCIZI}
+from fitness_db.exercises e, fitness_db.contexts c, fitness_db.exercise_context_priority ecp
+where c.nome = %s and c.id = ecp.context_id and e.muscolo_primario = %s
+and ecp.exercise_id = e.id and ecp.priority_level <> 99
+order by ecp.priority_level asc
+"""
+        return [Esercizio.da_riga(row) for row in self._esegui(query, (context, muscolo))]
+
+    def getEserciziPerMuscoli(self, context, muscoli, top_n=None):
+        muscoli = list(muscoli)
+        if not muscoli:
+            return {}
+        segnaposto = ", ".join(["%s"] * len(muscoli))
+        query = f"""select *
+from (select {_SELECT_ESERCIZI}, row_number() over (partition by e.muscolo_primario
+                                     order by ecp.priority_level asc, e.id asc) as posizione
+      from fitness_db.exercises e, fitness_db.contexts c, fitness_db.exercise_context_priority ecp
+      where c.nome = %s and c.id = ecp.context_id and e.muscolo_primario in ({segnaposto})
+      and ecp.exercise_id = e.id and ecp.priority_level <> 99) t
+where %s is null or t.posizione <= %s
+order by t.muscolo_primario, t.posizione
+"""
+        results = {muscolo: [] for muscolo in muscoli}
+        for row in self._esegui(query, (context, *muscoli, top_n, top_n)):
+            del row["posizione"]
+            results[row["muscolo_primario"]].append(Esercizio.da_riga(row))
+        return results
+
+    def getAllEsercizi(self):
+        query = f"""select {_SELECT_ESERCIZI}
+from fitness_db.exercises e
+"""
+        return [Esercizio.da_riga(row) for row in self._esegui(query)]
+
+    def getDescrizioneEsercizio(self, esercizio_id):
+        query = """select e.descrizione
+from fitness_db.exercises e
+where e.id = %s
+"""
+        rows = self._esegui(query, (esercizio_id,))
+        return rows[0]["descrizione"] if rows else None
+
+    def getAllContesti(self):
+        query = """select c.id, c.nome
+from fitness_db.contexts c
+"""
+        return self._esegui(query)
+
+    def getAllPriorita(self):
+        query = """select ecp.exercise_id, ecp.context_id, ecp.priority_level
+from fitness_db.exercise_context_priority ecp
+where ecp.priority_level <> 99
+order by ecp.priority_level asc, ecp.exercise_id asc
+"""
+        return self._esegui(query)
+
+    def getVersioneCatalogo(self):
+        query = """select max(e.updated_at) as versione, count(*) as totale,
+coalesce(sum(crc32(e.id)), 0) as impronta_id,
+coalesce(sum(crc32(concat(e.id, '|', coalesce(e.updated_at, '')))), 0) as impronta_righe
+from fitness_db.exercises e
+"""
+        row = self._esegui(query)[0]
+        # sum() restituisce un Decimal
+        return row["versione"], row["totale"], int(row["impronta_id"]), int(row["impronta_righe"])
+
+    def getEserciziModificatiDopo(self, versione):
+        query = f"""select {_SELECT_ESERCIZI}
+from fitness_db.exercises e
+where e.updated_at >= %s
+"""
+        return [Esercizio.da_riga(row) for row in self._esegui(query, (versione,))]
+
+    # ===== PROGRESSI =====
+
+    def apriMesociclo(self, utente, stato=None):
+        with self._transazione() as cursor:
+            cursor.execute("update fitness_db.mesocycles set attivo = 0 where utente = %s and attivo = 1", (utente,))
+            cursor.execute("insert into fitness_db.mesocycles (utente, creato_il, attivo, stato) values (%s, %s, 1, %s)",
+                           (utente, datetime.now(), stato_in_testo(stato)))
+            return cursor.lastrowid
+
+    def salvaStatoMesociclo(self, mesociclo_id, stato):
+        with self._transazione() as cursor:
+            cursor.execute("update fitness_db.mesocycles set stato = %s where id = %s",
+                           (stato_in_testo(stato), mesociclo_id))
+
+    def salvaPerformance(self, mesociclo_id, settimana, primo_progressivo, performances):
+        righe = righe_serie(mesociclo_id, primo_progressivo, settimana, performances)
+        with self._transazione() as cursor:
+            cursor.executemany(_INSERT_SERIE, righe)
+
+    def salvaDoms(self, mesociclo_id, settimana, primo_progressivo, lista_doms):
+        righe = righe_doms(mesociclo_id, primo_progressivo, settimana, lista_doms)
+        with self._transazione() as cursor:
+            cursor.executemany(_INSERT_DOMS, righe)
+
+    def caricaMesocicloAttivo(self, utente):
+        self._crea_schema_progressi()
+        query = """with attivo as (
+    select m.id, m.stato from fitness_db.mesocycles m where m.utente = %s and m.attivo = 1 order by m.id desc limit 1
+)
+select a.id as mesociclo_id, a.stato, t.*
+from attivo a
+left join (
+    select 0 as tipo, s.sessione as progressivo, s.serie, s.settimana, s.giorno, s.esercizio_id,
+           s.muscolo_primario as muscolo, s.mmc, s.pump, s.dolori_articolari, s.carico, s.ripetizioni,
+           s.rep_range, null as doms_value
+    from fitness_db.performance_sets s
+    where s.mesocycle_id = (select id from attivo)
+    union all
+    select 1, d.posizione, 0, d.settimana, d.giorno, null, d.muscolo, null, null, null, null, null, null,
+           d.doms_value
+    from fitness_db.doms_entries d
+    where d.mesocycle_id = (select id from attivo)
+) t on 1 = 1
+order by t.tipo, t.progressivo, t.serie
+"""
+        return mesociclo_da_righe(self._esegui(query, (utente,)))
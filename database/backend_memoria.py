@@ -0,0 +1,157 @@
+import json
+import threading
+from datetime import datetime
+
+from database.backend import (BackendDAO, COLONNE_DOMS, COLONNE_ESERCIZI, COLONNE_SERIE,
+                              crc32, mesociclo_da_righe, righe_doms, righe_serie, stato_in_testo)
+from model.esercizio import Esercizio
+
+
+class BackendMemoria(BackendDAO):
+    """
+    Backend interamente in memoria: le tre tabelle sono liste di righe dict, indicizzate per
+    (contesto, muscolo) al momento dell'importazione. Pensato per test di carico e dispositivi
+    senza database; ogni query restituisce nuovi oggetti Esercizio, come i backend SQL.
+    """
+    nome = "memoria"
+
+    def __init__(self, esercizi: list[dict] = None, contesti: list[dict] = None, priorita: list[dict] = None):
+        self._lock = threading.Lock()
+        self._esercizi: dict[int, dict] = {}
+        self._contesti: list[dict] = []
+        self._priorita: list[dict] = []
+        self._indice: dict[tuple[str, str], list[dict]] = {}
+        # progressi: mesociclo_id -> riga del mesociclo e relative righe di performance_sets / doms_entries,
+        # indicizzate per chiave primaria ((sessione, serie) e posizione)
+        self._mesocicli: dict[int, dict] = {}
+        self._serie: dict[int, dict[tuple[int, int], dict]] = {}
+        self._doms: dict[int, dict[int, dict]] = {}
+        self.importa(esercizi or [], contesti or [], priorita or [])
+
+    @classmethod
+    def da_json(cls, percorso: str) -> "BackendMemoria":
+        """
+        Crea il backend da un dump JSON con le chiavi "exercises", "contexts" ed "exercise_context_priority"
+        (liste di righe); le date di created_at/updated_at sono in formato ISO.
+        """
+        with open(percorso, encoding="utf-8") as f:
+            dump = json.load(f)
+        esercizi = []
+        for riga in dump.get("exercises", []):
+            riga = dict(riga)
+            for colonna in ("created_at", "updated_at"):
+                if isinstance(riga.get(colonna), str):
+                    riga[colonna] = datetime.fromisoformat(riga[colonna])
+            esercizi.append(riga)
+        return cls(esercizi, dump.get("contexts", []), dump.get("exercise_context_priority", []))
+
+    def importa(self, esercizi: list[dict], contesti: list[dict], priorita: list[dict]):
+        """Aggiunge (o sostituisce, a parità di id) righe alle tabelle e ricostruisce l'indice."""
+        with self._lock:
+            for riga in esercizi:
+                self._esercizi[riga["id"]] = {colonna: riga[colonna] for colonna in COLONNE_ESERCIZI}
+            contesti_per_id = {c["id"]: c for c in self._contesti}
+            contesti_per_id.update({c["id"]: {"id": c["id"], "nome": c["nome"]} for c in contesti})
+            self._contesti = list(contesti_per_id.values())
+            self._priorita.extend({"exercise_id": p["exercise_id"], "context_id": p["context_id"],
+                                   "priority_level": p["priority_level"]} for p in priorita)
+            self._costruisci_indice()
+
+    def _costruisci_indice(self):
+        nomi_contesto = {c["id"]: c["nome"] for c in self._contesti}
+        indice = {}
+        for p in sorted(self._priorita, key=lambda p: (p["priority_level"], p["exercise_id"])):
+            riga = self._esercizi.get(p["exercise_id"])
+            contesto = nomi_contesto.get(p["context_id"])
+            if riga is None or contesto is None or p["priority_level"] == 99:
+                continue
+            indice.setdefault((contesto, riga["muscolo_primario"]), []).append(riga)
+        self._indice = indice
+
+    def getEsercizi(self, context, muscolo):
+        return [Esercizio.da_riga(riga) for riga in self._indice.get((context, muscolo), [])]
+
+    def getEserciziPerMuscoli(self, context, muscoli, top_n=None):
+        return {muscolo: [Esercizio.da_riga(riga) for riga in self._indice.get((context, muscolo), [])[:top_n]]
+                for muscolo in muscoli}
+
+    def getAllEsercizi(self):
+        return [Esercizio.da_riga(riga) for riga in list(self._esercizi.values())]
+
+    def getDescrizioneEsercizio(self, esercizio_id):
+        riga = self._esercizi.get(esercizio_id)
+        return riga["descrizione"] if riga else None
+
+    def getAllContesti(self):
+        return [dict(c) for c in self._contesti]
+
+    def getAllPriorita(self):
+        righe = [dict(p) for p in self._priorita if p["priority_level"] != 99]
+        righe.sort(key=lambda p: (p["priority_level"], p["exercise_id"]))
+        return righe
+
+    def getVersioneCatalogo(self):
+        righe = list(self._esercizi.values())
+        versione = max((r["updated_at"] for r in righe if r["updated_at"] is not None), default=None)
+        impronta_id = sum(crc32(r["id"]) for r in righe)
+        impronta_righe = sum(crc32(f"{r['id']}|{r['updated_at'] or ''}") for r in righe)
+        return versione, len(righe), impronta_id, impronta_righe
+
+    def getEserciziModificatiDopo(self, versione):
+        return [Esercizio.da_riga(riga) for riga in list(self._esercizi.values())
+                if riga["updated_at"] is not None and riga["updated_at"] >= versione]
+
+    # ===== PROGRESSI =====
+
+    def apriMesociclo(self, utente, stato=None):
+        with self._lock:
+            for mesociclo in self._mesocicli.values():
+                if mesociclo["utente"] == utente:
+                    mesociclo["attivo"] = 0
+            mesociclo_id = len(self._mesocicli) + 1
+            self._mesocicli[mesociclo_id] = {"id": mesociclo_id, "utente": utente, "creato_il": datetime.now(),
+                                             "attivo": 1, "stato": stato_in_testo(stato)}
+            self._serie[mesociclo_id] = {}
+            self._doms[mesociclo_id] = {}
+            return mesociclo_id
+
+    def salvaStatoMesociclo(self, mesociclo_id, stato):
+        with self._lock:
+            self._mesocicli[mesociclo_id]["stato"] = stato_in_testo(stato)
+
+    def salvaPerformance(self, mesociclo_id, settimana, primo_progressivo, performances):
+        righe = [dict(zip(COLONNE_SERIE, riga))
+                 for riga in righe_serie(mesociclo_id, primo_progressivo, settimana, performances)]
+        with self._lock:
+            serie = self._serie[mesociclo_id]
+            for riga in righe:
+                # come la chiave primaria delle tabelle SQL: le righe già salvate restano invariate
+                serie.setdefault((riga["sessione"], riga["serie"]), riga)
+
+    def salvaDoms(self, mesociclo_id, settimana, primo_progressivo, lista_doms):
+        righe = [dict(zip(COLONNE_DOMS, riga))
+                 for riga in righe_doms(mesociclo_id, primo_progressivo, settimana, lista_doms)]
+        with self._lock:
+            doms = self._doms[mesociclo_id]
+            for riga in righe:
+                doms.setdefault(riga["posizione"], riga)
+
+    def caricaMesocicloAttivo(self, utente):
+        with self._lock:
+            attivi = [m for m in self._mesocicli.values() if m["utente"] == utente and m["attivo"]]
+            if not attivi:
+                return None
+            mesociclo = max(attivi, key=lambda m: m["id"])
+            serie = [riga for _, riga in sorted(self._serie[mesociclo["id"]].items())]
+            doms = [riga for _, riga in sorted(self._doms[mesociclo["id"]].items())]
+        # stesse righe della query dei backend SQL; un mesociclo senza dati dà una sola riga con tipo None
+        testata = {"mesociclo_id": mesociclo["id"], "stato": mesociclo["stato"]}
+        righe = [{**testata, "tipo": 0, "progressivo": r["sessione"], "serie": r["serie"],
+                  "settimana": r["settimana"], "giorno": r["giorno"], "esercizio_id": r["esercizio_id"],
+                  "muscolo": r["muscolo_primario"], "mmc": r["mmc"], "pump": r["pump"],
+                  "dolori_articolari": r["dolori_articolari"], "carico": r["carico"],
+                  "ripetizioni": r["ripetizioni"], "rep_range": r["rep_range"], "doms_value": None}
+                 for r in serie]
+        righe += [{**testata, "tipo": 1, "progressivo": r["posizione"], "settimana": r["settimana"],
+                   "giorno": r["giorno"], "muscolo": r["muscolo"], "doms_value": r["doms_value"]} for r in doms]
+        return mesociclo_da_righe(righe or [{**testata, "tipo": None}])
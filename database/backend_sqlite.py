@@ -0,0 +1,283 @@
+import json
+import sqlite3
+import sys
+import threading
+from datetime import datetime
+
+from database.backend import (BackendDAO, COLONNE_CATALOGO, COLONNE_DOMS, COLONNE_ESERCIZI, COLONNE_SERIE,
+                              crc32, mesociclo_da_righe, righe_doms, righe_serie, stato_in_testo)
+from model.esercizio import Esercizio
+
+# Stesso schema delle tabelle MariaDB di fitness_db; le date sono salvate come testo ISO
+SCHEMA = """
+create table if not exists exercises (
+    id integer primary key,
+    nome text not null,
+    attrezzatura text,
+    livello integer,
+    muscolo_primario text not null,
+    muscoli_secondari text,
+    recupero_secondi integer,
+    affaticamento integer,
+    tipologia text,
+    articolazioni text,
+    descrizione text,
+    range_ripetizioni text,
+    created_at text,
+    updated_at text
+);
+create table if not exists contexts (
+    id integer primary key,
+    nome text not null unique
+);
+create table if not exists exercise_context_priority (
+    exercise_id integer not null references exercises(id),
+    context_id integer not null references contexts(id),
+    priority_level integer not null,
+    primary key (exercise_id, context_id)
+);
+create table if not exists mesocycles (
+    id integer primary key autoincrement,
+    utente text not null,
+    creato_il text not null,
+    attivo integer not null default 1,
+    stato text
+);
+create table if not exists performance_sets (
+    mesocycle_id integer not null references mesocycles(id),
+    sessione integer not null,
+    serie integer not null,
+    settimana integer not null,
+    giorno integer not null,
+    esercizio_id integer not null,
+    muscolo_primario text not null,
+    mmc integer not null,
+    pump integer not null,
+    dolori_articolari integer not null,
+    carico real not null,
+    ripetizioni integer not null,
+    rep_range text not null,
+    primary key (mesocycle_id, sessione, serie)
+);
+create table if not exists doms_entries (
+    mesocycle_id integer not null references mesocycles(id),
+    posizione integer not null,
+    settimana integer not null,
+    giorno integer not null,
+    muscolo text not null,
+    doms_value integer not null,
+    primary key (mesocycle_id, posizione)
+);
+create index if not exists idx_mesocycles_utente on mesocycles(utente, attivo);
+create index if not exists idx_exercises_muscolo on exercises(muscolo_primario);
+create index if not exists idx_exercises_updated on exercises(updated_at);
+create index if not exists idx_ecp_contesto on exercise_context_priority(context_id, priority_level);
+"""
+
+# Colonne selezionate per gli esercizi del catalogo (senza descrizione, caricata al primo accesso)
+_SELECT_ESERCIZI = ", ".join(f"e.{colonna}" for colonna in COLONNE_CATALOGO)
+
+# "or ignore": un batch ritentato dopo un errore non duplica né rifiuta le righe già salvate
+_INSERT_SERIE = (f"insert or ignore into performance_sets ({', '.join(COLONNE_SERIE)}) "
+                 f"values ({', '.join('?' for _ in COLONNE_SERIE)})")
+_INSERT_DOMS = (f"insert or ignore into doms_entries ({', '.join(COLONNE_DOMS)}) "
+                f"values ({', '.join('?' for _ in COLONNE_DOMS)})")
+
+
+def _a_testo(valore):
+    """Converte liste e date nel formato in cui sono memorizzate nelle colonne di testo."""
+    if isinstance(valore, datetime):
+        return valore.isoformat(sep=" ")
+    if isinstance(valore, (list, tuple)):
+        return json.dumps(list(valore))
+    return valore
+
+
+def _da_testo_data(valore):
+    return datetime.fromisoformat(valore) if isinstance(valore, str) else valore
+
+
+class BackendSQLite(BackendDAO):
+    """
+    Backend SQLite embedded, con lo stesso schema di MariaDB. Usa una sola connessione protetta
+    da un lock (un database ":memory:" esiste solo all'interno della propria connessione).
+    """
+    nome = "sqlite"
+
+    def __init__(self, percorso: str = ":memory:"):
+        self.percorso = percorso
+        self._lock = threading.Lock()
+        self._cnx = sqlite3.connect(percorso, check_same_thread=False)
+        self._cnx.row_factory = sqlite3.Row
+        # crc32() come in MariaDB, per le impronte di getVersioneCatalogo
+        self._cnx.create_function("crc32", 1, crc32, deterministic=True)
+        with self._lock:
+            self._cnx.executescript(SCHEMA)
+            # file creati prima dello stato del piano: la colonna va aggiunta a mano
+            colonne = {riga["name"] for riga in self._cnx.execute("pragma table_info(mesocycles)")}
+            if "stato" not in colonne:
+                self._cnx.execute("alter table mesocycles add column stato text")
+
+    def _esegui(self, query, parametri=()):
+        with self._lock:
+            cursor = self._cnx.execute(query, parametri)
+            results = cursor.fetchall()
+            cursor.close()
+        return results
+
+    @staticmethod
+    def _esercizio(row) -> Esercizio:
+        riga = dict(row)
+        riga["created_at"] = _da_testo_data(riga["created_at"])
+        riga["updated_at"] = _da_testo_data(riga["updated_at"])
+        return Esercizio.da_riga(riga)
+
+    def importa(self, esercizi: list[dict], contesti: list[dict], priorita: list[dict]):
+        """Inserisce (o sostituisce) le righe delle tre tabelle in un'unica transazione."""
+        colonne = ", ".join(COLONNE_ESERCIZI)
+        segnaposto = ", ".join("?" for _ in COLONNE_ESERCIZI)
+        with self._lock, self._cnx:
+            self._cnx.executemany("insert or replace into contexts (id, nome) values (?, ?)",
+                                  [(c["id"], c["nome"]) for c in contesti])
+            self._cnx.executemany(f"insert or replace into exercises ({colonne}) values ({segnaposto})",
+                                  [tuple(_a_testo(e[c]) for c in COLONNE_ESERCIZI) for e in esercizi])
+            self._cnx.executemany("""insert or replace into exercise_context_priority
+(exercise_id, context_id, priority_level) values (?, ?, ?)""",
+                                  [(p["exercise_id"], p["context_id"], p["priority_level"]) for p in priorita])
+
+    def copia_da(self, sorgente: BackendDAO):
+        """Copia il catalogo da un altro backend (es. MariaDB), per usarlo poi senza server."""
+        esercizi = []
+        for esercizio in sorgente.getAllEsercizi():
+            riga = esercizio.come_riga()
+            if riga["descrizione"] is None:
+                riga["descrizione"] = sorgente.getDescrizioneEsercizio(esercizio.id)
+            esercizi.append(riga)
+        self.importa(esercizi, sorgente.getAllContesti(), sorgente.getAllPriorita())
+
+    def getEsercizi(self, context, muscolo):
+        query = f"""select {_SELECT_ESERCIZI}
+from exercises e, contexts c, exercise_context_priority ecp
+where c.nome = ? and c.id = ecp.context_id and e.muscolo_primario = ?
+and ecp.exercise_id = e.id and ecp.priority_level <> 99
+order by ecp.priority_level asc
+"""
+        return [self._esercizio(row) for row in self._esegui(query, (context, muscolo))]
+
+    def getEserciziPerMuscoli(self, context, muscoli, top_n=None):
+        muscoli = list(muscoli)
+        if not muscoli:
+            return {}
+        segnaposto = ", ".join(["?"] * len(muscoli))
+        query = f"""select *
+from (select {_SELECT_ESERCIZI}, row_number() over (partition by e.muscolo_primario
+                                     order by ecp.priority_level asc, e.id asc) as posizione
+      from exercises e, contexts c, exercise_context_priority ecp
+      where c.nome = ? and c.id = ecp.context_id and e.muscolo_primario in ({segnaposto})
+      and ecp.exercise_id = e.id and ecp.priority_level <> 99) t
+where ? is null or t.posizione <= ?
+order by t.muscolo_primario, t.posizione
+"""
+        results = {muscolo: [] for muscolo in muscoli}
+        for row in self._esegui(query, (context, *muscoli, top_n, top_n)):
+            riga = dict(row)
+            del riga["posizione"]
+            results[riga["muscolo_primario"]].append(self._esercizio(riga))
+        return results
+
+    def getAllEsercizi(self):
+        query = f"""select {_SELECT_ESERCIZI}
+from exercises e
+"""
+        return [self._esercizio(row) for row in self._esegui(query)]
+
+    def getDescrizioneEsercizio(self, esercizio_id):
+        query = """select e.descrizione
+from exercises e
+where e.id = ?
+"""
+        rows = self._esegui(query, (esercizio_id,))
+        return rows[0]["descrizione"] if rows else None
+
+    def getAllContesti(self):
+        query = """select c.id, c.nome
+from contexts c
+"""
+        return [dict(row) for row in self._esegui(query)]
+
+    def getAllPriorita(self):
+        query = """select ecp.exercise_id, ecp.context_id, ecp.priority_level
+from exercise_context_priority ecp
+where ecp.priority_level <> 99
+order by ecp.priority_level asc, ecp.exercise_id asc
+"""
+        return [dict(row) for row in self._esegui(query)]
+
+    def getVersioneCatalogo(self):
+        query = """select max(e.updated_at) as versione, count(*) as totale,
+coalesce(sum(crc32(e.id)), 0) as impronta_id,
+coalesce(sum(crc32(e.id || '|' || coalesce(e.updated_at, ''))), 0) as impronta_righe
+from exercises e
+"""
+        row = self._esegui(query)[0]
+        return _da_testo_data(row["versione"]), row["totale"], row["impronta_id"], row["impronta_righe"]
+
+    def getEserciziModificatiDopo(self, versione):
+        query = f"""select {_SELECT_ESERCIZI}
+from exercises e
+where e.updated_at >= ?
+"""
+        return [self._esercizio(row) for row in self._esegui(query, (_a_testo(versione),))]
+
+    # ===== PROGRESSI =====
+
+    def apriMesociclo(self, utente, stato=None):
+        with self._lock, self._cnx:
+            self._cnx.execute("update mesocycles set attivo = 0 where utente = ? and attivo = 1", (utente,))
+            cursor = self._cnx.execute("insert into mesocycles (utente, creato_il, attivo, stato) values (?, ?, 1, ?)",
+                                       (utente, _a_testo(datetime.now()), stato_in_testo(stato)))
+            return cursor.lastrowid
+
+    def salvaStatoMesociclo(self, mesociclo_id, stato):
+        with self._lock, self._cnx:
+            self._cnx.execute("update mesocycles set stato = ? where id = ?", (stato_in_testo(stato), mesociclo_id))
+
+    def salvaPerformance(self, mesociclo_id, settimana, primo_progressivo, performances):
+        righe = righe_serie(mesociclo_id, primo_progressivo, settimana, performances)
+        with self._lock, self._cnx:
+            self._cnx.executemany(_INSERT_SERIE, righe)
+
+    def salvaDoms(self, mesociclo_id, settimana, primo_progressivo, lista_doms):
+        righe = righe_doms(mesociclo_id, primo_progressivo, settimana, lista_doms)
+        with self._lock, self._cnx:
+            self._cnx.executemany(_INSERT_DOMS, righe)
+
+    def caricaMesocicloAttivo(self, utente):
+        query = """with attivo as (
+    select m.id, m.stato from mesocycles m where m.utente = ? and m.attivo = 1 order by m.id desc limit 1
+)
+select a.id as mesociclo_id, a.stato, t.*
+from attivo a
+left join (
+    select 0 as tipo, s.sessione as progressivo, s.serie, s.settimana, s.giorno, s.esercizio_id,
+           s.muscolo_primario as muscolo, s.mmc, s.pump, s.dolori_articolari, s.carico, s.ripetizioni,
+           s.rep_range, null as doms_value
+    from performance_sets s
+    where s.mesocycle_id = (select id from attivo)
+    union all
+    select 1, d.posizione, 0, d.settimana, d.giorno, null, d.muscolo, null, null, null, null, null, null,
+           d.doms_value
+    from doms_entries d
+    where d.mesocycle_id = (select id from attivo)
+) t on 1 = 1
+order by t.tipo, t.progressivo, t.serie
+"""
+        return mesociclo_da_righe(dict(row) for row in self._esegui(query, (utente,)))
+
+
+if __name__ == '__main__':
+    # Esporta il catalogo da MariaDB in un file SQLite: python -m database.backend_sqlite fitness.db
+    from database.backend_mariadb import BackendMariaDB
+    destinazione = BackendSQLite(sys.argv[1] if len(sys.argv) > 1 else "fitness.db")
+    destinazione.copia_da(BackendMariaDB())
+    print(f"Catalogo copiato in {destinazione.percorso}: {destinazione.getVersioneCatalogo()[1]} esercizi")
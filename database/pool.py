@@ -0,0 +1,188 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from model.logging_config import get_logger
+
+logger = get_logger("database")
+
+
+class PoolEsauritoError(TimeoutError):
+    """Nessuna connessione si è liberata entro il timeout di acquisizione."""
+
+
+class PoolConnessioni:
+    """
+    Pool di connessioni thread-safe, indipendente dal driver.
+    Le connessioni vengono create al bisogno fino alla dimensione massima; quando sono tutte
+    in uso acquisisci() attende (fino al timeout) che una venga restituita, invece di fallire
+    subito. Una connessione rimasta inattiva oltre `verifica_dopo_secondi` viene controllata
+    prima di essere prestata e, se non risponde, sostituita con una nuova. Al rilascio la connessione
+    viene ripristinata (es. rollback della transazione aperta) prima di tornare tra quelle libere.
+    """
+
+    def __init__(self, crea_connessione, dimensione: int = 3, timeout_acquisizione: float = 10.0,
+                 verifica_dopo_secondi: float = 30.0, verifica_connessione=None, errori_connessione: tuple = (),
+                 ripristina_connessione=None):
+        """
+        Args:
+            crea_connessione: Callable senza argomenti che apre una nuova connessione.
+            dimensione: Numero massimo di connessioni aperte contemporaneamente.
+            timeout_acquisizione: Secondi di attesa massima in acquisisci() prima di PoolEsauritoError.
+            verifica_dopo_secondi: Inattività oltre la quale la connessione viene verificata prima dell'uso.
+            verifica_connessione: Callable(connessione) -> bool; se None le connessioni non vengono verificate.
+            errori_connessione: Eccezioni che, sollevate dentro connessione(), indicano una connessione
+                da scartare invece che da restituire al pool.
+            ripristina_connessione: Callable(connessione) chiamata al rilascio, prima di rimettere la connessione
+                tra quelle libere (es. rollback); se solleva un'eccezione la connessione viene scartata.
+        """
+        if dimensione < 1:
+            raise ValueError("La dimensione del pool deve essere almeno 1")
+        self.dimensione = dimensione
+        self.timeout_acquisizione = timeout_acquisizione
+        self.verifica_dopo_secondi = verifica_dopo_secondi
+        self._crea_connessione = crea_connessione
+        self._verifica_connessione = verifica_connessione
+        self._errori_connessione = tuple(errori_connessione)
+        self._ripristina_connessione = ripristina_connessione
+
+        self._condizione = threading.Condition()
+        self._libere = []  # pila di (connessione, istante ultimo rilascio): si riusa la più recente
+        self._aperte = 0
+        self._in_uso = 0
+
+        # contatori per il monitoraggio
+        self._acquisizioni = 0
+        self._attese = 0
+        self._attesa_totale = 0.0
+        self._attesa_massima = 0.0
+        self._esaurimenti = 0
+        self._timeout = 0
+        self._riconnessioni = 0
+
+    def acquisisci(self, timeout: float = None):
+        """
+        Presta una connessione, attendendo al massimo `timeout` secondi (default: timeout_acquisizione)
+        se il pool è esaurito. La connessione va restituita con rilascia().
+        """
+        timeout = self.timeout_acquisizione if timeout is None else timeout
+        inizio = time.monotonic()
+        with self._condizione:
+            esaurito = not self._libere and self._aperte >= self.dimensione
+            if esaurito:
+                self._esaurimenti += 1
+                logger.debug("Pool esaurito (%d connessioni in uso): attesa di una connessione libera",
+                             self._in_uso)
+            while not self._libere and self._aperte >= self.dimensione:
+                rimanente = timeout - (time.monotonic() - inizio)
+                if rimanente <= 0:
+                    self._timeout += 1
+                    logger.warning("Nessuna connessione libera entro %.1f s: pool di %d connessioni esaurito",
+                                   timeout, self.dimensione)
+                    raise PoolEsauritoError(
+                        f"Nessuna connessione libera entro {timeout:.1f} s ({self.dimensione} in uso)")
+                self._condizione.wait(rimanente)
+
+            if self._libere:
+                connessione, ultimo_rilascio = self._libere.pop()
+            else:
+                # slot riservato: la connessione viene aperta fuori dal lock
+                connessione, ultimo_rilascio = None, None
+                self._aperte += 1
+            self._in_uso += 1
+
+            attesa = time.monotonic() - inizio
+            self._acquisizioni += 1
+            if esaurito:
+                self._attese += 1
+            self._attesa_totale += attesa
+            self._attesa_massima = max(self._attesa_massima, attesa)
+
+        try:
+            if connessione is None:
+                connessione = self._crea_connessione()
+            elif self._da_verificare(ultimo_rilascio) and not self._verifica_connessione(connessione):
+                logger.info("Connessione inattiva non più valida: riconnessione")
+                self._chiudi_silenziosamente(connessione)
+                connessione = self._crea_connessione()
+                with self._condizione:
+                    self._riconnessioni += 1
+        except BaseException:
+            with self._condizione:
+                self._aperte -= 1
+                self._in_uso -= 1
+                self._condizione.notify()
+            raise
+        return connessione
+
+    def rilascia(self, connessione, scarta: bool = False):
+        """Restituisce una connessione al pool; con scarta=True la chiude e libera il suo posto."""
+        if not scarta and self._ripristina_connessione is not None:
+            try:
+                self._ripristina_connessione(connessione)
+            except Exception as ex:
+                logger.info("Ripristino della connessione non riuscito (%s): connessione scartata", ex)
+                scarta = True
+        with self._condizione:
+            self._in_uso -= 1
+            if scarta:
+                self._aperte -= 1
+            else:
+                self._libere.append((connessione, time.monotonic()))
+            self._condizione.notify()
+        if scarta:
+            self._chiudi_silenziosamente(connessione)
+
+    @contextmanager
+    def connessione(self, timeout: float = None):
+        """
+        Context manager che presta una connessione e la restituisce sempre, anche in caso di eccezione.
+        Se l'eccezione è uno degli errori di connessione la connessione viene scartata.
+        """
+        connessione = self.acquisisci(timeout)
+        scarta = False
+        try:
+            yield connessione
+        except self._errori_connessione:
+            scarta = True
+            raise
+        finally:
+            self.rilascia(connessione, scarta=scarta)
+
+    def chiudi(self):
+        """Chiude le connessioni libere; quelle in uso verranno chiuse quando scartate dal chiamante."""
+        with self._condizione:
+            libere, self._libere = self._libere, []
+            self._aperte -= len(libere)
+            self._condizione.notify_all()
+        for connessione, _ in libere:
+            self._chiudi_silenziosamente(connessione)
+
+    def statistiche(self) -> dict:
+        """Contatori del pool per il monitoraggio (tempi di attesa in secondi)."""
+        with self._condizione:
+            return {
+                "dimensione": self.dimensione,
+                "aperte": self._aperte,
+                "in_uso": self._in_uso,
+                "libere": len(self._libere),
+                "acquisizioni": self._acquisizioni,
+                "attese": self._attese,
+                "attesa_totale_s": self._attesa_totale,
+                "attesa_massima_s": self._attesa_massima,
+                "attesa_media_s": self._attesa_totale / self._acquisizioni if self._acquisizioni else 0.0,
+                "esaurimenti": self._esaurimenti,
+                "timeout": self._timeout,
+                "riconnessioni": self._riconnessioni,
+            }
+
+    def _da_verificare(self, ultimo_rilascio) -> bool:
+        return (self._verifica_connessione is not None
+                and time.monotonic() - ultimo_rilascio > self.verifica_dopo_secondi)
+
+    @staticmethod
+    def _chiudi_silenziosamente(connessione):
+        try:
+            connessione.close()
+        except Exception:
+            pass
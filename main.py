@@ -1,6 +1,8 @@
 import flet as ft
 from UI.view import View
 from UI.controller import Controller
+from model.logging_config import configura_logging
+from database.DAO import DAO
 
 def main(page: ft.Page):
     # Inizializza il Controller, che gestisce la logica
@@ -16,4 +18,8 @@ def main(page: ft.Page):
     # page.horizontal_alignment = ft.CrossAxisAlignment.CENTER
 
 if __name__ == "__main__":
+    # Livelli per sottosistema configurabili con CHATBOTAI_LOG, es. "generazione=DEBUG,controller=INFO"
+    configura_logging()
+    # Backend dati scelto con CHATBOTAI_DB, es. "sqlite:fitness.db" o "memoria:catalogo.json" (default MariaDB)
+    DAO.get_backend()
     ft.app(target=main)
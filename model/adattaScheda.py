@@ -6,9 +6,33 @@ from collections import defaultdict
 
 
 # Importa le tue classi esistenti
+from model.archivio_performance import ArchivioPerformance
 from model.esercizio import Esercizio
+from model.storico_allenamenti import StoricoAllenamenti
 from model.workoutday import WorkoutDay
 from model.trainingweek import TrainingWeek
+from model.logging_config import get_logger
+
+logger = get_logger("adattamento")
+
+# RIR target della prima e dell'ultima settimana di un mesociclo
+RIR_INIZIALE = 4
+RIR_FINALE = 2
+
+
+def rir_progressivo_per_durata(settimane: int, rir_iniziale: int = RIR_INIZIALE,
+                               rir_finale: int = RIR_FINALE) -> Dict[int, int]:
+    """
+    RIR target di ogni settimana di un mesociclo di `settimane` settimane: scende linearmente
+    da rir_iniziale a rir_finale (arrotondato per eccesso), es. 3 settimane -> {1: 4, 2: 3, 3: 2}.
+    """
+    if settimane < 1:
+        raise ValueError(f"Un mesociclo deve avere almeno una settimana: {settimane}")
+    if settimane == 1:
+        return {1: rir_iniziale}
+    passo = (rir_iniziale - rir_finale) / (settimane - 1)
+    return {settimana: math.ceil(rir_iniziale - passo * (settimana - 1) - 1e-9)
+            for settimana in range(1, settimane + 1)}
 
 
 @dataclass
@@ -111,9 +135,11 @@ class DOMSData:
 @dataclass
 class TrainingAlgorithm:
     """
-    Classe centrale che gestisce la logica di adattamento dell'allenamento su un mesociclo di 3 settimane.
+    Classe centrale che gestisce la logica di adattamento dell'allenamento su un mesociclo di
+    `settimane_mesociclo` settimane (3 di default, la durata guidata dall'interfaccia con i metodi _settimana_1/2/3).
     Raccoglie dati di performance e DOMS, li analizza e fornisce raccomandazioni per
-    le settimane successive.
+    le settimane successive. I mesocicli conclusi restano nello storico (nuovo_mesociclo non scarta nulla),
+    su cui si calcolano analisi che attraversano più mesocicli, come la tendenza dell'1RM.
 
     Attributes:
         performance_data (Dict[int, List[PerformanceData]]): Un dizionario che mappa il numero della settimana a una lista di dati di performance.
@@ -121,15 +147,54 @@ class TrainingAlgorithm:
         sfr_settimana_1 (Dict[int, float]): Dizionario che memorizza l'SFR medio per ogni esercizio nella settimana 1.
         sfr_settimana_3 (Dict[int, float]): Dizionario che memorizza l'SFR medio per ogni esercizio nella settimana 3.
         sfr_medio_finale (Dict[int, float]): Dizionario che memorizza l'SFR medio finale (media di sett. 1 e 3) per ogni esercizio.
-        rir_progressivo (Dict[int, int]): Mappa il RIR (Reps in Reserve) target per ogni settimana del ciclo.
+        settimane_mesociclo (int): Durata del mesociclo; l'ultima settimana misura la perdita di performance rispetto alla penultima.
+        rir_progressivo (Dict[int, int]): Mappa il RIR (Reps in Reserve) target per ogni settimana del ciclo;
+            se non indicata è ricavata dalla durata (rir_progressivo_per_durata).
+        archivio (ArchivioPerformance): Indici e aggregati su performance_data e doms_data, aggiornati a ogni inserimento.
+        storico (StoricoAllenamenti): Tutti i mesocicli registrati; l'ultimo è `archivio`.
     """
     performance_data: Dict[int, List[PerformanceData]] = field(default_factory=dict) # Con default_factory, ogni istanza ottiene il suo dizionario separato.
     doms_data: Dict[int, List[DOMSData]] = field(default_factory=dict)
     sfr_settimana_1: Dict[int, float] = field(default_factory=dict)
     sfr_settimana_3: Dict[int, float] = field(default_factory=dict)
     sfr_medio_finale: Dict[int, float] = field(default_factory=dict)
-    rir_progressivo: Dict[int, int] = field(default_factory=lambda: {1: 4, 2: 3, 3: 2})
+    settimane_mesociclo: int = 3
+    rir_progressivo: Optional[Dict[int, int]] = None
     exercise_details_map: Dict[int, Esercizio] = field(default_factory=dict)
+    storico: StoricoAllenamenti = field(default_factory=StoricoAllenamenti, repr=False, compare=False)
+    archivio: ArchivioPerformance = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.rir_progressivo is None:
+            self.rir_progressivo = rir_progressivo_per_durata(self.settimane_mesociclo)
+        self.archivio = self.storico.apri_mesociclo(self._nuovo_archivio())
+
+    def _nuovo_archivio(self) -> ArchivioPerformance:
+        """
+        Archivio del mesociclo corrente: condivide i dizionari di performance e DOMS (indicizzando i dati
+        eventualmente già presenti) e confronta l'ultima settimana con la penultima per la perdita di performance.
+        """
+        confronto = {self.settimane_mesociclo: self.settimane_mesociclo - 1} if self.settimane_mesociclo > 1 else {}
+        return ArchivioPerformance(self.performance_data, self.doms_data, settimana_di_confronto=confronto)
+
+    def nuovo_mesociclo(self, settimane: int = None):
+        """
+        Inizia un nuovo mesociclo: performance, DOMS e SFR correnti ripartono vuoti,
+        mentre il mesociclo concluso resta nello storico.
+
+        Args:
+            settimane (int, optional): Durata del nuovo mesociclo, se diversa dal precedente;
+                il RIR progressivo viene ricavato dalla nuova durata.
+        """
+        if settimane is not None:
+            self.settimane_mesociclo = settimane
+            self.rir_progressivo = rir_progressivo_per_durata(settimane)
+        self.performance_data = {}
+        self.doms_data = {}
+        self.sfr_settimana_1 = {}
+        self.sfr_settimana_3 = {}
+        self.sfr_medio_finale = {}
+        self.archivio = self.storico.apri_mesociclo(self._nuovo_archivio())
 
     def aggiungi_performance(self, settimana: int, performance: PerformanceData):
         """
@@ -139,9 +204,7 @@ class TrainingAlgorithm:
             settimana (int): Il numero della settimana a cui appartengono i dati.
             performance (PerformanceData): L'oggetto PerformanceData da aggiungere.
         """
-        if settimana not in self.performance_data:
-            self.performance_data[settimana] = []
-        self.performance_data[settimana].append(performance)
+        self.storico.aggiungi_performance(settimana, performance)
 
     def aggiungi_doms(self, settimana: int, doms: DOMSData):
         """
@@ -151,9 +214,7 @@ class TrainingAlgorithm:
             settimana (int): Il numero della settimana a cui appartengono i dati.
             doms (DOMSData): L'oggetto DOMSData da aggiungere.
         """
-        if settimana not in self.doms_data:
-            self.doms_data[settimana] = []
-        self.doms_data[settimana].append(doms)
+        self.storico.aggiungi_doms(settimana, doms)
 
     def _calcola_1rm_epley(self, carico: float, ripetizioni: int) -> float:
         """
@@ -181,27 +242,26 @@ class TrainingAlgorithm:
         Returns:
             Dict[int, float]: Un dizionario che mappa l'ID di ogni esercizio al suo SFR medio calcolato.
         """
-        sfr_per_esercizio = {}
-
         if 1 not in self.performance_data:
-            return sfr_per_esercizio
+            return {}
+
+        # FI = max(1, Dolori + Perdita Performance). In settimana 1, Perdita Performance = 0.
+        self.sfr_settimana_1 = self.calcola_sfr_settimana(1)
 
-        for perf in self.performance_data[1]:
-            # FI = max(1, Dolori + Perdita Performance). In settimana 1, Perdita Performance = 0.
-            perf.fi = max(1, perf.dolori_articolari + 0)
-            perf.sfr = perf.rsm / perf.fi
+        return self.sfr_settimana_1
 
-            if perf.esercizio_id not in sfr_per_esercizio:
-                sfr_per_esercizio[perf.esercizio_id] = []
-            sfr_per_esercizio[perf.esercizio_id].append(perf.sfr)
+    def calcola_sfr_settimana(self, settimana: int) -> Dict[int, float]:
+        """
+        SFR medio di ogni esercizio in una settimana qualsiasi del mesociclo corrente. L'SFR di ogni sessione
+        è calcolato dall'archivio al momento dell'inserimento, quindi qui si leggono solo le medie.
 
-        # Calcola la media dell'SFR per ogni esercizio e la memorizza nell'attributo di classe.
-        self.sfr_settimana_1 = {
-            esercizio_id: sum(sfr_list) / len(sfr_list)
-            for esercizio_id, sfr_list in sfr_per_esercizio.items()
-        }
+        Args:
+            settimana (int): Il numero della settimana.
 
-        return self.sfr_settimana_1
+        Returns:
+            Dict[int, float]: Un dizionario che mappa l'ID di ogni esercizio al suo SFR medio calcolato.
+        """
+        return self.archivio.sfr_settimana(settimana)
 
     def calcola_previsione_serie_settimana_2(self, muscolo: str, esperienza: str) -> tuple[str, str | None]:
         """
@@ -219,11 +279,7 @@ class TrainingAlgorithm:
         if 2 not in self.doms_data:
             return "mantieni", "Dati DOMS non disponibili per la settimana 2."
 
-        doms_muscolo = None
-        for doms in self.doms_data[2]:
-            if doms.muscolo.lower() == muscolo.lower():
-                doms_muscolo = doms.doms_value
-                break
+        doms_muscolo = self.archivio.doms(muscolo, 2)
 
         if doms_muscolo is None:
             return "mantieni", f"Valore DOMS non inserito per {muscolo}."
@@ -260,37 +316,25 @@ class TrainingAlgorithm:
         Returns:
             Dict[int, float]: Un dizionario che mappa l'ID di ogni esercizio al suo miglioramento percentuale medio.
         """
-        if 1 not in self.performance_data or 2 not in self.performance_data:
+        return self.calcola_miglioramento_performance(1, 2)
+
+    def calcola_miglioramento_performance(self, da: int, a: int) -> Dict[int, float]:
+        """
+        Miglioramento percentuale medio dell'1RM di ogni esercizio tra due settimane qualsiasi del mesociclo corrente,
+        confrontando solo serie con lo stesso range di ripetizioni target.
+
+        Args:
+            da (int): La settimana di riferimento.
+            a (int): La settimana da confrontare.
+
+        Returns:
+            Dict[int, float]: Un dizionario che mappa l'ID di ogni esercizio al suo miglioramento percentuale medio.
+        """
+        if da not in self.performance_data or a not in self.performance_data:
             return {}
 
-        # Raggruppa gli 1RM per (esercizio_id, rep_range) e per settimana.
-        dati_per_gruppo = defaultdict(lambda: defaultdict(list))
-        for settimana, performances in self.performance_data.items():
-            if settimana in [1, 2]:
-                for perf in performances:
-                    for carico, reps, rep_range in perf.sets:
-                        one_rm = self._calcola_1rm_epley(carico, reps)
-                        if one_rm > 0:
-                            chiave = (perf.esercizio_id, rep_range)
-                            dati_per_gruppo[chiave][settimana].append(one_rm)
-
-        miglioramenti_per_esercizio = defaultdict(list)
-        for (esercizio_id, rep_range), dati_settimanali in dati_per_gruppo.items():
-            if 1 in dati_settimanali and 2 in dati_settimanali:
-                avg_1rm_sett1 = sum(dati_settimanali[1]) / len(dati_settimanali[1])
-                avg_1rm_sett2 = sum(dati_settimanali[2]) / len(dati_settimanali[2])
-
-                if avg_1rm_sett1 > 0:
-                    miglioramento_pct = ((avg_1rm_sett2 - avg_1rm_sett1) / avg_1rm_sett1) * 100
-                    miglioramenti_per_esercizio[esercizio_id].append(miglioramento_pct)
-
-        # Calcola la media dei miglioramenti per ogni esercizio.
-        risultato_finale = {}
-        for esercizio_id, lista_miglioramenti in miglioramenti_per_esercizio.items():
-            if lista_miglioramenti:
-                risultato_finale[esercizio_id] = sum(lista_miglioramenti) / len(lista_miglioramenti)
-
-        return risultato_finale
+        # 1RM medi per (esercizio_id, rep_range) e variazione tra le due settimane, dal registro colonnare delle serie
+        return self.archivio.serie.miglioramento_percentuale(da, a)
 
     def calcola_punti_performance_settimana_2(self) -> Dict[int, int]:
         """
@@ -363,40 +407,12 @@ class TrainingAlgorithm:
         Returns:
             Dict[int, float]: Un dizionario che mappa l'ID di ogni esercizio al suo SFR medio calcolato.
         """
-        sfr_per_esercizio = {}
-
         if 3 not in self.performance_data:
-            return sfr_per_esercizio
-
-        # Calcola 1RM medi della settimana 2 per il confronto
-        one_rm_sett2 = defaultdict(list)
-        if 2 in self.performance_data:
-            for perf in self.performance_data[2]:
-                one_rm_sett2[perf.esercizio_id].append(perf.one_rm)
-
-        avg_one_rm_sett2 = {
-            ex_id: sum(rm_list) / len(rm_list) for ex_id, rm_list in one_rm_sett2.items()
-        }
-
-        # Calcola SFR per la settimana 3
-        for perf in self.performance_data[3]:
-            # Calcola la perdita di performance in percentuale
-            if perf.esercizio_id in avg_one_rm_sett2:
-                rm_sett2 = avg_one_rm_sett2[perf.esercizio_id]
-                if rm_sett2 > 0:
-                    perdita_pct = ((rm_sett2 - perf.one_rm) / rm_sett2) * 100
-                    perf.perdita_performance = max(0, perdita_pct)  # Considera solo cali
-
-            perf.fi = max(1, perf.dolori_articolari + perf.perdita_performance)
-            perf.sfr = perf.rsm / perf.fi
-
-            if perf.esercizio_id not in sfr_per_esercizio:
-                sfr_per_esercizio[perf.esercizio_id] = []
-            sfr_per_esercizio[perf.esercizio_id].append(perf.sfr)
+            return {}
 
-        self.sfr_settimana_3 = {
-            ex_id: sum(sfr_list) / len(sfr_list) for ex_id, sfr_list in sfr_per_esercizio.items()
-        }
+        # Perdita di performance rispetto all'1RM medio della settimana 2, calcolata dall'archivio a ogni inserimento
+        # (e ricalcolata se la settimana 2 riceve sessioni dopo la 3)
+        self.sfr_settimana_3 = self.calcola_sfr_settimana(3)
 
         return self.sfr_settimana_3
 
@@ -448,7 +464,7 @@ class TrainingAlgorithm:
         # Calcola l'SFR medio finale se non è già stato fatto
         sfr_finali = self.calcola_sfr_medio_finale()
         if not sfr_finali or not self.exercise_details_map:
-            print("Dati SFR o mappa esercizi mancanti per l'analisi.")
+            logger.warning("Dati SFR o mappa esercizi mancanti per l'analisi.")
             return {}
 
         # Raggruppa gli esercizi e i loro SFR per muscolo primario
@@ -489,13 +505,9 @@ class TrainingAlgorithm:
             settimana (int): Il numero della settimana.
 
         Returns:
-            List[int]: Una lista di ID di esercizi unici.
+            List[int]: Una lista di ID di esercizi unici, in ordine di prima registrazione.
         """
-        if settimana not in self.performance_data:
-            return []
-
-        esercizi = {perf.esercizio_id for perf in self.performance_data[settimana] if perf.muscolo_primario.lower() == muscolo.lower()}
-        return list(esercizi)
+        return self.archivio.esercizi_per_muscolo(muscolo, settimana)
 
     def get_rsm_esercizio(self, esercizio_id: int, settimana: int) -> float:
         """
@@ -509,12 +521,7 @@ class TrainingAlgorithm:
         Returns:
             float: L'RSM medio calcolato.
         """
-        if settimana not in self.performance_data:
-            return 0.0
-
-        rsm_values = [perf.rsm for perf in self.performance_data[settimana] if perf.esercizio_id == esercizio_id]
-
-        return sum(rsm_values) / len(rsm_values) if rsm_values else 0.0
+        return self.archivio.rsm_medio(esercizio_id, settimana)
 
     # ===== REPORT =====
     def genera_report_completo(self) -> str:
@@ -0,0 +1,171 @@
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from model.registro_serie import RegistroSerie
+
+if TYPE_CHECKING:
+    from model.adattaScheda import DOMSData, PerformanceData
+
+
+@dataclass(slots=True)
+class StatisticheEsercizio:
+    """Aggregati di un esercizio in una settimana, aggiornati a ogni sessione registrata."""
+    sessioni: int = 0
+    somma_rsm: float = 0.0
+    somma_1rm: float = 0.0
+    somma_sfr: float = 0.0
+    migliore_1rm: float = 0.0
+
+    @property
+    def rsm_medio(self) -> float:
+        return self.somma_rsm / self.sessioni if self.sessioni else 0.0
+
+    @property
+    def one_rm_medio(self) -> float:
+        return self.somma_1rm / self.sessioni if self.sessioni else 0.0
+
+    @property
+    def sfr_medio(self) -> float:
+        return self.somma_sfr / self.sessioni if self.sessioni else 0.0
+
+
+class ArchivioPerformance:
+    """
+    Archivio delle performance e dei DOMS di un mesociclo, indicizzato per (settimana, esercizio)
+    e (settimana, muscolo). Gli aggregati (RSM, SFR, 1RM) si aggiornano in aggiungi_performance,
+    quindi le interrogazioni non scorrono mai le sessioni registrate.
+
+    L'SFR di una sessione è RSM / FI, con FI = max(1, dolori articolari + perdita di performance);
+    la perdita è il calo percentuale dell'1RM rispetto alla media della settimana di confronto
+    (SETTIMANA_DI_CONFRONTO, di default solo la settimana 3 rispetto alla 2) ed è 0 nelle altre settimane.
+    Se la settimana di confronto riceve nuove sessioni dopo quelle della settimana confrontata,
+    l'SFR dell'esercizio viene marcato da ricalcolare e ricalcolato alla lettura successiva.
+
+    Le sessioni restano anche in `per_settimana` ({settimana: [PerformanceData]}, in ordine di inserimento),
+    lo stesso dizionario esposto da TrainingAlgorithm.performance_data, e le singole serie nel registro
+    colonnare `serie`; i muscoli sono confrontati senza distinzione tra maiuscole e minuscole.
+    """
+    # settimana -> settimana rispetto alla quale si misura la perdita di performance
+    SETTIMANA_DI_CONFRONTO = {3: 2}
+
+    def __init__(self, per_settimana: Dict[int, List["PerformanceData"]] = None,
+                 doms_per_settimana: Dict[int, List["DOMSData"]] = None,
+                 settimana_di_confronto: Dict[int, int] = None):
+        self.per_settimana = per_settimana if per_settimana is not None else {}
+        self.doms_per_settimana = doms_per_settimana if doms_per_settimana is not None else {}
+        if settimana_di_confronto is not None:
+            # mesocicli di durata diversa: l'ultima settimana si confronta con la penultima
+            self.SETTIMANA_DI_CONFRONTO = settimana_di_confronto
+        self._statistiche: Dict[Tuple[int, int], StatisticheEsercizio] = {}
+        # dict usato come insieme ordinato: gli id in ordine di prima registrazione
+        self._esercizi_per_muscolo: Dict[Tuple[int, str], Dict[int, None]] = {}
+        self._esercizi_per_settimana: Dict[int, Dict[int, None]] = {}
+        self._sessioni: Dict[Tuple[int, int], List["PerformanceData"]] = {}
+        self._sfr_da_ricalcolare: set[Tuple[int, int]] = set()
+        self._doms: Dict[Tuple[int, str], int] = {}
+        self.serie = RegistroSerie()
+        # sessioni e valori DOMS registrati: danno il progressivo con cui vengono salvati nel database
+        self.numero_sessioni = 0
+        self.numero_doms = 0
+        self._indicizza()
+
+    def _indicizza(self):
+        """Costruisce gli indici sulle sessioni già presenti nei dizionari ricevuti."""
+        for settimana, performances in self.per_settimana.items():
+            for performance in performances:
+                self._indicizza_performance(settimana, performance)
+        for settimana, lista_doms in self.doms_per_settimana.items():
+            for doms in lista_doms:
+                self._doms.setdefault((settimana, doms.muscolo.lower()), doms.doms_value)
+            self.numero_doms += len(lista_doms)
+
+    def _indicizza_performance(self, settimana: int, performance: "PerformanceData"):
+        chiave = (settimana, performance.esercizio_id)
+        statistiche = self._statistiche.get(chiave)
+        if statistiche is None:
+            statistiche = self._statistiche[chiave] = StatisticheEsercizio()
+            self._sessioni[chiave] = []
+            self._esercizi_per_settimana.setdefault(settimana, {})[performance.esercizio_id] = None
+        self._sessioni[chiave].append(performance)
+        self.numero_sessioni += 1
+        statistiche.sessioni += 1
+        statistiche.somma_rsm += performance.rsm
+        statistiche.somma_1rm += performance.one_rm
+        statistiche.somma_sfr += self._calcola_sfr(settimana, performance)
+        if performance.one_rm > statistiche.migliore_1rm:
+            statistiche.migliore_1rm = performance.one_rm
+        self._esercizi_per_muscolo.setdefault((settimana, performance.muscolo_primario.lower()), {})[
+            performance.esercizio_id] = None
+        self.serie.aggiungi(settimana, performance)
+
+        # la media 1RM di questa settimana è cambiata: l'SFR delle settimane che la usano come confronto va ricalcolato
+        for confrontata, confronto in self.SETTIMANA_DI_CONFRONTO.items():
+            if confronto == settimana and (confrontata, performance.esercizio_id) in self._statistiche:
+                self._sfr_da_ricalcolare.add((confrontata, performance.esercizio_id))
+
+    def _calcola_sfr(self, settimana: int, performance: "PerformanceData") -> float:
+        """Calcola (e salva nella sessione) perdita di performance, FI e SFR rispetto agli aggregati correnti."""
+        confronto = self.SETTIMANA_DI_CONFRONTO.get(settimana)
+        if confronto is None:
+            performance.fi = max(1, performance.dolori_articolari)
+        else:
+            perdita = 0.0
+            statistiche_confronto = self._statistiche.get((confronto, performance.esercizio_id))
+            if statistiche_confronto is not None:
+                rm_confronto = statistiche_confronto.one_rm_medio
+                if rm_confronto > 0:
+                    # Considera solo cali
+                    perdita = max(0, ((rm_confronto - performance.one_rm) / rm_confronto) * 100)
+            performance.perdita_performance = perdita
+            performance.fi = max(1, performance.dolori_articolari + perdita)
+        performance.sfr = performance.rsm / performance.fi
+        return performance.sfr
+
+    def _ricalcola_sfr(self):
+        for chiave in self._sfr_da_ricalcolare:
+            settimana = chiave[0]
+            statistiche = self._statistiche[chiave]
+            statistiche.somma_sfr = 0.0
+            for performance in self._sessioni[chiave]:
+                statistiche.somma_sfr += self._calcola_sfr(settimana, performance)
+        self._sfr_da_ricalcolare.clear()
+
+    def aggiungi_performance(self, settimana: int, performance: "PerformanceData"):
+        self.per_settimana.setdefault(settimana, []).append(performance)
+        self._indicizza_performance(settimana, performance)
+
+    def aggiungi_doms(self, settimana: int, doms: "DOMSData"):
+        self.doms_per_settimana.setdefault(settimana, []).append(doms)
+        self.numero_doms += 1
+        # a parità di muscolo vale il primo valore registrato, come nella ricerca lineare precedente
+        self._doms.setdefault((settimana, doms.muscolo.lower()), doms.doms_value)
+
+    @property
+    def durata(self) -> int:
+        """Numero dell'ultima settimana con sessioni registrate (0 se l'archivio è vuoto)."""
+        return max(self.per_settimana, default=0)
+
+    def statistiche(self, esercizio_id: int, settimana: int) -> Optional[StatisticheEsercizio]:
+        """Aggregati dell'esercizio nella settimana, o None se non è stato registrato."""
+        if self._sfr_da_ricalcolare:
+            self._ricalcola_sfr()
+        return self._statistiche.get((settimana, esercizio_id))
+
+    def sfr_settimana(self, settimana: int) -> Dict[int, float]:
+        """SFR medio di ogni esercizio della settimana, in ordine di prima registrazione: O(numero di esercizi)."""
+        if self._sfr_da_ricalcolare:
+            self._ricalcola_sfr()
+        return {esercizio_id: self._statistiche[(settimana, esercizio_id)].sfr_medio
+                for esercizio_id in self._esercizi_per_settimana.get(settimana, ())}
+
+    def rsm_medio(self, esercizio_id: int, settimana: int) -> float:
+        statistiche = self._statistiche.get((settimana, esercizio_id))
+        return statistiche.rsm_medio if statistiche else 0.0
+
+    def esercizi_per_muscolo(self, muscolo: str, settimana: int) -> List[int]:
+        """Id degli esercizi registrati per il muscolo nella settimana, in ordine di prima registrazione."""
+        return list(self._esercizi_per_muscolo.get((settimana, muscolo.lower()), ()))
+
+    def doms(self, muscolo: str, settimana: int) -> Optional[int]:
+        """Valore DOMS registrato per il muscolo nella settimana, o None se manca."""
+        return self._doms.get((settimana, muscolo.lower()))
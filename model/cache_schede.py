@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+
+from model.logging_config import get_logger
+from model.trainingweek import TrainingWeek
+
+logger = get_logger("generazione")
+
+
+class CacheSchede:
+    """
+    Cache LRU delle settimane generate, indicizzata per input normalizzati
+    (versione del catalogo, contesto, livello, giorni, muscolo target, override, settimana, seme).
+
+    Le settimane sono immutabili, quindi la cache le condivide senza copie: ogni lettura restituisce
+    la settimana con la data di inizio richiesta, che condivide esercizi e log con quella in cache;
+    le modifiche del chiamante (es. l'autoregolazione) creano nuovi giorni e non alterano la cache.
+    """
+    DIMENSIONE_MASSIMA = 512
+
+    def __init__(self, dimensione_massima: int = DIMENSIONE_MASSIMA):
+        self.dimensione_massima = dimensione_massima
+        self._lock = threading.Lock()
+        self._settimane: OrderedDict[tuple, TrainingWeek] = OrderedDict()
+        self._hit = 0
+        self._miss = 0
+        self._rimozioni = 0
+
+    @staticmethod
+    def chiave(versione_catalogo, context, livello, giorni, muscolo_target, volume_overrides, settimana,
+               seed) -> tuple:
+        """Chiave normalizzata: gli override diventano una tupla ordinata, così l'ordine delle voci è irrilevante."""
+        overrides = tuple(sorted(volume_overrides.items())) if volume_overrides else None
+        return versione_catalogo, context, livello, int(giorni), muscolo_target, overrides, int(settimana), seed
+
+    def get_o_genera(self, chiave: tuple, genera, data_inizio) -> TrainingWeek:
+        """
+        Restituisce la settimana in cache per `chiave` con la data indicata; se manca,
+        la genera con `genera()` (senza tenere il lock, così più richieste diverse procedono in parallelo).
+        """
+        with self._lock:
+            modello = self._settimane.get(chiave)
+            if modello is not None:
+                self._settimane.move_to_end(chiave)
+                self._hit += 1
+            else:
+                self._miss += 1
+
+        if modello is None:
+            modello = genera()
+            with self._lock:
+                self._settimane[chiave] = modello
+                self._settimane.move_to_end(chiave)
+                while len(self._settimane) > self.dimensione_massima:
+                    self._settimane.popitem(last=False)
+                    self._rimozioni += 1
+            logger.debug("Cache schede: generata la settimana %s", chiave)
+
+        return modello.con_data_inizio(data_inizio)
+
+    def svuota(self):
+        with self._lock:
+            self._settimane.clear()
+
+    def statistiche(self) -> dict:
+        """Contatori della cache, come statistiche() del pool di connessioni."""
+        with self._lock:
+            richieste = self._hit + self._miss
+            return {
+                "dimensione": len(self._settimane),
+                "dimensione_massima": self.dimensione_massima,
+                "hit": self._hit,
+                "miss": self._miss,
+                "rimozioni": self._rimozioni,
+                "hit_rate": self._hit / richieste if richieste else 0.0,
+            }
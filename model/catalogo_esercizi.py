@@ -0,0 +1,230 @@
+import asyncio
+import threading
+import time
+
+from database.DAO import DAO
+from database.backend import crc32
+from database.DAO_async import DAOAsync
+from model.esercizio import Esercizio
+from model.volume_indiretto import MatriceContributi
+
+
+class CatalogoEsercizi:
+    """
+    Indice in memoria del catalogo esercizi, condiviso da tutto il processo.
+    Carica una sola volta le tabelle `exercises`, `contexts` e `exercise_context_priority`
+    (una query massiva ciascuna) e risponde alle richieste (contesto, muscolo) senza
+    ulteriori accessi al database.
+
+    Il catalogo è marcato con una versione (max `updated_at`, numero di righe e impronte CRC32 degli
+    id e delle righe di `exercises`, vedi DAO.getVersioneCatalogo): trascorso il TTL, la versione
+    viene riconvalidata con una sola query e, se sono cambiate solo alcune righe, vengono ricaricati
+    solo gli esercizi modificati. Le modifiche alla sola tabella delle priorità non alterano la
+    versione e richiedono una chiamata esplicita a invalida().
+    """
+    # un catalogo per processo: tutti i Model condividono le stesse tabelle in memoria e la stessa riconvalida TTL
+    _istanza = None
+    _lock_istanza = threading.Lock()
+
+    TTL_SECONDI = 60
+
+    def __init__(self, ttl_secondi: float = TTL_SECONDI):
+        self.ttl_secondi = ttl_secondi
+        self._lock = threading.RLock()
+        self._esercizi: dict[int, Esercizio] = {}
+        self._contesti: list[dict] = []
+        self._priorita: list[dict] = []
+        self._indice: dict[tuple[str, str], list[Esercizio]] = {}
+        self._matrice_contributi = MatriceContributi()
+        self._versione = None
+        self._totale = 0
+        self._impronta_id = 0
+        self._impronta_righe = 0
+        self._ultima_verifica = 0.0
+        self._caricato = False
+        # incrementata a ogni ricostruzione dell'indice, anche per modifiche alle sole priorità
+        self._generazione = 0
+
+    @classmethod
+    def get_istanza(cls) -> "CatalogoEsercizi":
+        """Restituisce il catalogo condiviso dal processo, creandolo al primo utilizzo."""
+        if cls._istanza is None:
+            with cls._lock_istanza:
+                if cls._istanza is None:
+                    cls._istanza = cls()
+        return cls._istanza
+
+    def carica(self):
+        """Carica (o ricarica) l'intero catalogo dal database e ricostruisce l'indice."""
+        with self._lock:
+            versione_catalogo = DAO.getVersioneCatalogo()
+            esercizi = DAO.getAllEsercizi()
+            self._contesti = DAO.getAllContesti()
+            self._priorita = DAO.getAllPriorita()
+            self._esercizi = {e.id: e for e in esercizi}
+            self._costruisci_indice()
+            self._imposta_versione(versione_catalogo)
+            self._caricato = True
+
+    def _imposta_versione(self, versione_catalogo: tuple):
+        self._versione, self._totale, self._impronta_id, self._impronta_righe = versione_catalogo
+        self._ultima_verifica = time.monotonic()
+
+    async def carica_async(self):
+        """
+        Variante async di carica(): le query sulle tre tabelle e sulla versione vengono eseguite
+        in parallelo (asyncio.gather), quindi il caricamento costa circa un solo round trip al DB.
+        """
+        versione_catalogo, esercizi, contesti, priorita = await asyncio.gather(
+            DAOAsync.getVersioneCatalogo(), DAOAsync.getAllEsercizi(), DAOAsync.getAllContesti(),
+            DAOAsync.getAllPriorita())
+        self.carica_da_snapshot((esercizi, contesti, priorita, versione_catalogo))
+
+    async def assicura_caricato_async(self):
+        """Carica o riconvalida il catalogo senza bloccare l'event loop; se è già valido non esegue query."""
+        if not self._caricato:
+            await self.carica_async()
+        elif time.monotonic() - self._ultima_verifica > self.ttl_secondi:
+            await asyncio.to_thread(self.verifica_versione)
+
+    def snapshot(self) -> tuple:
+        """
+        Restituisce una copia serializzabile (picklable) del catalogo, usata per trasferirlo
+        una sola volta ai processi worker senza che questi debbano interrogare il database.
+        """
+        with self._lock:
+            self._assicura_caricato()
+            return (list(self._esercizi.values()), list(self._contesti), list(self._priorita),
+                    (self._versione, self._totale, self._impronta_id, self._impronta_righe))
+
+    def carica_da_snapshot(self, snapshot: tuple, ttl_secondi: float = None):
+        """
+        Installa un catalogo ottenuto con snapshot() senza accedere al database.
+
+        Args:
+            snapshot: La tupla restituita da snapshot().
+            ttl_secondi: Se indicato sostituisce il TTL corrente (es. float("inf") per non riconvalidare mai).
+        """
+        esercizi, contesti, priorita, versione_catalogo = snapshot
+        with self._lock:
+            if ttl_secondi is not None:
+                self.ttl_secondi = ttl_secondi
+            self._contesti = list(contesti)
+            self._priorita = list(priorita)
+            self._esercizi = {e.id: e for e in esercizi}
+            self._costruisci_indice()
+            self._imposta_versione(versione_catalogo)
+            self._caricato = True
+
+    def _costruisci_indice(self):
+        """
+        Costruisce la mappa {(contesto, muscolo): [Esercizio, ...]} ordinata per priorità
+        a partire dagli esercizi, dai contesti e dalle priorità (già prive del livello 99) in memoria.
+        """
+        nomi_contesto = {c["id"]: c["nome"] for c in self._contesti}
+
+        righe_per_chiave = {}
+        for riga in self._priorita:
+            esercizio = self._esercizi.get(riga["exercise_id"])
+            contesto = nomi_contesto.get(riga["context_id"])
+            if esercizio is None or contesto is None:
+                continue
+            chiave = (contesto, esercizio.muscolo_primario)
+            righe_per_chiave.setdefault(chiave, []).append((riga["priority_level"], esercizio))
+
+        indice = {}
+        for chiave, righe in righe_per_chiave.items():
+            # sort stabile: a parità di priorità si mantiene l'ordine restituito dal DB
+            righe.sort(key=lambda x: x[0])
+            indice[chiave] = [esercizio for _, esercizio in righe]
+
+        self._indice = indice
+        self._matrice_contributi = MatriceContributi(self._esercizi.values())
+        self._generazione += 1
+
+    def verifica_versione(self):
+        """
+        Riconvalida il catalogo con una singola query sulla versione.
+        Se è cambiato l'insieme degli esercizi (inserimenti o cancellazioni, anche in egual numero)
+        ricarica l'intero catalogo; se sono cambiate solo alcune righe ricarica quelle con updated_at
+        non precedente alla versione in memoria e, se l'impronta delle righe in memoria non coincide
+        ancora con quella del database (es. updated_at riportato indietro), ricarica tutto.
+        """
+        with self._lock:
+            versione_catalogo = DAO.getVersioneCatalogo()
+            versione, totale, impronta_id, impronta_righe = versione_catalogo
+            if ((totale, impronta_id) != (self._totale, self._impronta_id)
+                    or (self._versione is None and versione is not None)):
+                self.carica()
+                return
+            if impronta_righe != self._impronta_righe:
+                if versione is None or self._versione is None:
+                    self.carica()
+                    return
+                for esercizio in DAO.getEserciziModificatiDopo(min(self._versione, versione)):
+                    self._esercizi[esercizio.id] = esercizio
+                if self._impronta_righe_in_memoria() != impronta_righe:
+                    self.carica()
+                    return
+                self._costruisci_indice()
+            self._imposta_versione(versione_catalogo)
+
+    def _impronta_righe_in_memoria(self) -> int:
+        """Impronta delle righe calcolata sugli esercizi in memoria, con la stessa formula di getVersioneCatalogo."""
+        return sum(crc32(f"{e.id}|{e.updated_at or ''}") for e in self._esercizi.values())
+
+    def invalida(self):
+        """Scarta l'indice in memoria: il prossimo accesso ricaricherà le tabelle dal DB."""
+        with self._lock:
+            self._esercizi = {}
+            self._contesti = []
+            self._priorita = []
+            self._indice = {}
+            self._matrice_contributi = MatriceContributi()
+            self._versione = None
+            self._totale = 0
+            self._impronta_id = 0
+            self._impronta_righe = 0
+            self._caricato = False
+
+    def _assicura_caricato(self):
+        if not self._caricato:
+            self.carica()
+        elif time.monotonic() - self._ultima_verifica > self.ttl_secondi:
+            self.verifica_versione()
+
+    def get_esercizi(self, context, muscolo) -> list[Esercizio]:
+        """
+        Restituisce gli esercizi per un contesto e un muscolo, ordinati per priorità
+        (equivalente in memoria di DAO.getEsercizi).
+        """
+        self._assicura_caricato()
+        return list(self._indice.get((context, muscolo), []))
+
+    def get_esercizi_per_muscoli(self, context, muscoli, top_n=None) -> dict[str, list[Esercizio]]:
+        """Equivalente in memoria di DAO.getEserciziPerMuscoli: {muscolo: [Esercizio, ...]} ordinati per priorità."""
+        self._assicura_caricato()
+        return {muscolo: self._indice.get((context, muscolo), [])[:top_n] for muscolo in muscoli}
+
+    def get_matrice_contributi(self) -> MatriceContributi:
+        """Matrice esercizio × muscolo del volume indiretto, costruita al caricamento del catalogo."""
+        self._assicura_caricato()
+        return self._matrice_contributi
+
+    def get_generazione(self) -> int:
+        """
+        Contatore del contenuto del catalogo: cambia ogni volta che l'indice viene ricostruito,
+        usato per scartare i risultati calcolati su un catalogo precedente (es. la cache delle schede).
+        """
+        self._assicura_caricato()
+        return self._generazione
+
+    def get_esercizio(self, esercizio_id) -> Esercizio | None:
+        """Restituisce l'esercizio con l'id indicato, o None se non presente nel catalogo."""
+        self._assicura_caricato()
+        return self._esercizi.get(esercizio_id)
+
+    def get_mappa_esercizi(self) -> dict[int, Esercizio]:
+        """Restituisce una copia della mappa {id: Esercizio} dell'intero catalogo."""
+        self._assicura_caricato()
+        return dict(self._esercizi)
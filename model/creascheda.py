@@ -1,18 +1,82 @@
-from datetime import datetime
+from collections import defaultdict
+from datetime import datetime, timedelta
+import asyncio
+import logging
 import random
 
 from database.DAO import DAO
+from model.cache_schede import CacheSchede
+from model.catalogo_esercizi import CatalogoEsercizi
+from model.distribuzione_serie import TabelleDistribuzione
+from model.logging_config import get_logger
+from model.prescrizione import ZonaRipetizioni
 from model.trainingweek import TrainingWeek
+from model.volume_indiretto import MatriceContributi
 from model.workoutday import WorkoutDay
 
+logger = get_logger("generazione")
+
+
+def crea_rng(seed=None):
+    """
+    Generatore casuale di una richiesta di generazione: `seed` può essere un random.Random (usato così
+    com'è), un seme (int, str, ...) da cui crearne uno nuovo, o None per usare il generatore globale del
+    modulo random, come prima dell'introduzione del seme.
+    """
+    if seed is None:
+        return random
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def deriva_semi(seed, quanti: int) -> list:
+    """
+    Semi indipendenti per `quanti` richieste derivati da un unico seme (None se il seme è None),
+    usati dalle generazioni batch e parallele.
+    """
+    if seed is None:
+        return [None] * quanti
+    generatore = crea_rng(seed)
+    return [generatore.getrandbits(64) for _ in range(quanti)]
+
 
 class Model:
-    def __init__(self):
+    # Candidati per muscolo letti per la generazione: _scegli_heavy_light usa solo i primi due
+    ESERCIZI_PER_MUSCOLO = 2
+
+    # Giorni di allenamento settimanali offerti per livello (gli intermedi a 4 giorni seguono uno split dedicato)
+    FREQUENZE_SUPPORTATE = {
+        "principiante": (2, 3),
+        "intermedio": (3, 4, 5, 6),
+    }
+
+    # Ordine di esecuzione dei giorni della scheda a 4 giorni, dopo il muscolo target:
+    # (muscolo, "heavy" | "light" | None per pesante e poi leggero)
+    SEQUENZA_GIORNI_1_3 = (("Petto", "heavy"), ("Schiena", "heavy"), ("Petto", "light"), ("Schiena", "light"),
+                           ("Spalle", None), ("Polpacci", None))
+    SEQUENZA_GIORNI_2_4 = (("Quadricipiti", "heavy"), ("Glutei", None), ("Femorali", None),
+                           ("Quadricipiti", "light"), ("Bicipiti", None), ("Tricipiti", None))
+
+    def __init__(self, usa_catalogo: bool = True, dimensione_cache: int = CacheSchede.DIMENSIONE_MASSIMA):
         """
         Costruttore della classe Model.
         Inizializza gli attributi necessari, come la mappatura degli split.
+
+        Args:
+            usa_catalogo: Se True (default) gli esercizi sono letti dal catalogo in memoria condiviso dal processo;
+                se False ogni settimana generata li legge dal DB con una sola query per tutti i muscoli.
+            dimensione_cache: Numero massimo di settimane riproducibili (generate con un seme) tenute in cache;
+                0 disabilita la cache, che è comunque usata solo con il catalogo.
         """
         self._context = None
+        # Indice in memoria degli esercizi, condiviso dal processo: dopo il primo caricamento
+        # la generazione non interroga il DB
+        self.usa_catalogo = usa_catalogo
+        self.catalogo = CatalogoEsercizi.get_istanza()
+        self.cache_schede = CacheSchede(dimensione_cache) if usa_catalogo and dimensione_cache > 0 else None
+        # Senza catalogo, matrice del volume indiretto riempita con gli esercizi letti dal DB
+        self._matrice_contributi = MatriceContributi()
         self.split_muscoli = {
             "Full Body": ["Petto", "Schiena", "Spalle", "Bicipiti", "Tricipiti", "Quadricipiti", "Femorali", "Glutei",
                           "Polpacci"],
@@ -36,12 +100,18 @@ class Model:
             "Polpacci"
         ]
 
-    # --------------------------------
+        # Gruppi muscolari (nell'ordine di esecuzione) della scheda intermedia a 4 giorni
+        self.muscoli_giorni_1_3 = ["Petto", "Schiena", "Spalle", "Polpacci"]  # Giorni 1 e 3
+        self.muscoli_giorni_2_4 = ["Quadricipiti", "Glutei", "Femorali", "Bicipiti", "Tricipiti"]  # Giorni 2 e 4
 
+        # Per livello: (serie dirette minime per muscolo, moltiplicatore di volume per il muscolo target)
+        self.parametri_livello = {
+            "principiante": (4, 1.2),
+            "intermedio": (6, 1.3),
+        }
 
-    def get_weekly_sets(self, livello, muscolo, mesociclo):
-        """Calcola il volume settimanale target per un muscolo in un certo mesociclo."""
-        base_volumes = {
+        # Volumi settimanali (inizio, fine) per livello e muscolo
+        self.volumi_base = {
             "principiante": {"Petto": (10, 16), "Schiena": (12, 18), "Spalle": (12, 18), "Bicipiti": (8, 14),
                              "Tricipiti": (8, 14), "Quadricipiti": (10, 18), "Femorali": (6, 12), "Glutei": (8, 14),
                              "Polpacci": (6, 12)},
@@ -52,20 +122,25 @@ class Model:
                          "Tricipiti": (10, 18), "Quadricipiti": (12, 22), "Femorali": (8, 16), "Glutei": (10, 18),
                          "Polpacci": (8, 18)}
         }
-        start, end = base_volumes[livello][muscolo]
+
+    # --------------------------------
+
+
+    def get_weekly_sets(self, livello, muscolo, mesociclo):
+        """Calcola il volume settimanale target per un muscolo in un certo mesociclo."""
+        start, end = self.volumi_base[livello][muscolo]
         incremento = mesociclo - 1
         return min(start + incremento, end)
 
     def _calcola_coinvolgimento_indiretto(self, esercizi_scelti, muscoli_target):
         """Calcola il volume indiretto (come muscolo secondario)."""
-        volume_indiretto = {muscolo: 0 for muscolo in muscoli_target}
+        volume_indiretto = self._get_matrice_contributi().nuovo_volume()
         for esercizio, serie in esercizi_scelti.items():
-            if not esercizio.muscoli_secondari:
-                continue
-            for muscolo_target in muscoli_target:
-                if muscolo_target in esercizio.muscoli_secondari and muscolo_target != esercizio.muscolo_primario:
-                    volume_indiretto[muscolo_target] += serie * 0.5  # Metà del volume per lavoro indiretto
-        return volume_indiretto
+            volume_indiretto.aggiungi(esercizio, serie)
+        return {muscolo: volume_indiretto.get(muscolo) for muscolo in muscoli_target}
+
+    def _get_matrice_contributi(self) -> MatriceContributi:
+        return self.catalogo.get_matrice_contributi() if self.usa_catalogo else self._matrice_contributi
 
     def _calcola_distribuzione_rep_range(self, volume_effettivo):
         """Distribuisce le serie per rep range (50% pesante, 40% medio, 10% leggero)."""
@@ -89,93 +164,13 @@ class Model:
         return int(tot_pesante), int(tot_medio), int(tot_leggero)
 
 
-    def _distribuisci_serie_giorni_intermedio(self, volume_totale, giorni=3):
-        """
-        Distribuisce le serie totali nei 3 giorni per atleti intermedi.
-        Logica:
-        - Fino a 6 serie: distribuzione su 2 giorni, evitando serie singole
-        - Da 7 serie in su: distribuzione su 3 giorni, evitando serie singole quando possibile
-        """
-        if volume_totale <= 0:
-            return [0, 0, 0]
-
-        if volume_totale <= 6:
-            # Distribuzione su 2 giorni - evita serie singole
-            serie_per_giorno = [0, 0, 0]
-
-            if volume_totale == 2:
-                # 2 serie = 2-0-0
-                giorni_attivi = random.sample(range(3), 1)
-                serie_per_giorno[giorni_attivi[0]] = 2
-            elif volume_totale == 3:
-                # 3 serie = 3-0-0
-                giorni_attivi = random.sample(range(3), 1)
-                serie_per_giorno[giorni_attivi[0]] = 3
-            elif volume_totale == 4:
-                # 4 serie = 2-2-0
-                giorni_attivi = random.sample(range(3), 2)
-                serie_per_giorno[giorni_attivi[0]] = 2
-                serie_per_giorno[giorni_attivi[1]] = 2
-            elif volume_totale == 5:
-                # 5 serie = 3-2-0
-                giorni_attivi = random.sample(range(3), 2)
-                serie_per_giorno[giorni_attivi[0]] = 3
-                serie_per_giorno[giorni_attivi[1]] = 2
-            elif volume_totale == 6:
-                # 6 serie = 3-3-0
-                giorni_attivi = random.sample(range(3), 2)
-                serie_per_giorno[giorni_attivi[0]] = 3
-                serie_per_giorno[giorni_attivi[1]] = 3
-
-        else:
-            # Distribuzione su 3 giorni - evita serie singole quando possibile
-            serie_per_giorno = [0, 0, 0]
-
-            if volume_totale == 7:
-                # 7 serie = 3-2-2
-                serie_per_giorno = [3, 2, 2]
-            elif volume_totale == 8:
-                # 8 serie = 3-3-2
-                serie_per_giorno = [3, 3, 2]
-            elif volume_totale == 9:
-                # 9 serie = 3-3-3
-                serie_per_giorno = [3, 3, 3]
-            elif volume_totale == 10:
-                # 10 serie = 4-3-3
-                serie_per_giorno = [4, 3, 3]
-            elif volume_totale == 11:
-                # 11 serie = 4-4-3
-                serie_per_giorno = [4, 4, 3]
-            elif volume_totale == 12:
-                # 12 serie = 4-4-4
-                serie_per_giorno = [4, 4, 4]
-            else:
-                # Per volumi maggiori, distribuzione standard evitando serie singole
-                base = volume_totale // 3
-                extra = volume_totale % 3
-
-                serie_per_giorno = [base] * 3
-
-                # Distribuisci le serie extra
-                for i in range(extra):
-                    serie_per_giorno[i] += 1
-
-                # Se ci sono serie singole, ridistribuisci
-                if min(serie_per_giorno) == 1:
-                    # Sposta le serie singole verso gli altri giorni
-                    for i in range(3):
-                        if serie_per_giorno[i] == 1:
-                            serie_per_giorno[i] = 0
-                            # Aggiungi la serie al giorno con meno serie (esclusi quelli con 0)
-                            giorni_non_zero = [j for j in range(3) if serie_per_giorno[j] > 0]
-                            if giorni_non_zero:
-                                min_idx = min(giorni_non_zero, key=lambda x: serie_per_giorno[x])
-                                serie_per_giorno[min_idx] += 1
-
-            # Mescola per randomizzare la distribuzione
-            random.shuffle(serie_per_giorno)
-
-        return serie_per_giorno
+    def _distribuisci_serie_giorni_intermedio(self, volume_totale, giorni=3, rng=random):
+        """
+        Distribuisce le serie totali sui giorni per atleti intermedi, evitando le serie singole:
+        al massimo 3 serie per giorno finché ci sono giorni liberi (es. 5 serie = 3-2-0, 8 serie = 3-3-2),
+        poi ripartizione equilibrata su tutti i giorni. I giorni attivi sono scelti a caso.
+        """
+        return TabelleDistribuzione.distribuisci("intermedio", volume_totale, giorni, rng)
 
     def _ordina_muscoli_fullbody(self, muscoli_da_allenare, muscolo_target):
         """
@@ -198,8 +193,11 @@ class Model:
         return muscoli_ordinati
 
     @staticmethod
-    def parse_rep_range(rep_str: str) -> tuple[int, int]:
-        """Parse string like '[5,7]' into tuple of integers (5,7), serve per confrontare i due minimi e scegliere l'esercizio più adatto a range di rep pesante"""
+    def parse_rep_range(rep_str) -> tuple[int, int]:
+        """Parse string like '[5,7]' into tuple of integers (5,7), serve per confrontare i due minimi e scegliere l'esercizio più adatto a range di rep pesante.
+        Esercizio.range_ripetizioni è già normalizzato in una tupla (minimo, massimo), restituita senza ulteriori conversioni."""
+        if isinstance(rep_str, tuple):
+            return rep_str
         try:
             # Remove brackets and split
             clean_str = rep_str.strip('[]')
@@ -209,498 +207,374 @@ class Model:
             # Restituisce un valore alto per evitare di essere scelto come "heavy" in caso di errore
             return 99, 99
 
-    def _crea_fullbody_intermedio(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1):
-        MIN_DIRECT_SETS = 6
-        settimana_numero = settimana
+    @staticmethod
+    def _scegli_heavy_light(esercizi_disponibili):
+        """
+        Prende i primi due esercizi della lista ordinata per priorità e stabilisce quale è "pesante"
+        e quale "leggero": l'esercizio con il minimo più basso del range di ripetizioni è quello pesante,
+        a parità di minimo il primo è considerato pesante. Se c'è un solo esercizio, lo usa per entrambi.
+        """
+        primo_esercizio = esercizi_disponibili[0]
+        secondo_esercizio = esercizi_disponibili[1] if len(esercizi_disponibili) >= 2 else primo_esercizio
 
-        oggi = datetime.now()
-        days = [WorkoutDay(id_giorno=i + 1, settimana=settimana_numero, split_type="Full Body", data=oggi) for i in
-                range(giorni)]
+        # range_ripetizioni è già una tupla (minimo, massimo) normalizzata al caricamento
+        if primo_esercizio.range_ripetizioni[0] <= secondo_esercizio.range_ripetizioni[0]:
+            return primo_esercizio, secondo_esercizio
+        return secondo_esercizio, primo_esercizio
 
-        esercizi_map_globale = {}
-        esercizi_scelti = {}
+    def _ordina_muscoli_4giorni(self, muscolo_target):
+        """
+        Ordina i muscoli per la scheda a 4 giorni: prima il gruppo che contiene il muscolo target
+        (con il target in testa), poi l'altro gruppo.
+        """
+        def _ordina_gruppo(base_order):
+            if muscolo_target in base_order:
+                return [muscolo_target] + [m for m in base_order if m != muscolo_target]
+            return list(base_order)
+
+        ordine_1_3 = _ordina_gruppo(self.muscoli_giorni_1_3)
+        ordine_2_4 = _ordina_gruppo(self.muscoli_giorni_2_4)
+        if muscolo_target in self.muscoli_giorni_1_3:
+            return ordine_1_3 + ordine_2_4
+        return ordine_2_4 + ordine_1_3
+
+    def _get_esercizi_per_muscoli(self, context, muscoli):
+        """Esercizi candidati (i primi per priorità) di tutti i muscoli, dal catalogo o con un'unica query al DB."""
+        if self.usa_catalogo:
+            return self.catalogo.get_esercizi_per_muscoli(context, muscoli, self.ESERCIZI_PER_MUSCOLO)
+        return DAO.getEserciziPerMuscoli(context, muscoli, self.ESERCIZI_PER_MUSCOLO)
+
+    def _pianifica_muscoli(self, context, livello, muscolo_target, ordered_muscles, volume_overrides=None,
+                           settimana=1, override_diretto=False):
+        """
+        Parte deterministica della generazione: per ogni muscolo, nell'ordine dato, calcola il volume diretto,
+        sceglie l'esercizio pesante e quello leggero e ripartisce le serie per rep range.
+        Non dipende dal caso, quindi lo stesso piano può essere condiviso da più utenti con la stessa configurazione.
 
-        muscoli_da_allenare = self.split_muscoli["Full Body"]
-        # Usa la nuova funzione per ordinare i muscoli
-        ordered_muscles = self._ordina_muscoli_fullbody(muscoli_da_allenare, muscolo_target)
+        Args:
+            override_diretto: Se True l'override è il numero esatto di serie dirette (intermedi Full Body),
+                altrimenti è il volume totale target da cui si sottrae il lavoro indiretto.
 
-        # Dizionario per memorizzare gli esercizi da aggiungere per ogni giorno
-        # Struttura: {giorno_index: [(esercizio, serie, reps, ordine_muscolo)]}
-        esercizi_per_giorno = {i: [] for i in range(giorni)}
+        Returns:
+            Lista di tuple (ordine_muscolo, muscolo, e_heavy, e_light, tot_pesante, tot_medio, tot_leggero).
+        """
+        min_direct_sets, bonus_target = self.parametri_livello[livello]
+        esercizi_per_muscolo = self._get_esercizi_per_muscoli(context, ordered_muscles)
+        # Volume indiretto per muscolo, aggiornato a ogni esercizio scelto
+        volume_indiretto = self._get_matrice_contributi().nuovo_volume()
+        piano = []
 
         for ordine_muscolo, muscolo in enumerate(ordered_muscles):
-            print(f"Processing: {muscolo}")
+            logger.debug("Processing: %s", muscolo)
 
-            # Se esiste un override, quel valore diventa il numero esatto di serie dirette (volume_effettivo),
-            # saltando tutti gli altri calcoli di volume.
-            if volume_overrides and muscolo in volume_overrides:
+            if override_diretto and volume_overrides and muscolo in volume_overrides:
+                # Se esiste un override, quel valore diventa il numero esatto di serie dirette (volume_effettivo),
+                # saltando tutti gli altri calcoli di volume.
                 volume_effettivo = volume_overrides[muscolo]
-                print(f"  - Volume OVERRIDDEN to {volume_effettivo} DIRECT sets")
+                logger.debug("  - Volume OVERRIDDEN to %s DIRECT sets", volume_effettivo)
             else:
-                # Se non ci sono override, si usa la logica standard
-                volume_base = self.get_weekly_sets("intermedio", muscolo, settimana_numero)
-
-                if muscolo == muscolo_target:
-                    volume_totale_target = int(round(volume_base * 1.3))
-                    print(f"  - Target muscle detected! Base: {volume_base}, With 30% bonus: {volume_totale_target}")
+                if volume_overrides and muscolo in volume_overrides:
+                    volume_totale_target = volume_overrides[muscolo]
+                    if logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("  - Volume OVERRIDDEN to %s (original: %s)", volume_totale_target,
+                                     self.get_weekly_sets(livello, muscolo, settimana))
                 else:
-                    volume_totale_target = volume_base
+                    volume_base = self.get_weekly_sets(livello, muscolo, settimana)
+                    if muscolo == muscolo_target:
+                        volume_totale_target = int(round(volume_base * bonus_target))
+                        logger.debug("  - Target muscle detected! Base: %s, With %.0f%% bonus: %s", volume_base,
+                                     (bonus_target - 1) * 100, volume_totale_target)
+                    else:
+                        volume_totale_target = volume_base
 
-                print(f"  - Target volume: {volume_totale_target}")
+                logger.debug("  - Target volume: %s", volume_totale_target)
 
-                volume_indiretto_accumulato = self._calcola_coinvolgimento_indiretto(esercizi_scelti, [muscolo])[muscolo]
-                print(f"  - Indirect volume from other exercises: {volume_indiretto_accumulato:.1f}")
+                volume_indiretto_accumulato = volume_indiretto.get(muscolo)
+                logger.debug("  - Indirect volume from other exercises: %.1f", volume_indiretto_accumulato)
 
-                serie_effettive_attuali = volume_indiretto_accumulato
-                volume_mancante = volume_totale_target - serie_effettive_attuali
+                volume_mancante = volume_totale_target - volume_indiretto_accumulato
 
-                volume_diretto_da_aggiungere = max(MIN_DIRECT_SETS, volume_mancante)
+                # Vincolo: un numero minimo di serie dirette per ogni muscolo
+                volume_diretto_da_aggiungere = max(min_direct_sets, volume_mancante)
                 volume_effettivo = max(0, int(round(volume_diretto_da_aggiungere)))
+                logger.debug("  - Direct sets to add (min %s): %s", min_direct_sets, volume_effettivo)
 
             if volume_effettivo <= 0:
-                print(f"  - Skipping direct work for {muscolo}, target met.")
+                logger.debug("  - Skipping direct work for %s, target met.", muscolo)
                 continue
 
-            esercizi_disponibili = DAO.getEsercizi(context, muscolo)
+            esercizi_disponibili = esercizi_per_muscolo[muscolo]
             if not esercizi_disponibili:
-                print(f"  - No exercises found for {muscolo}.")
+                logger.warning("Nessun esercizio trovato per %s nel contesto '%s'.", muscolo, context)
                 continue
 
-            # Prendi i primi due esercizi dalla lista ordinata per priorità
-            if len(esercizi_disponibili) >= 2:
-                primo_esercizio = esercizi_disponibili[0]
-                secondo_esercizio = esercizi_disponibili[1]
-                print(f"  - Selected exercises: {primo_esercizio.nome} and {secondo_esercizio.nome}")
-            else:
-                # Se c'è solo un esercizio, usalo per entrambi
-                primo_esercizio = esercizi_disponibili[0]
-                secondo_esercizio = esercizi_disponibili[0]
-                print(f"  - Only one exercise available: {primo_esercizio.nome}")
-
-            # Determina quale è "pesante" e quale è "leggero" in base al range di ripetizioni
-            range_primo = Model.parse_rep_range(primo_esercizio.range_ripetizioni)
-            range_secondo = Model.parse_rep_range(secondo_esercizio.range_ripetizioni)
-
-            # L'esercizio con il minimo più basso del range è quello "pesante"
-            if range_primo[0] < range_secondo[0]:
-                e_heavy = primo_esercizio
-                e_light = secondo_esercizio
-            elif range_primo[0] > range_secondo[0]:
-                e_heavy = secondo_esercizio
-                e_light = primo_esercizio
-            else:
-                # Se hanno lo stesso minimo, il primo è considerato "pesante"
-                e_heavy = primo_esercizio
-                e_light = secondo_esercizio
-
-            print(f"  - Heavy exercise: {e_heavy.nome} (range: {e_heavy.range_ripetizioni})")
-            print(f"  - Light exercise: {e_light.nome} (range: {e_light.range_ripetizioni})")
-
-            esercizi_map_globale[e_heavy.id] = e_heavy
-            esercizi_map_globale[e_light.id] = e_light
+            e_heavy, e_light = self._scegli_heavy_light(esercizi_disponibili)
+            logger.debug("  - Heavy exercise: %s (range: %s)", e_heavy.nome, e_heavy.range_ripetizioni)
+            logger.debug("  - Light exercise: %s (range: %s)", e_light.nome, e_light.range_ripetizioni)
 
             # Distribuzione: 50% pesante (6-8), 40% medio (12-14), 10% leggero (20-22)
             tot_pesante, tot_medio, tot_leggero = self._calcola_distribuzione_rep_range(volume_effettivo)
-            print(
-                f"  - Sets distribution: Heavy(6-8): {tot_pesante}, Medium(12-14): {tot_medio}, Light(20-22): {tot_leggero}")
+            logger.debug("  - Sets distribution: Heavy(6-8): %s, Medium(12-14): %s, Light(20-22): %s",
+                         tot_pesante, tot_medio, tot_leggero)
+
+            # Aggiorna il volume indiretto con le serie degli esercizi scelti
+            volume_indiretto.aggiungi(e_heavy, tot_pesante)
+            volume_indiretto.aggiungi(e_light, tot_medio + tot_leggero)
+
+            piano.append((ordine_muscolo, muscolo, e_heavy, e_light, tot_pesante, tot_medio, tot_leggero))
+
+        return piano
+
+    def _pianifica_settimana(self, context, livello, muscolo_target, giorni, volume_overrides=None, settimana=1):
+        """Calcola il piano deterministico della settimana scegliendo ordine dei muscoli e semantica degli override."""
+        if livello == "intermedio" and giorni == 4:
+            ordered_muscles = self._ordina_muscoli_4giorni(muscolo_target)
+            override_diretto = False
+        else:
+            ordered_muscles = self._ordina_muscoli_fullbody(self.split_muscoli["Full Body"], muscolo_target)
+            override_diretto = livello == "intermedio"
+        return self._pianifica_muscoli(context, livello, muscolo_target, ordered_muscles, volume_overrides,
+                                       settimana, override_diretto)
+
+    def _assembla_settimana(self, piano, livello, giorni, muscolo_target, settimana=1, rng=random,
+                            data_inizio=None):
+        """
+        Parte casuale della generazione: distribuisce sui giorni le serie del piano e costruisce la TrainingWeek.
+        Ogni chiamata crea giorni nuovi, quindi lo stesso piano può essere assemblato per più utenti.
+        Tutte le scelte casuali usano `rng`: a parità di piano, stato di `rng` e data_inizio il risultato è identico.
+        """
+        if livello == "intermedio" and giorni == 4:
+            # la scheda a 4 giorni è deterministica: ogni muscolo ha giorni fissi
+            return self._assembla_4giorni(piano, muscolo_target, settimana, data_inizio)
+
+        oggi = data_inizio or datetime.now()
+
+        if livello == "intermedio":
+            distribuisci = self._distribuisci_serie_giorni_intermedio
+        else:
+            distribuisci = self._distribuisci_serie_giorni_principiante
 
-            # Aggiorna il conteggio degli esercizi scelti
-            esercizi_scelti[e_heavy] = esercizi_scelti.get(e_heavy, 0) + tot_pesante
-            esercizi_scelti[e_light] = esercizi_scelti.get(e_light, 0) + tot_medio + tot_leggero
+        # Dizionario per memorizzare gli esercizi da aggiungere per ogni giorno
+        # Struttura: {giorno_index: [(esercizio, serie, reps, ordine_muscolo)]}
+        esercizi_per_giorno = {i: [] for i in range(giorni)}
 
-            # Distribuisci le serie sui giorni usando la logica per intermedi
-            distribuzione_giorni_heavy = self._distribuisci_serie_giorni_intermedio(tot_pesante, giorni)
-            distribuzione_giorni_light = self._distribuisci_serie_giorni_intermedio(tot_medio + tot_leggero, giorni)
+        for ordine_muscolo, muscolo, e_heavy, e_light, tot_pesante, tot_medio, tot_leggero in piano:
+            # Distribuisci le serie sui giorni usando la logica del livello
+            distribuzione_giorni_heavy = distribuisci(tot_pesante, giorni, rng)
+            distribuzione_giorni_light = distribuisci(tot_medio + tot_leggero, giorni, rng)
 
-            print(f"  - Heavy distribution across days: {distribuzione_giorni_heavy}")
-            print(f"  - Light distribution across days: {distribuzione_giorni_light}")
+            logger.debug("  - %s heavy distribution across days: %s", muscolo, distribuzione_giorni_heavy)
+            logger.debug("  - %s light distribution across days: %s", muscolo, distribuzione_giorni_light)
 
             # Assegna gli esercizi ai giorni
             for i in range(giorni):
                 if distribuzione_giorni_heavy[i] > 0:
                     esercizi_per_giorno[i].append((e_heavy, distribuzione_giorni_heavy[i],
-                                                   ["6-8"] * distribuzione_giorni_heavy[i], ordine_muscolo))
+                                                   [ZonaRipetizioni.PESANTE] * distribuzione_giorni_heavy[i],
+                                                   ordine_muscolo))
                 if distribuzione_giorni_light[i] > 0:
-                    reps_light_disponibili = ["12-14"] * tot_medio + ["20-22"] * tot_leggero
-                    reps_da_assegnare = random.sample(reps_light_disponibili,
-                                                      min(len(reps_light_disponibili), distribuzione_giorni_light[i]))
+                    reps_light_disponibili = ([ZonaRipetizioni.MEDIA] * tot_medio
+                                              + [ZonaRipetizioni.LEGGERA] * tot_leggero)
+                    reps_da_assegnare = rng.sample(reps_light_disponibili,
+                                                   min(len(reps_light_disponibili), distribuzione_giorni_light[i]))
                     if reps_da_assegnare:
                         esercizi_per_giorno[i].append((e_light, distribuzione_giorni_light[i],
                                                        reps_da_assegnare, ordine_muscolo))
 
-        # Ora aggiungi gli esercizi ai giorni rispettando l'ordine
+        # Ora crea i giorni con gli esercizi nell'ordine della gerarchia dei muscoli
+        days = []
         for i in range(giorni):
-            # Ordina gli esercizi per questo giorno secondo la gerarchia dei muscoli
             esercizi_per_giorno[i].sort(key=lambda x: x[3])  # Ordina per ordine_muscolo
+            days.append(WorkoutDay.crea(id_giorno=i + 1, settimana=settimana, split_type="Full Body", data=oggi,
+                                        voci=esercizi_per_giorno[i]))
 
-            # Aggiungi gli esercizi al giorno nell'ordine corretto
-            for esercizio, serie, reps, ordine_muscolo in esercizi_per_giorno[i]:
-                days[i].aggiungi_esercizio(esercizio, serie, reps, ordine_muscolo)
+        return TrainingWeek(numero_settimana=settimana, start_date=oggi, workout_days=days)
 
-        return TrainingWeek(numero_settimana=settimana_numero, start_date=oggi, workout_days=days)
+    def _crea_fullbody_intermedio(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1,
+                                  rng=random, data_inizio=None):
+        """Crea una settimana di allenamento Full Body per atleti intermedi (3, 5 o 6 giorni)."""
+        piano = self._pianifica_settimana(context, "intermedio", muscolo_target, giorni, volume_overrides, settimana)
+        return self._assembla_settimana(piano, "intermedio", giorni, muscolo_target, settimana, rng, data_inizio)
 
     def _distribuisci_serie_due_giorni(self, volume_totale):
         """
         Distribuisce le serie totali su 2 giorni per atleti intermedi (4 giorni totali).
-        Ogni muscolo viene allenato esattamente 2 volte.
-        """
-        if volume_totale <= 0:
-            return [0, 0]
-
-        if volume_totale <= 2:
-            # 2 serie = 1-1
-            return [1, 1]
-        elif volume_totale <= 4:
-            # 3-4 serie = distribuzione più equilibrata possibile
-            base = volume_totale // 2
-            extra = volume_totale % 2
-            return [base + extra, base]
-        else:
-            # 5+ serie = distribuzione equilibrata
-            base = volume_totale // 2
-            extra = volume_totale % 2
-            return [base + extra, base]
+        Ogni muscolo viene allenato esattamente 2 volte, con il primo giorno più carico se il volume è dispari.
+        """
+        return TabelleDistribuzione.distribuisci("frequenza_fissa", volume_totale, 2)
 
-    def _crea_fullbody_intermedio_4giorni(self, context, muscolo_target, volume_overrides=None, settimana=1):
+    def _crea_fullbody_intermedio_4giorni(self, context, muscolo_target, volume_overrides=None, settimana=1,
+                                          data_inizio=None):
         """Crea una settimana di allenamento Full Body per atleti intermedi a 4 giorni."""
+        piano = self._pianifica_settimana(context, "intermedio", muscolo_target, 4, volume_overrides, settimana)
+        return self._assembla_4giorni(piano, muscolo_target, settimana, data_inizio)
 
-        MIN_DIRECT_SETS = 6
-        settimana_numero = settimana
-        oggi = datetime.now()
-
-        # Definisci i gruppi muscolari per ogni tipo di giorno
-        muscoli_giorni_1_3 = ["Spalle", "Petto", "Schiena", "Polpacci"]  # Giorni 1 e 3
-        muscoli_giorni_2_4 = ["Quadricipiti", "Glutei", "Femorali", "Bicipiti", "Tricipiti"]  # Giorni 2 e 4
-
-        # Crea i 4 giorni di allenamento
-        days = [WorkoutDay(id_giorno=i + 1, settimana=settimana_numero, split_type="Full Body 4 Days", data=oggi) for i
-                in range(4)]
-
-        esercizi_map_globale = {}
-        esercizi_scelti = {}
-
-        # Definisci le gerarchie per i due tipi di giorno
-        def _get_muscle_order_day_1_3(muscolo_target):
-            """Ordine per giorni 1 e 3: target first, poi petto pesante, schiena pesante, petto leggero, schiena leggero, spalle, polpacci"""
-            base_order = ["Petto", "Schiena", "Spalle", "Polpacci"]
-            if muscolo_target in base_order:
-                # Metti il target per primo
-                ordered = [muscolo_target]
-                for muscle in base_order:
-                    if muscle != muscolo_target:
-                        ordered.append(muscle)
-                return ordered
-            return base_order
-
-        def _get_muscle_order_day_2_4(muscolo_target):
-            """Ordine per giorni 2 e 4: target first, poi quadricipiti, glutei, femorali, bicipiti, tricipiti"""
-            base_order = ["Quadricipiti", "Glutei", "Femorali", "Bicipiti", "Tricipiti"]
-            if muscolo_target in base_order:
-                # Metti il target per primo
-                ordered = [muscolo_target]
-                for muscle in base_order:
-                    if muscle != muscolo_target:
-                        ordered.append(muscle)
-                return ordered
-            return base_order
-
-        # Determina in quale gruppo appartiene il muscolo target
-        if muscolo_target in muscoli_giorni_1_3:
-            muscoli_da_processare = muscoli_giorni_1_3
-            ordered_muscles = _get_muscle_order_day_1_3(muscolo_target)
-            giorni_target = [0, 2]  # Giorni 1 e 3 (indici 0 e 2)
-        else:
-            muscoli_da_processare = muscoli_giorni_2_4
-            ordered_muscles = _get_muscle_order_day_2_4(muscolo_target)
-            giorni_target = [1, 3]  # Giorni 2 e 4 (indici 1 e 3)
-
-        # Processa anche l'altro gruppo di muscoli
-        if muscolo_target in muscoli_giorni_1_3:
-            altri_muscoli = muscoli_giorni_2_4
-            ordered_altri_muscoli = _get_muscle_order_day_2_4(muscolo_target)
-            giorni_altri = [1, 3]  # Giorni 2 e 4
-        else:
-            altri_muscoli = muscoli_giorni_1_3
-            ordered_altri_muscoli = _get_muscle_order_day_1_3(muscolo_target)
-            giorni_altri = [0, 2]  # Giorni 1 e 3
+    def _assembla_4giorni(self, piano, muscolo_target, settimana=1, data_inizio=None):
+        """
+        Assembla la scheda a 4 giorni: i muscoli dei giorni 1 e 3 (petto, schiena, spalle, polpacci)
+        e quelli dei giorni 2 e 4 (gambe e braccia) vengono allenati esattamente due volte.
+        """
+        oggi = data_inizio or datetime.now()
 
         # Struttura per memorizzare esercizi: {giorno_index: [(esercizio, serie, reps, ordine_muscolo)]}
         esercizi_per_giorno = {i: [] for i in range(4)}
 
-        # Processa prima il gruppo del muscolo target
-        for ordine_muscolo, muscolo in enumerate(ordered_muscles):
-            self._processa_muscolo_4giorni(context, muscolo, muscolo_target, ordine_muscolo, giorni_target,
-                                           esercizi_per_giorno, esercizi_scelti, esercizi_map_globale,
-                                           MIN_DIRECT_SETS, settimana_numero, volume_overrides)
+        for ordine_muscolo, muscolo, e_heavy, e_light, tot_pesante, tot_medio, tot_leggero in piano:
+            giorni_target = [0, 2] if muscolo in self.muscoli_giorni_1_3 else [1, 3]
+
+            # Distribuisci le serie sui 2 giorni (ogni esercizio viene ripetuto 2 volte)
+            distribuzione_heavy = self._distribuisci_serie_due_giorni(tot_pesante)
+            distribuzione_light = self._distribuisci_serie_due_giorni(tot_medio + tot_leggero)
+
+            logger.debug("  - %s heavy distribution across 2 days: %s", muscolo, distribuzione_heavy)
+            logger.debug("  - %s light distribution across 2 days: %s", muscolo, distribuzione_light)
+
+            # Assegna gli esercizi ai giorni target
+            for i, giorno_idx in enumerate(giorni_target):
+                if distribuzione_heavy[i] > 0:
+                    esercizi_per_giorno[giorno_idx].append((e_heavy, distribuzione_heavy[i],
+                                                            [ZonaRipetizioni.PESANTE] * distribuzione_heavy[i],
+                                                            ordine_muscolo))
+                if distribuzione_light[i] > 0:
+                    reps_light_disponibili = ([ZonaRipetizioni.MEDIA] * tot_medio
+                                              + [ZonaRipetizioni.LEGGERA] * tot_leggero)
+                    # Distribuisci le ripetizioni tra i due giorni
+                    if i == 0:  # Primo giorno
+                        reps_da_assegnare = reps_light_disponibili[:distribuzione_light[i]]
+                    else:  # Secondo giorno
+                        reps_da_assegnare = reps_light_disponibili[distribuzione_light[0]:]
 
-        # Processa l'altro gruppo di muscoli
-        for ordine_muscolo, muscolo in enumerate(ordered_altri_muscoli):
-            self._processa_muscolo_4giorni(context, muscolo, muscolo_target, ordine_muscolo + len(ordered_muscles),
-                                           giorni_altri, esercizi_per_giorno, esercizi_scelti, esercizi_map_globale,
-                                           MIN_DIRECT_SETS, settimana_numero, volume_overrides)
+                    if reps_da_assegnare:
+                        esercizi_per_giorno[giorno_idx].append((e_light, distribuzione_light[i],
+                                                                reps_da_assegnare, ordine_muscolo))
 
-        # Aggiungi gli esercizi ai giorni rispettando l'ordine specifico
+        # Crea i 4 giorni con gli esercizi nell'ordine specifico
+        days = []
         for i in range(4):
             if i in [0, 2]:  # Giorni 1 e 3
-                self._aggiungi_esercizi_giorni_1_3(days[i], esercizi_per_giorno[i], muscolo_target)
+                voci = self._ordina_esercizi_giorno(esercizi_per_giorno[i], muscolo_target,
+                                                    self.SEQUENZA_GIORNI_1_3)
             else:  # Giorni 2 e 4
-                self._aggiungi_esercizi_giorni_2_4(days[i], esercizi_per_giorno[i], muscolo_target)
-
-        return TrainingWeek(numero_settimana=settimana_numero, start_date=oggi, workout_days=days)
-
-    def _processa_muscolo_4giorni(self, context, muscolo, muscolo_target, ordine_muscolo, giorni_target,
-                                  esercizi_per_giorno, esercizi_scelti, esercizi_map_globale,
-                                  MIN_DIRECT_SETS, settimana_numero, volume_overrides=None):
-        """Processa un singolo muscolo per l'allenamento a 4 giorni."""
-
-        print(f"Processing: {muscolo}")
+                voci = self._ordina_esercizi_giorno(esercizi_per_giorno[i], muscolo_target,
+                                                    self.SEQUENZA_GIORNI_2_4)
+            days.append(WorkoutDay.crea(id_giorno=i + 1, settimana=settimana, split_type="Full Body 4 Days",
+                                        data=oggi, voci=voci))
 
+        return TrainingWeek(numero_settimana=settimana, start_date=oggi, workout_days=days)
 
-        if volume_overrides and muscolo in volume_overrides:
-            volume_totale_target = volume_overrides[muscolo]
-            print(
-                f"  - Volume OVERRIDDEN to {volume_totale_target} (original: {self.get_weekly_sets('intermedio', muscolo, settimana_numero)})")
-        else:
-            # Calcolo normale del volume
-            volume_base = self.get_weekly_sets("intermedio", muscolo, settimana_numero)
-
-            # Se è il muscolo target, aggiungi 30% di volume
-            if muscolo == muscolo_target:
-                volume_totale_target = int(round(volume_base * 1.3))
-                print(f"  - Target muscle detected! Base: {volume_base}, With 30% bonus: {volume_totale_target}")
-            else:
-                volume_totale_target = volume_base
-        # *** FINE MODIFICA ***
-
-        print(f"  - Target volume: {volume_totale_target}")
-
-        volume_indiretto_accumulato = self._calcola_coinvolgimento_indiretto(esercizi_scelti, [muscolo])[muscolo]
-        print(f"  - Indirect volume from other exercises: {volume_indiretto_accumulato:.1f}")
-
-        # Calcola le serie effettive (dirette + indirette)
-        serie_effettive_attuali = volume_indiretto_accumulato
-        volume_mancante = volume_totale_target - serie_effettive_attuali
-
-        # Vincolo: almeno 6 serie dirette per ogni muscolo
-        volume_diretto_da_aggiungere = max(MIN_DIRECT_SETS, volume_mancante)
-        volume_effettivo = max(0, int(round(volume_diretto_da_aggiungere)))
-
-        print(f"  - Current effective sets: {serie_effettive_attuali:.1f}")
-        print(f"  - Missing volume: {volume_mancante:.1f}")
-        print(f"  - Direct sets to add (min {MIN_DIRECT_SETS}): {volume_effettivo}")
-
-        if volume_effettivo <= 0:
-            print(f"  - Skipping direct work for {muscolo}, target met.")
-            return
-
-        # Prendi i primi due esercizi dalla lista ordinata per priorità
-        esercizi_disponibili = DAO.getEsercizi(context, muscolo)
-        if not esercizi_disponibili:
-            print(f"  - No exercises found for {muscolo}.")
-            return
-
-        # Prendi i primi due esercizi
-        if len(esercizi_disponibili) >= 2:
-            primo_esercizio = esercizi_disponibili[0]
-            secondo_esercizio = esercizi_disponibili[1]
-        else:
-            primo_esercizio = esercizi_disponibili[0]
-            secondo_esercizio = esercizi_disponibili[0]
-
-        print(f"  - Selected exercises: {primo_esercizio.nome} and {secondo_esercizio.nome}")
-
-        # Determina quale è "pesante" e quale è "leggero"
-        range_primo = Model.parse_rep_range(primo_esercizio.range_ripetizioni)
-        range_secondo = Model.parse_rep_range(secondo_esercizio.range_ripetizioni)
-
-        if range_primo[0] < range_secondo[0]:
-            e_heavy = primo_esercizio
-            e_light = secondo_esercizio
-        elif range_primo[0] > range_secondo[0]:
-            e_heavy = secondo_esercizio
-            e_light = primo_esercizio
-        else:
-            e_heavy = primo_esercizio
-            e_light = secondo_esercizio
-
-        print(f"  - Heavy exercise: {e_heavy.nome} (range: {e_heavy.range_ripetizioni})")
-        print(f"  - Light exercise: {e_light.nome} (range: {e_light.range_ripetizioni})")
-
-        esercizi_map_globale[e_heavy.id] = e_heavy
-        esercizi_map_globale[e_light.id] = e_light
-
-        # Distribuzione: 50% pesante (6-8), 40% medio (12-14), 10% leggero (20-22)
-        tot_pesante, tot_medio, tot_leggero = self._calcola_distribuzione_rep_range(volume_effettivo)
-        print(
-            f"  - Sets distribution: Heavy(6-8): {tot_pesante}, Medium(12-14): {tot_medio}, Light(20-22): {tot_leggero}")
-
-        # Aggiorna il conteggio degli esercizi scelti
-        esercizi_scelti[e_heavy] = esercizi_scelti.get(e_heavy, 0) + tot_pesante
-        esercizi_scelti[e_light] = esercizi_scelti.get(e_light, 0) + tot_medio + tot_leggero
-
-        # Distribuisci le serie sui 2 giorni (ogni esercizio viene ripetuto 2 volte)
-        distribuzione_heavy = self._distribuisci_serie_due_giorni(tot_pesante)
-        distribuzione_light = self._distribuisci_serie_due_giorni(tot_medio + tot_leggero)
-
-        print(f"  - Heavy distribution across 2 days: {distribuzione_heavy}")
-        print(f"  - Light distribution across 2 days: {distribuzione_light}")
-
-        # Assegna gli esercizi ai giorni target
-        for i, giorno_idx in enumerate(giorni_target):
-            if distribuzione_heavy[i] > 0:
-                esercizi_per_giorno[giorno_idx].append((e_heavy, distribuzione_heavy[i],
-                                                        ["6-8"] * distribuzione_heavy[i], ordine_muscolo))
-            if distribuzione_light[i] > 0:
-                reps_light_disponibili = ["12-14"] * tot_medio + ["20-22"] * tot_leggero
-                # Distribuisci le ripetizioni tra i due giorni
-                if i == 0:  # Primo giorno
-                    reps_da_assegnare = reps_light_disponibili[:distribuzione_light[i]]
-                else:  # Secondo giorno
-                    reps_da_assegnare = reps_light_disponibili[distribuzione_light[0]:]
-
-                if reps_da_assegnare:
-                    esercizi_per_giorno[giorno_idx].append((e_light, distribuzione_light[i],
-                                                            reps_da_assegnare, ordine_muscolo))
-
-    def _aggiungi_esercizi_giorni_1_3(self, day, esercizi_giorno, muscolo_target):
-        """Aggiungi esercizi ai giorni 1 e 3 con ordine specifico: target first, poi petto pesante, schiena pesante, petto leggero, schiena leggero, spalle, polpacci"""
-
-        # Raggruppa esercizi per muscolo e tipo
-        esercizi_per_muscolo = {}
-        for esercizio, serie, reps, ordine_muscolo in esercizi_giorno:
-            muscolo = esercizio.muscolo_primario
-            if muscolo not in esercizi_per_muscolo:
-                esercizi_per_muscolo[muscolo] = {'heavy': [], 'light': []}
-
+    def _ordina_esercizi_giorno(self, esercizi_giorno, muscolo_target, sequenza):
+        """
+        Ordina le voci di un giorno della scheda a 4 giorni: prima il muscolo target (pesante e leggero),
+        poi i blocchi di `sequenza`, coppie (muscolo, tipo) con tipo "heavy", "light" o None per entrambi.
+        Le voci vengono divise per muscolo e tipo in un solo passaggio.
+        """
+        gruppi = {}
+        for voce in esercizi_giorno:
+            esercizio, _, reps, _ = voce
             # Determina se è pesante o leggero dal range di ripetizioni
-            if "6-8" in reps:
-                esercizi_per_muscolo[muscolo]['heavy'].append((esercizio, serie, reps, ordine_muscolo))
-            else:
-                esercizi_per_muscolo[muscolo]['light'].append((esercizio, serie, reps, ordine_muscolo))
+            tipo = 'heavy' if ZonaRipetizioni.PESANTE in reps else 'light'
+            gruppi.setdefault((esercizio.muscolo_primario, tipo), []).append(voce)
 
-        # Ordine specifico: target first, poi petto pesante, schiena pesante, petto leggero, schiena leggero, spalle, polpacci
         order = []
+        order += gruppi.get((muscolo_target, 'heavy'), ())
+        order += gruppi.get((muscolo_target, 'light'), ())
+        for muscolo, tipo in sequenza:
+            if muscolo == muscolo_target:
+                continue
+            for t in (tipo,) if tipo else ('heavy', 'light'):
+                order += gruppi.get((muscolo, t), ())
+        return order
+
+    def _valida_giorni(self, livello, giorni):
+        """Verifica che la frequenza settimanale sia supportata per il livello indicato."""
+        frequenze = self.FREQUENZE_SUPPORTATE[livello]
+        if giorni not in frequenze:
+            elenco = ", ".join(str(g) for g in frequenze[:-1]) + f" o {frequenze[-1]}"
+            plurale = {"principiante": "principianti", "intermedio": "intermedi"}[livello]
+            raise ValueError(f"Per {plurale} sono supportati solo {elenco} giorni di allenamento.")
+
+    def getSchedaFullBodyIntermedio(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1,
+                                    seed=None, data_inizio=None):
+        """
+        Metodo per generare schede per atleti intermedi: split dedicato a 4 giorni,
+        Full Body a 3, 5 o 6 giorni.
+
+        Args:
+            seed: Seme o random.Random da cui derivano tutte le scelte casuali: con lo stesso seme,
+                gli stessi argomenti e la stessa data_inizio la settimana generata è identica.
+                Con None si usa il generatore globale del modulo random.
+            data_inizio: Data di inizio della settimana (default: adesso).
+        """
+        self._valida_giorni("intermedio", giorni)
+        return self._genera_settimana(context, "intermedio", muscolo_target, giorni, volume_overrides, settimana, seed,
+                                      data_inizio)
 
-        # Prima il muscolo target (se presente)
-        if muscolo_target in esercizi_per_muscolo:
-            for ex in esercizi_per_muscolo[muscolo_target]['heavy']:
-                order.append(ex)
-            for ex in esercizi_per_muscolo[muscolo_target]['light']:
-                order.append(ex)
-
-        # Poi petto pesante
-        if "Petto" in esercizi_per_muscolo and muscolo_target != "Petto":
-            for ex in esercizi_per_muscolo["Petto"]['heavy']:
-                order.append(ex)
-
-        # Poi schiena pesante
-        if "Schiena" in esercizi_per_muscolo and muscolo_target != "Schiena":
-            for ex in esercizi_per_muscolo["Schiena"]['heavy']:
-                order.append(ex)
-
-        # Poi petto leggero
-        if "Petto" in esercizi_per_muscolo and muscolo_target != "Petto":
-            for ex in esercizi_per_muscolo["Petto"]['light']:
-                order.append(ex)
-
-        # Poi schiena leggero
-        if "Schiena" in esercizi_per_muscolo and muscolo_target != "Schiena":
-            for ex in esercizi_per_muscolo["Schiena"]['light']:
-                order.append(ex)
-
-        # Poi spalle
-        if "Spalle" in esercizi_per_muscolo and muscolo_target != "Spalle":
-            for ex in esercizi_per_muscolo["Spalle"]['heavy']:
-                order.append(ex)
-            for ex in esercizi_per_muscolo["Spalle"]['light']:
-                order.append(ex)
-
-        # Infine polpacci
-        if "Polpacci" in esercizi_per_muscolo and muscolo_target != "Polpacci":
-            for ex in esercizi_per_muscolo["Polpacci"]['heavy']:
-                order.append(ex)
-            for ex in esercizi_per_muscolo["Polpacci"]['light']:
-                order.append(ex)
-
-        # Aggiungi al giorno
-        for esercizio, serie, reps, ordine_muscolo in order:
-            day.aggiungi_esercizio(esercizio, serie, reps, ordine_muscolo)
-
-    def _aggiungi_esercizi_giorni_2_4(self, day, esercizi_giorno, muscolo_target):
-        """Aggiungi esercizi ai giorni 2 e 4 con ordine specifico: target first, poi quadricipiti pesante, poi tutto il resto, infine bicipiti e tricipiti"""
-
-        # Raggruppa esercizi per muscolo e tipo
-        esercizi_per_muscolo = {}
-        for esercizio, serie, reps, ordine_muscolo in esercizi_giorno:
-            muscolo = esercizio.muscolo_primario
-            if muscolo not in esercizi_per_muscolo:
-                esercizi_per_muscolo[muscolo] = {'heavy': [], 'light': []}
-
-            # Determina se è pesante o leggero dal range di ripetizioni
-            if "6-8" in reps:
-                esercizi_per_muscolo[muscolo]['heavy'].append((esercizio, serie, reps, ordine_muscolo))
-            else:
-                esercizi_per_muscolo[muscolo]['light'].append((esercizio, serie, reps, ordine_muscolo))
-
-        # Ordine specifico: target first, poi quadricipiti pesante, poi tutto il resto, infine bicipiti e tricipiti
-        order = []
+    def getSchedaFullBodyPrincipiante(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1,
+                                      seed=None, data_inizio=None):
+        """
+        Metodo per generare schede Full Body per principianti (2 o 3 giorni);
+        seed e data_inizio come in getSchedaFullBodyIntermedio.
+        """
+        self._valida_giorni("principiante", giorni)
+        return self._genera_settimana(context, "principiante", muscolo_target, giorni, volume_overrides, settimana,
+                                      seed, data_inizio)
 
-        # Prima il muscolo target (se presente)
-        if muscolo_target in esercizi_per_muscolo:
-            for ex in esercizi_per_muscolo[muscolo_target]['heavy']:
-                order.append(ex)
-            for ex in esercizi_per_muscolo[muscolo_target]['light']:
-                order.append(ex)
-
-        # Poi quadricipiti pesante
-        if "Quadricipiti" in esercizi_per_muscolo and muscolo_target != "Quadricipiti":
-            for ex in esercizi_per_muscolo["Quadricipiti"]['heavy']:
-                order.append(ex)
-
-        # Poi glutei e femorali
-        for muscolo in ["Glutei", "Femorali"]:
-            if muscolo in esercizi_per_muscolo and muscolo_target != muscolo:
-                for ex in esercizi_per_muscolo[muscolo]['heavy']:
-                    order.append(ex)
-                for ex in esercizi_per_muscolo[muscolo]['light']:
-                    order.append(ex)
-
-        # Poi quadricipiti leggero
-        if "Quadricipiti" in esercizi_per_muscolo and muscolo_target != "Quadricipiti":
-            for ex in esercizi_per_muscolo["Quadricipiti"]['light']:
-                order.append(ex)
-
-        # Infine bicipiti e tricipiti
-        for muscolo in ["Bicipiti", "Tricipiti"]:
-            if muscolo in esercizi_per_muscolo and muscolo_target != muscolo:
-                for ex in esercizi_per_muscolo[muscolo]['heavy']:
-                    order.append(ex)
-                for ex in esercizi_per_muscolo[muscolo]['light']:
-                    order.append(ex)
-
-        # Aggiungi al giorno
-        for esercizio, serie, reps, ordine_muscolo in order:
-            day.aggiungi_esercizio(esercizio, serie, reps, ordine_muscolo)
-
-
-    def getSchedaFullBodyIntermedio(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1):
-        """Metodo per generare schede Full Body per atleti intermedi (3 o 4 giorni)."""
-        if giorni == 3:
-            return self._crea_fullbody_intermedio(context, muscolo_target, giorni=3, volume_overrides=volume_overrides,
-                                                  settimana=settimana)
-        elif giorni == 4:
-            # Assicurati di modificare anche _crea_fullbody_intermedio_4giorni per accettare e usare 'settimana'
+    def _genera_settimana(self, context, livello, muscolo_target, giorni, volume_overrides, settimana, seed,
+                          data_inizio):
+        """
+        Genera la settimana passando dalla cache quando il risultato è riproducibile: con un seme
+        (non un random.Random, il cui stato cambia a ogni uso) oppure per la scheda a 4 giorni,
+        che non dipende dal caso e quindi condivide la stessa voce per qualunque seme.
+        """
+        deterministica = livello == "intermedio" and giorni == 4
+        riproducibile = deterministica or isinstance(seed, (int, str, bytes))
+        if self.cache_schede is None or not riproducibile:
+            return self._crea_settimana(context, livello, muscolo_target, giorni, volume_overrides, settimana,
+                                        crea_rng(seed), data_inizio)
+
+        chiave = CacheSchede.chiave(self.catalogo.get_generazione(), context, livello, giorni, muscolo_target,
+                                    volume_overrides, settimana, None if deterministica else seed)
+        return self.cache_schede.get_o_genera(
+            chiave, lambda: self._crea_settimana(context, livello, muscolo_target, giorni, volume_overrides,
+                                                 settimana, crea_rng(seed), None),
+            data_inizio or datetime.now())
+
+    def _crea_settimana(self, context, livello, muscolo_target, giorni, volume_overrides, settimana, rng,
+                        data_inizio):
+        if livello == "principiante":
+            return self._crea_fullbody_principiante(context, muscolo_target, giorni=giorni,
+                                                    volume_overrides=volume_overrides, settimana=settimana, rng=rng,
+                                                    data_inizio=data_inizio)
+        if giorni == 4:
             return self._crea_fullbody_intermedio_4giorni(context, muscolo_target, volume_overrides=volume_overrides,
-                                                          settimana=settimana)
-        else:
-            raise ValueError("Per intermedi sono supportati solo 3 o 4 giorni di allenamento.")
+                                                          settimana=settimana, data_inizio=data_inizio)
+        return self._crea_fullbody_intermedio(context, muscolo_target, giorni=giorni,
+                                              volume_overrides=volume_overrides, settimana=settimana, rng=rng,
+                                              data_inizio=data_inizio)
 
-    # Fai lo stesso per getSchedaFullBodyPrincipiante
-    def getSchedaFullBodyPrincipiante(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1):
-        if giorni not in [2, 3]:
-            raise ValueError("Per principianti sono supportati solo 2 o 3 giorni di allenamento.")
-        return self._crea_fullbody_principiante(context, muscolo_target, giorni=giorni,
-                                                volume_overrides=volume_overrides, settimana=settimana)
+    async def getSchedaFullBodyIntermedio_async(self, context, muscolo_target, giorni=3, volume_overrides=None,
+                                                settimana=1, seed=None, data_inizio=None):
+        """
+        Variante async di getSchedaFullBodyIntermedio per gli handler di Flet: le letture dal database
+        (le tabelle del catalogo da cui si servono tutti i muscoli) sono attese in parallelo senza bloccare
+        l'event loop; la generazione vera e propria avviene poi interamente in memoria.
+        """
+        if not self.usa_catalogo:
+            return await asyncio.to_thread(self.getSchedaFullBodyIntermedio, context, muscolo_target, giorni,
+                                           volume_overrides, settimana, seed, data_inizio)
+        await self.catalogo.assicura_caricato_async()
+        return self.getSchedaFullBodyIntermedio(context, muscolo_target, giorni, volume_overrides, settimana, seed,
+                                                data_inizio)
+
+    async def getSchedaFullBodyPrincipiante_async(self, context, muscolo_target, giorni=3, volume_overrides=None,
+                                                  settimana=1, seed=None, data_inizio=None):
+        """Variante async di getSchedaFullBodyPrincipiante (vedi getSchedaFullBodyIntermedio_async)."""
+        if not self.usa_catalogo:
+            return await asyncio.to_thread(self.getSchedaFullBodyPrincipiante, context, muscolo_target, giorni,
+                                           volume_overrides, settimana, seed, data_inizio)
+        await self.catalogo.assicura_caricato_async()
+        return self.getSchedaFullBodyPrincipiante(context, muscolo_target, giorni, volume_overrides, settimana, seed,
+                                                  data_inizio)
 
     def getSchedaFullBody(self, context, muscolo_target, giorni, volume_overrides=None):
         """Metodo unificato per generare schede Full Body (mantenuto per compatibilità)."""
@@ -708,137 +582,129 @@ class Model:
             raise ValueError("La frequenza per Full Body deve essere 2 o 3.")
         return self._crea_fullbody_giorni(context, muscolo_target, giorni, volume_overrides=volume_overrides)
 
-    def _distribuisci_serie_giorni_principiante(self, volume_totale, giorni=3):
+    def generate_batch(self, configs, seed=None):
         """
-        Distribuisce le serie per principianti. Tende a usare 2 giorni se il volume è basso
-        per non disperdere troppo lo stimolo, altrimenti distribuisce equamente.
+        Genera in una sola chiamata una TrainingWeek per ogni configurazione utente.
+        Le richieste vengono raggruppate per (context, livello, giorni, muscolo_target): all'interno di un gruppo
+        il piano deterministico (selezione esercizi dal catalogo, volumi, ripartizione per rep range) viene
+        calcolato una sola volta per ogni combinazione di settimana e override, e per ogni utente resta
+        solo la distribuzione casuale delle serie sui giorni.
+
+        Args:
+            configs: Lista di dizionari con le chiavi "context", "livello", "muscolo_target", "giorni"
+                e, facoltative, "volume_overrides", "settimana", "seed" e "data_inizio".
+            seed: Seme del batch: le configurazioni senza un proprio "seed" ricevono un seme derivato da questo
+                e dalla loro posizione, così ogni settimana non dipende dal raggruppamento delle richieste.
+
+        Returns:
+            list[TrainingWeek]: Le settimane generate, nello stesso ordine delle configurazioni.
         """
-        if volume_totale <= 0:
-            return [0] * giorni
-
-        # Se il volume è basso (<= 5 serie), meglio concentrarlo su 2 giorni
-        giorni_da_usare = 2 if volume_totale <= 5 and giorni >= 2 else giorni
-
-        # Se il volume è molto basso, usa un solo giorno
-        if volume_totale <= 2:
-            giorni_da_usare = 1
-
-        serie_per_giorno = [0] * giorni
-        giorni_attivi_idx = random.sample(range(giorni), giorni_da_usare)
-
-        base = volume_totale // giorni_da_usare
-        extra = volume_totale % giorni_da_usare
-
-        for i in range(giorni_da_usare):
-            idx = giorni_attivi_idx[i]
-            serie_per_giorno[idx] = base + (1 if i < extra else 0)
-
-        return serie_per_giorno
-
-# In creascheda.py, sostituisci la funzione _crea_fullbody_principiante con questa
-
-    def _crea_fullbody_principiante(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1):
-        """Crea una settimana di allenamento Full Body per atleti principianti."""
-        MIN_DIRECT_SETS = 4
-        settimana_numero = settimana  # <-- CORREZIONE IMPORTANTE
-        oggi = datetime.now()
-        days = [WorkoutDay(id_giorno=i + 1, settimana=settimana_numero, split_type="Full Body", data=oggi) for i in
-                range(giorni)]
-
-        esercizi_map_globale = {}
-        esercizi_scelti = {}
-        muscoli_da_allenare = self.split_muscoli["Full Body"]
-        ordered_muscles = self._ordina_muscoli_fullbody(muscoli_da_allenare, muscolo_target)
-        esercizi_per_giorno = {i: [] for i in range(giorni)}
-
-        for ordine_muscolo, muscolo in enumerate(ordered_muscles):
-            if volume_overrides and muscolo in volume_overrides:
-                volume_totale_target = volume_overrides[muscolo]
-            else:
-                volume_base = self.get_weekly_sets("principiante", muscolo, settimana_numero)
-                if muscolo == muscolo_target:
-                    volume_totale_target = int(round(volume_base * 1.2))  # Bonus 20% per principianti
-                else:
-                    volume_totale_target = volume_base
-
-            volume_indiretto_accumulato = self._calcola_coinvolgimento_indiretto(esercizi_scelti, [muscolo])[muscolo]
-            volume_mancante = volume_totale_target - volume_indiretto_accumulato
-            volume_diretto_da_aggiungere = max(MIN_DIRECT_SETS, volume_mancante)
-            volume_effettivo = max(0, int(round(volume_diretto_da_aggiungere)))
-
-            if volume_effettivo <= 0:
-                continue
-
-            esercizi_disponibili = DAO.getEsercizi(context, muscolo)
-            if not esercizi_disponibili:
+        semi = deriva_semi(seed, len(configs))
+        gruppi = defaultdict(list)
+        for indice, config in enumerate(configs):
+            chiave = (config["context"], config["livello"], int(config["giorni"]), config["muscolo_target"])
+            gruppi[chiave].append((indice, config))
+
+        risultati = [None] * len(configs)
+        for (context, livello, giorni, muscolo_target), richieste in gruppi.items():
+            self._valida_giorni(livello, giorni)
+            if livello == "intermedio" and giorni == 4 and self.cache_schede is not None:
+                # scheda a 4 giorni: non dipende dal caso, quindi passa dalla cache come nelle chiamate per utente
+                for indice, config in richieste:
+                    risultati[indice] = self._genera_settimana(context, livello, muscolo_target, giorni,
+                                                               config.get("volume_overrides"),
+                                                               config.get("settimana", 1), None,
+                                                               config.get("data_inizio"))
                 continue
+            piani = {}
+            for indice, config in richieste:
+                settimana = config.get("settimana", 1)
+                volume_overrides = config.get("volume_overrides")
+                chiave_piano = (settimana, tuple(sorted(volume_overrides.items())) if volume_overrides else None)
+                if chiave_piano not in piani:
+                    piani[chiave_piano] = self._pianifica_settimana(context, livello, muscolo_target, giorni,
+                                                                    volume_overrides, settimana)
+                rng = crea_rng(config.get("seed", semi[indice]))
+                risultati[indice] = self._assembla_settimana(piani[chiave_piano], livello, giorni, muscolo_target,
+                                                             settimana, rng, config.get("data_inizio"))
+        return risultati
 
-            primo_esercizio = esercizi_disponibili[0]
-            secondo_esercizio = esercizi_disponibili[1] if len(esercizi_disponibili) >= 2 else primo_esercizio
-
-            range_primo = Model.parse_rep_range(primo_esercizio.range_ripetizioni)
-            range_secondo = Model.parse_rep_range(secondo_esercizio.range_ripetizioni)
-
-            e_heavy, e_light = (primo_esercizio, secondo_esercizio) if range_primo[0] <= range_secondo[0] else (
-            secondo_esercizio, primo_esercizio)
-
-            esercizi_map_globale[e_heavy.id] = e_heavy
-            esercizi_map_globale[e_light.id] = e_light
-
-            tot_pesante, tot_medio, tot_leggero = self._calcola_distribuzione_rep_range(volume_effettivo)
-            esercizi_scelti[e_heavy] = esercizi_scelti.get(e_heavy, 0) + tot_pesante
-            esercizi_scelti[e_light] = esercizi_scelti.get(e_light, 0) + tot_medio + tot_leggero
-
-            distribuzione_giorni_heavy = self._distribuisci_serie_giorni_principiante(tot_pesante, giorni)
-            distribuzione_giorni_light = self._distribuisci_serie_giorni_principiante(tot_medio + tot_leggero, giorni)
+    @staticmethod
+    def calcola_volume_scarico(volume_precedente: dict) -> dict:
+        """Volume della settimana di scarico: metà delle serie della settimana precedente, minimo 2 per muscolo."""
+        return {muscolo: max(2, round(volume / 2)) for muscolo, volume in volume_precedente.items()}
 
-            for i in range(giorni):
-                if distribuzione_giorni_heavy[i] > 0:
-                    esercizi_per_giorno[i].append((e_heavy, distribuzione_giorni_heavy[i],
-                                                   ["6-8"] * distribuzione_giorni_heavy[i], ordine_muscolo))
-                if distribuzione_giorni_light[i] > 0:
-                    reps_light_disponibili = ["12-14"] * tot_medio + ["20-22"] * tot_leggero
-                    reps_da_assegnare = random.sample(reps_light_disponibili,
-                                                      min(len(reps_light_disponibili), distribuzione_giorni_light[i]))
-                    if reps_da_assegnare:
-                        esercizi_per_giorno[i].append(
-                            (e_light, distribuzione_giorni_light[i], reps_da_assegnare, ordine_muscolo))
+    def genera_mesociclo(self, context, livello, muscolo_target, giorni, settimane=3, seed=None, data_inizio=None):
+        """
+        Genera un intero mesociclo senza feedback dell'utente (uso batch/offline): le settimane di carico
+        seguono la progressione standard dei volumi e l'ultima settimana è lo scarico calcolato
+        sul volume pianificato dell'ultima settimana di carico.
 
-        for i in range(giorni):
-            esercizi_per_giorno[i].sort(key=lambda x: x[3])
-            for esercizio, serie, reps, ordine_muscolo in esercizi_per_giorno[i]:
-                days[i].aggiungi_esercizio(esercizio, serie, reps, ordine_muscolo)
+        Args:
+            seed: Seme o random.Random usato, in sequenza, per tutte le settimane del mesociclo.
+            data_inizio: Data di inizio della prima settimana (default: adesso); le successive seguono di 7 giorni.
 
-        return TrainingWeek(numero_settimana=settimana_numero, start_date=oggi, workout_days=days)
+        Returns:
+            list[TrainingWeek]: Le settimane 1..settimane seguite dalla settimana di scarico.
+        """
+        self._valida_giorni(livello, giorni)
+        rng = crea_rng(seed)
+        data_inizio = data_inizio or datetime.now()
+        mesociclo = []
+        for settimana in range(1, settimane + 1):
+            piano = self._pianifica_settimana(context, livello, muscolo_target, giorni, settimana=settimana)
+            mesociclo.append(self._assembla_settimana(piano, livello, giorni, muscolo_target, settimana, rng,
+                                                      data_inizio + timedelta(weeks=settimana - 1)))
+
+        volume_scarico = self.calcola_volume_scarico(mesociclo[-1].get_volume_per_muscolo())
+        piano = self._pianifica_settimana(context, livello, muscolo_target, giorni, volume_scarico, settimane + 1)
+        mesociclo.append(self._assembla_settimana(piano, livello, giorni, muscolo_target, settimane + 1, rng,
+                                                  data_inizio + timedelta(weeks=settimane)))
+        return mesociclo
+
+    def _distribuisci_serie_giorni_principiante(self, volume_totale, giorni=3, rng=random):
+        """
+        Distribuisce le serie per principianti. Tende a usare pochi giorni se il volume è basso
+        per non disperdere troppo lo stimolo (almeno 2 serie per giorno), altrimenti distribuisce equamente.
+        """
+        return TabelleDistribuzione.distribuisci("principiante", volume_totale, giorni, rng)
 
+    def _crea_fullbody_principiante(self, context, muscolo_target, giorni=3, volume_overrides=None, settimana=1,
+                                    rng=random, data_inizio=None):
+        """Crea una settimana di allenamento Full Body per atleti principianti."""
+        piano = self._pianifica_settimana(context, "principiante", muscolo_target, giorni, volume_overrides,
+                                          settimana)
+        return self._assembla_settimana(piano, "principiante", giorni, muscolo_target, settimana, rng,
+                                        data_inizio)
 
 
     def get_all_exercises_map(self):
         """
-        Recupera una mappa di tutti gli esercizi dal DB.
+        Recupera una mappa di tutti gli esercizi dal catalogo condiviso.
         Restituisce un dizionario {id: nome_esercizio}.
         """
         try:
-            # Assumo che esista un metodo DAO.getAllEsercizi()
-            # Se il metodo non esiste, dovrai crearlo nel tuo file DAO.
-            from database.DAO import DAO # Assicurati che l'import sia corretto
-            all_exercises = DAO.getAllEsercizi()
-            return {e.id: e.nome for e in all_exercises}
+            return {ex_id: e.nome for ex_id, e in self.catalogo.get_mappa_esercizi().items()}
         except Exception as e:
-            print(f"Errore nel recuperare la mappa degli esercizi: {e}")
+            logger.error("Errore nel recuperare la mappa degli esercizi: %s", e)
             return {}
 
+    async def get_all_exercises_details_map_async(self):
+        """Variante async di get_all_exercises_details_map: carica il catalogo senza bloccare l'event loop."""
+        try:
+            await self.catalogo.assicura_caricato_async()
+        except Exception as e:
+            logger.error("Errore nel caricamento asincrono del catalogo esercizi: %s", e)
+            return {}
+        return self.get_all_exercises_details_map()
+
     def get_all_exercises_details_map(self):
         """
-        Recupera una mappa di tutti gli esercizi dal DB con i loro oggetti completi.
+        Recupera una mappa di tutti gli esercizi dal catalogo condiviso con i loro oggetti completi.
         Restituisce un dizionario {id: Esercizio_object}.
         """
         try:
-            from database.DAO import DAO
-            all_exercises = DAO.getAllEsercizi()
-            return {e.id: e for e in all_exercises}
+            return self.catalogo.get_mappa_esercizi()
         except Exception as e:
-            print(f"Errore nel recuperare la mappa dettagliata degli esercizi: {e}")
+            logger.error("Errore nel recuperare la mappa dettagliata degli esercizi: %s", e)
             return {}
-
-
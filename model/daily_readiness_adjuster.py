@@ -1,15 +1,9 @@
-from collections import defaultdict # <-- AGGIUNGI QUESTO
 from dataclasses import dataclass, field
 from typing import Dict, List
 from model.workoutday import WorkoutDay # Assicurati che il percorso sia corretto
+from model.logging_config import get_logger
 
-def _get_rep_range_upper_bound(rep_range_str: str) -> int:
-    """Estrae il limite superiore da una stringa di range di ripetizioni (es. '8-12' -> 12)."""
-    try:
-        parts = rep_range_str.split('-')
-        return int(parts[1])
-    except (IndexError, ValueError):
-        return 0
+logger = get_logger("readiness")
 
 @dataclass
 class ReadinessInput:
@@ -46,6 +40,8 @@ class DailyReadinessAdjuster:
         if readiness.joint_pain > 2:
             readiness_score -= (readiness.joint_pain - 2)
 
+        logger.debug("Readiness giorno %s: score %.1f (%s)", workout_day.id_giorno, readiness_score, readiness)
+
         # Se i dolori articolari sono alti, è sempre un giorno rosso
         if readiness.joint_pain >= 4:
             return self._create_red_day_adjustment(
@@ -110,25 +106,17 @@ class DailyReadinessAdjuster:
             messages.append(
                 "Tempo limitato: Il volume sarà ridotto sugli esercizi a ripetizioni più alte per velocizzare la sessione.")
 
-            exercises_by_muscle = defaultdict(list)
-            for ex in workout_day.esercizi:
-                exercises_by_muscle[ex.muscolo_primario].append(ex)
-
-            for muscle, exercises in exercises_by_muscle.items():
+            for muscle, exercises in workout_day.esercizi_per_muscolo.items():
                 if not exercises: continue
 
                 highest_rep_exercise_id = None
                 max_rep_upper_bound = -1
 
                 for ex in exercises:
-                    log = workout_day.performance_log.get(ex.id)
-                    if not log or not log.get('reps'): continue
-
-                    current_max_rep = 0
-                    for rep_range_str in log['reps']:
-                        upper_bound = _get_rep_range_upper_bound(rep_range_str)
-                        if upper_bound > current_max_rep:
-                            current_max_rep = upper_bound
+                    prescrizione = workout_day.performance_log.get(ex.id)
+                    if not prescrizione or not prescrizione.zone: continue
+
+                    current_max_rep = prescrizione.ripetizioni_massime
 
                     if current_max_rep > max_rep_upper_bound:
                         max_rep_upper_bound = current_max_rep
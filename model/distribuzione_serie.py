@@ -0,0 +1,114 @@
+import random
+import threading
+from dataclasses import dataclass
+from itertools import permutations
+from typing import Callable
+
+# Frequenze settimanali gestite dal motore di distribuzione
+GIORNI_SUPPORTATI = range(2, 7)
+
+
+def _giorni_attivi_intermedio(volume: int, giorni: int) -> int:
+    """Intermedi: al massimo 3 serie per giorno finché ci sono giorni liberi (2-3 → 1, 4-6 → 2, 7-9 → 3, ...)."""
+    return min(giorni, -(-volume // 3))
+
+
+def _giorni_attivi_principiante(volume: int, giorni: int) -> int:
+    """
+    Principianti: almeno 2 serie per giorno, per non disperdere lo stimolo (fino a 5 serie → 1-2 giorni).
+    Fino a 4 giorni 3 serie restano su 2 giorni (2-1) come nella distribuzione originale a 2-3 giorni;
+    da 5 giorni vanno tutte su un solo giorno.
+    """
+    if volume == 3 and giorni <= 4:
+        return 2
+    return min(giorni, max(1, volume // 2))
+
+
+def _giorni_attivi_frequenza_fissa(volume: int, giorni: int) -> int:
+    """Split a frequenza fissa (intermedi a 4 giorni): il muscolo viene allenato in tutti i giorni indicati."""
+    return min(giorni, volume)
+
+
+@dataclass(frozen=True)
+class RegolaDistribuzione:
+    """
+    Regola di un livello: quanti giorni attivi usare per un certo volume e se la posizione dei giorni
+    attivi nella settimana è casuale (mescola) o fissa, con i giorni più carichi per primi.
+    """
+    giorni_attivi: Callable[[int, int], int]
+    mescola: bool = True
+
+
+REGOLE = {
+    "intermedio": RegolaDistribuzione(_giorni_attivi_intermedio),
+    "principiante": RegolaDistribuzione(_giorni_attivi_principiante),
+    "frequenza_fissa": RegolaDistribuzione(_giorni_attivi_frequenza_fissa, mescola=False),
+}
+
+
+def schema_equilibrato(volume: int, giorni_attivi: int) -> tuple[int, ...]:
+    """Ripartizione più equilibrata di `volume` serie su `giorni_attivi` giorni, in ordine decrescente."""
+    base, extra = divmod(volume, giorni_attivi)
+    return (base + 1,) * extra + (base,) * (giorni_attivi - extra)
+
+
+class TabelleDistribuzione:
+    """
+    Motore di distribuzione delle serie settimanali di un muscolo sui giorni di allenamento.
+
+    Per ogni (livello, giorni) le distribuzioni valide di ogni volume (schema equilibrato sui giorni attivi
+    della regola del livello, disposto in tutti i modi distinti sulla settimana) vengono calcolate una sola
+    volta in una tabella indicizzata per volume: la generazione si riduce a una lettura e a una scelta casuale.
+    I volumi oltre VOLUME_MASSIMO, rari, vengono aggiunti alla tabella al primo utilizzo.
+    """
+    VOLUME_MASSIMO = 40
+
+    # calcolate una volta per processo e lette da tutti i Model, anche dai thread delle generazioni asincrone
+    _tabelle: dict[tuple[str, int], dict[int, tuple[tuple[int, ...], ...]]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def tabella(cls, livello: str, giorni: int) -> dict[int, tuple[tuple[int, ...], ...]]:
+        """Tabella {volume: distribuzioni valide} del livello per la frequenza indicata."""
+        chiave = (livello, giorni)
+        tabella = cls._tabelle.get(chiave)
+        if tabella is None:
+            if livello not in REGOLE:
+                raise ValueError(f"Livello '{livello}' non supportato dalla distribuzione delle serie.")
+            if giorni not in GIORNI_SUPPORTATI:
+                raise ValueError(f"Sono supportati da {GIORNI_SUPPORTATI.start} a {GIORNI_SUPPORTATI.stop - 1} "
+                                 f"giorni di allenamento, non {giorni}.")
+            tabella = {volume: cls._calcola(REGOLE[livello], volume, giorni)
+                       for volume in range(cls.VOLUME_MASSIMO + 1)}
+            with cls._lock:
+                tabella = cls._tabelle.setdefault(chiave, tabella)
+        return tabella
+
+    @staticmethod
+    def _calcola(regola: RegolaDistribuzione, volume: int, giorni: int) -> tuple[tuple[int, ...], ...]:
+        if volume <= 0:
+            return ((0,) * giorni,)
+        schema = schema_equilibrato(volume, regola.giorni_attivi(volume, giorni))
+        schema += (0,) * (giorni - len(schema))
+        if not regola.mescola:
+            return (schema,)
+        # disposizioni distinte, in ordine stabile: ognuna ha la stessa probabilità di essere scelta
+        return tuple(sorted(set(permutations(schema)), reverse=True))
+
+    @classmethod
+    def distribuisci(cls, livello: str, volume: int, giorni: int, rng=random) -> list[int]:
+        """
+        Serie per ciascuno dei `giorni` giorni, scelte a caso tra le distribuzioni valide per il volume
+        con il generatore `rng` (il modulo random o un random.Random della richiesta).
+        """
+        tabella = cls.tabella(livello, giorni)
+        distribuzioni = tabella.get(volume)
+        if distribuzioni is None:
+            distribuzioni = cls._calcola(REGOLE[livello], volume, giorni)
+            if volume > 0:
+                with cls._lock:
+                    distribuzioni = tabella.setdefault(volume, distribuzioni)
+        # una sola distribuzione valida: nessuna estrazione, così la sequenza casuale non viene consumata
+        if len(distribuzioni) == 1:
+            return list(distribuzioni[0])
+        return list(rng.choice(distribuzioni))
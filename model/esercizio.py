@@ -1,60 +1,172 @@
 import json
-from dataclasses import dataclass
+import sys
+import threading
+import weakref
+from dataclasses import FrozenInstanceError
 from datetime import datetime
-from typing import Union
 
 
-@dataclass
+def _interna(valore):
+    """Interna stringhe (o liste di stringhe) ripetute in molti esercizi, es. muscoli, tipologia, attrezzatura."""
+    if isinstance(valore, str):
+        return sys.intern(valore)
+    if isinstance(valore, (list, tuple)):
+        return tuple(sys.intern(v) if isinstance(v, str) else v for v in valore)
+    return valore
+
+
+def _normalizza_lista(valore) -> tuple:
+    """Converte un campo lista (stringa JSON dal DB, lista o valore singolo) in una tupla di stringhe internate."""
+    if isinstance(valore, tuple):
+        return _interna(valore)
+    if isinstance(valore, str):
+        try:
+            valore = json.loads(valore)
+        except json.JSONDecodeError:
+            valore = [valore] if valore else []
+        if isinstance(valore, str):
+            valore = [valore] if valore else []
+    if not isinstance(valore, list):
+        valore = [str(valore)] if valore else []
+    return _interna(valore)
+
+
+def _normalizza_range(valore) -> tuple[int, int]:
+    """
+    Converte range_ripetizioni ('[8, 12]', '8-12', '10', [8, 12]) in una tupla (minimo, massimo) di interi;
+    un singolo numero n diventa (n, n + 2) e un valore non interpretabile il range di default (5, 10).
+    """
+    if isinstance(valore, str):
+        try:
+            valore = json.loads(valore)
+        except json.JSONDecodeError:
+            if '-' in valore:
+                parts = valore.split('-')
+                try:
+                    valore = [int(parts[0]), int(parts[1])]
+                except ValueError:
+                    valore = [5, 10]
+            else:
+                try:
+                    num_rep = int(valore)
+                    valore = [num_rep, num_rep + 2]
+                except ValueError:
+                    valore = [5, 10]
+    if isinstance(valore, int):
+        valore = [valore, valore + 2]
+    if not isinstance(valore, (list, tuple)) or len(valore) < 2:
+        return 5, 10
+    try:
+        minimo, massimo = int(valore[0]), int(valore[1])
+    except (TypeError, ValueError):
+        return 5, 10
+    return (minimo, massimo) if minimo <= massimo else (massimo, minimo)
+
+
 class Esercizio:
-    """DataClass per rappresentare un esercizio di allenamento."""
+    """
+    Record immutabile per rappresentare un esercizio di allenamento.
+
+    Gli esercizi sono flyweight: creati con da_riga() (come fanno i backend del DAO) sono registrati
+    per id, così lo stesso esercizio è lo stesso oggetto in ogni settimana, giorno e utente del processo,
+    anche dopo copy.deepcopy o pickle. Le stringhe ripetute sono internate e la `descrizione`,
+    non necessaria alla generazione, viene letta dal database solo al primo accesso.
+
+    I campi arrivano dal DB come stringhe JSON e vengono normalizzati una sola volta, alla creazione:
+    `attrezzatura`, `muscoli_secondari` e `articolazioni` diventano tuple di stringhe e
+    `range_ripetizioni` una tupla (minimo, massimo) di interi.
+    """
+    __slots__ = ("id", "nome", "attrezzatura", "livello", "muscolo_primario", "muscoli_secondari",
+                 "recupero_secondi", "affaticamento", "tipologia", "articolazioni", "_descrizione",
+                 "range_ripetizioni", "created_at", "updated_at", "__weakref__")
+
     id: int
     nome: str
-    attrezzatura: Union[list[str], str]
+    attrezzatura: tuple[str, ...]
     livello: int
     muscolo_primario: str
-    muscoli_secondari: Union[list[str], str]
+    muscoli_secondari: tuple[str, ...]
     recupero_secondi: int
     affaticamento: int
     tipologia: str
-    articolazioni: Union[list[str], str]
-    descrizione: str
-    range_ripetizioni: Union[list[int], str]
+    articolazioni: tuple[str, ...]
+    range_ripetizioni: tuple[int, int]
     created_at: datetime
     updated_at: datetime
 
-    def _post_init_(self):
-        """Conversione automatica dei campi stringa JSON in liste."""
-        for attr in ['attrezzatura', 'muscoli_secondari', 'articolazioni']:
-            val = getattr(self, attr)
-            if isinstance(val, str):
-                try:
-                    setattr(self, attr, json.loads(val))
-                except (json.JSONDecodeError, Exception):
-                    setattr(self, attr, [val] if val else [])
-            elif not isinstance(val, list):
-                setattr(self, attr, [str(val)] if val else [])
-
-        if isinstance(self.range_ripetizioni, str):
-            try:
-                self.range_ripetizioni = json.loads(self.range_ripetizioni)
-            except json.JSONDecodeError:
-                if '-' in self.range_ripetizioni:
-                    parts = self.range_ripetizioni.split('-')
-                    try:
-                        self.range_ripetizioni = [int(parts[0]), int(parts[1])]
-                    except ValueError:
-                        self.range_ripetizioni = [5, 10]
-                else:
-                    try:
-                        num_rep = int(self.range_ripetizioni)
-                        self.range_ripetizioni = [num_rep, num_rep + 2]
-                    except ValueError:
-                        self.range_ripetizioni = [5, 10]
-
-        if not isinstance(self.range_ripetizioni, list) or len(self.range_ripetizioni) < 2:
-            self.range_ripetizioni = [5, 10]
-        if self.range_ripetizioni[0] > self.range_ripetizioni[1]:
-            self.range_ripetizioni.reverse()
+    # Campi nell'ordine delle colonne della tabella exercises
+    CAMPI = ("id", "nome", "attrezzatura", "livello", "muscolo_primario", "muscoli_secondari", "recupero_secondi",
+             "affaticamento", "tipologia", "articolazioni", "descrizione", "range_ripetizioni", "created_at",
+             "updated_at")
+
+    # Registro flyweight {id: Esercizio}; i riferimenti deboli lasciano liberare gli esercizi non più usati
+    _registro = weakref.WeakValueDictionary()
+    _lock_registro = threading.Lock()
+
+    def __init__(self, id, nome, attrezzatura, livello, muscolo_primario, muscoli_secondari, recupero_secondi,
+                 affaticamento, tipologia, articolazioni, descrizione, range_ripetizioni, created_at, updated_at):
+        imposta = object.__setattr__
+        imposta(self, "id", id)
+        imposta(self, "nome", _interna(nome))
+        imposta(self, "attrezzatura", _normalizza_lista(attrezzatura))
+        imposta(self, "livello", livello)
+        imposta(self, "muscolo_primario", _interna(muscolo_primario))
+        imposta(self, "muscoli_secondari", _normalizza_lista(muscoli_secondari))
+        imposta(self, "recupero_secondi", recupero_secondi)
+        imposta(self, "affaticamento", affaticamento)
+        imposta(self, "tipologia", _interna(tipologia))
+        imposta(self, "articolazioni", _normalizza_lista(articolazioni))
+        imposta(self, "_descrizione", descrizione)  # None = non ancora caricata
+        imposta(self, "range_ripetizioni", _normalizza_range(range_ripetizioni))
+        imposta(self, "created_at", created_at)
+        imposta(self, "updated_at", updated_at)
+
+    @classmethod
+    def da_riga(cls, riga: dict) -> "Esercizio":
+        """
+        Restituisce l'esercizio di una riga della tabella exercises passando per il registro flyweight:
+        se l'id è già registrato con lo stesso updated_at si riusa l'istanza esistente, altrimenti
+        (esercizio nuovo o modificato) se ne crea una che sostituisce la precedente nel registro.
+        La colonna `descrizione` può mancare: verrà caricata al primo accesso.
+        """
+        esistente = cls._registro.get(riga["id"])
+        if esistente is not None and esistente.updated_at == riga.get("updated_at"):
+            return esistente
+        nuovo = cls(**{campo: riga.get(campo) for campo in cls.CAMPI})
+        with cls._lock_registro:
+            esistente = cls._registro.get(nuovo.id)
+            if esistente is not None and esistente.updated_at == nuovo.updated_at:
+                return esistente
+            cls._registro[nuovo.id] = nuovo
+        return nuovo
+
+    @property
+    def descrizione(self) -> str:
+        if self._descrizione is None:
+            # import locale: il DAO dipende a sua volta da questo modulo
+            from database.DAO import DAO
+            object.__setattr__(self, "_descrizione", DAO.getDescrizioneEsercizio(self.id) or "")
+        return self._descrizione
+
+    def come_riga(self) -> dict:
+        """Riga {colonna: valore} della tabella exercises; la descrizione è None se non ancora caricata."""
+        riga = {campo: getattr(self, campo) for campo in self.CAMPI if campo != "descrizione"}
+        riga["descrizione"] = self._descrizione
+        return riga
+
+    def __setattr__(self, nome, valore):
+        raise FrozenInstanceError(f"cannot assign to field '{nome}'")
+
+    def __delattr__(self, nome):
+        raise FrozenInstanceError(f"cannot delete field '{nome}'")
+
+    def __reduce__(self):
+        # pickle e deepcopy ricostruiscono l'esercizio passando dal registro (flyweight anche nei worker)
+        return Esercizio.da_riga, (self.come_riga(),)
+
+    def __repr__(self):
+        return (f"Esercizio(id={self.id!r}, nome={self.nome!r}, muscolo_primario={self.muscolo_primario!r}, "
+                f"tipologia={self.tipologia!r}, range_ripetizioni={self.range_ripetizioni!r})")
 
     def __hash__(self):
         return hash(self.id)  # Assuming each exercise has a unique id
@@ -0,0 +1,57 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from model.catalogo_esercizi import CatalogoEsercizi
+from model.creascheda import Model, deriva_semi
+
+# Model del processo worker, creato dall'initializer
+_model_worker = None
+
+
+def _inizializza_worker(snapshot_catalogo):
+    """
+    Initializer dei processi worker: installa una sola volta il catalogo ricevuto dal processo padre,
+    così i task non trasportano il catalogo e i worker non accedono mai al database.
+    """
+    global _model_worker
+    CatalogoEsercizi.get_istanza().carica_da_snapshot(snapshot_catalogo, ttl_secondi=float("inf"))
+    _model_worker = Model()
+
+
+def _genera_mesociclo_worker(config):
+    return _model_worker.genera_mesociclo(**config)
+
+
+def genera_mesocicli_paralleli(configs, max_workers=None, chunksize=None, seed=None):
+    """
+    Genera in parallelo, su più processi, un mesociclo completo (settimane di carico e scarico)
+    per ogni configurazione utente. Pensato per elaborazioni batch/offline.
+
+    Args:
+        configs: Lista di dizionari con le chiavi "context", "livello", "muscolo_target", "giorni"
+            e, facoltative, "settimane" (settimane di carico prima dello scarico, default 3),
+            "seed" e "data_inizio".
+        max_workers: Numero di processi (default: numero di core).
+        chunksize: Configurazioni inviate a ogni worker per task; di default le divide in circa
+            quattro blocchi per worker per limitare il costo di serializzazione.
+        seed: Seme del batch: le configurazioni senza un proprio "seed" ricevono un seme derivato da questo
+            e dalla loro posizione, così il risultato non dipende dal numero di worker né dal chunksize.
+
+    Returns:
+        list[list[TrainingWeek]]: I mesocicli generati, nello stesso ordine delle configurazioni.
+    """
+    if not configs:
+        return []
+
+    if seed is not None:
+        configs = [config if "seed" in config else {**config, "seed": seme}
+                   for config, seme in zip(configs, deriva_semi(seed, len(configs)))]
+
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunksize is None:
+        chunksize = max(1, len(configs) // (max_workers * 4))
+
+    snapshot_catalogo = CatalogoEsercizi.get_istanza().snapshot()
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_inizializza_worker,
+                             initargs=(snapshot_catalogo,)) as executor:
+        return list(executor.map(_genera_mesociclo_worker, configs, chunksize=chunksize))
@@ -0,0 +1,63 @@
+import logging
+import os
+
+# Logger radice dell'applicazione e nomi dei sottosistemi configurabili singolarmente
+LOGGER_RADICE = "chatbotai"
+SOTTOSISTEMI = ("generazione", "adattamento", "readiness", "controller", "database")
+
+# Variabile d'ambiente con i livelli per sottosistema, es. "generazione=DEBUG,controller=INFO"
+VARIABILE_AMBIENTE = "CHATBOTAI_LOG"
+
+_FORMATO = "%(asctime)s %(levelname)s [%(name)s] %(message)s"
+
+
+def get_logger(sottosistema: str) -> logging.Logger:
+    """Restituisce il logger di un sottosistema (es. get_logger("generazione") -> 'chatbotai.generazione')."""
+    if sottosistema not in SOTTOSISTEMI:
+        raise ValueError(f"Sottosistema di logging sconosciuto: {sottosistema}")
+    return logging.getLogger(f"{LOGGER_RADICE}.{sottosistema}")
+
+
+def _livelli_da_ambiente() -> dict:
+    livelli = {}
+    valore = os.getenv(VARIABILE_AMBIENTE, "")
+    for voce in valore.split(","):
+        if "=" not in voce:
+            continue
+        sottosistema, livello = (parte.strip() for parte in voce.split("=", 1))
+        livelli[sottosistema] = livello.upper()
+    return livelli
+
+
+def configura_logging(livello_default=logging.WARNING, livelli: dict = None, handler: logging.Handler = None):
+    """
+    Configura il logger dell'applicazione e i livelli dei singoli sottosistemi.
+    Con il livello DEBUG disattivato i messaggi di debug non vengono mai formattati:
+    i logger ricevono il formato e gli argomenti separatamente (formattazione lazy).
+
+    Args:
+        livello_default: Livello del logger radice 'chatbotai' (default WARNING).
+        livelli: Mappa {sottosistema: livello} che ha la precedenza sulla variabile d'ambiente CHATBOTAI_LOG.
+            Sottosistemi sconosciuti e livelli non validi vengono ignorati con un avviso.
+        handler: Handler da usare (default: StreamHandler su stderr).
+    """
+    radice = logging.getLogger(LOGGER_RADICE)
+    radice.setLevel(livello_default)
+    if handler is None and not radice.handlers:
+        handler = logging.StreamHandler()
+    if handler is not None:
+        handler.setFormatter(logging.Formatter(_FORMATO))
+        radice.handlers = [handler]
+
+    livelli_sottosistemi = _livelli_da_ambiente()
+    livelli_sottosistemi.update(livelli or {})
+    for sottosistema, livello in livelli_sottosistemi.items():
+        # una voce errata (es. un refuso in CHATBOTAI_LOG) non deve impedire l'avvio: viene ignorata
+        if sottosistema not in SOTTOSISTEMI:
+            radice.warning("Sottosistema di logging sconosciuto ignorato: %r (validi: %s)",
+                           sottosistema, ", ".join(SOTTOSISTEMI))
+            continue
+        try:
+            get_logger(sottosistema).setLevel(livello)
+        except (ValueError, TypeError):
+            radice.warning("Livello di logging non valido ignorato per %s: %r", sottosistema, livello)
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+from enum import Enum
+
+from model.esercizio import Esercizio
+
+
+class ZonaRipetizioni(Enum):
+    """Zone di ripetizioni usate dalla generazione, con i limiti come interi (str() dà la forma "6-8")."""
+    PESANTE = (6, 8)
+    MEDIA = (12, 14)
+    LEGGERA = (20, 22)
+
+    def __init__(self, minimo: int, massimo: int):
+        self.minimo = minimo
+        self.massimo = massimo
+
+    @classmethod
+    def da_testo(cls, testo: str) -> "ZonaRipetizioni":
+        """Zona corrispondente a un rep range testuale come "12-14"."""
+        minimo, _, massimo = testo.partition("-")
+        return cls((int(minimo), int(massimo)))
+
+    def __str__(self):
+        return f"{self.minimo}-{self.massimo}"
+
+
+@dataclass(frozen=True, slots=True)
+class Prescrizione:
+    """
+    Voce del performance_log di un giorno: quante serie svolgere di un esercizio e in quale zona di
+    ripetizioni cade ciascuna. Nome e muscolo primario si leggono dall'esercizio (flyweight condiviso),
+    quindi la voce occupa solo tre riferimenti.
+    """
+    esercizio: Esercizio
+    serie: int
+    zone: tuple[ZonaRipetizioni, ...]
+
+    @classmethod
+    def crea(cls, esercizio: Esercizio, serie: int, zone) -> "Prescrizione":
+        """
+        Crea la prescrizione: `zone` può essere una sola zona (ripetuta per tutte le serie) o una sequenza,
+        estesa con l'ultima zona se più corta del numero di serie; al posto delle zone sono accettati
+        anche i rep range testuali ("6-8").
+        """
+        if isinstance(zone, (ZonaRipetizioni, str)):
+            zone = [zone] * serie
+        zone = tuple(zone)
+        if zone and type(zone[0]) is str:
+            zone = tuple(map(ZonaRipetizioni.da_testo, zone))
+        if len(zone) < serie:
+            zone += (zone[-1],) * (serie - len(zone))
+        return cls(esercizio, serie, zone)
+
+    @property
+    def nome(self) -> str:
+        return self.esercizio.nome
+
+    @property
+    def muscolo_primario(self) -> str:
+        return self.esercizio.muscolo_primario
+
+    @property
+    def ripetizioni_massime(self) -> int:
+        """Limite superiore più alto tra le zone delle serie (0 senza serie)."""
+        return max((zona.massimo for zona in self.zone), default=0)
+
+    def con_serie(self, serie: int) -> "Prescrizione":
+        """La stessa prescrizione ridotta a `serie` serie (le zone delle serie tagliate vengono rimosse)."""
+        return Prescrizione(self.esercizio, serie, self.zone[:serie])
@@ -0,0 +1,166 @@
+from array import array
+from typing import TYPE_CHECKING, Dict, Tuple
+
+# NumPy è facoltativo: senza, le colonne restano array.array e le aggregazioni girano in Python puro
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from model.adattaScheda import PerformanceData
+
+# Colonne del registro e relativo typecode di array.array (e dtype NumPy equivalente)
+COLONNE = {
+    "esercizio_id": "i",
+    "settimana": "h",
+    "giorno": "h",
+    "carico": "d",
+    "ripetizioni": "d",  # float come il carico: l'1RM resta identico anche con ripetizioni non intere
+    "zona": "h",  # codice del rep range target, vedi RegistroSerie.rep_range
+    "mmc": "b",
+    "pump": "b",
+    "dolori_articolari": "b",
+}
+
+
+def _epley(carico: float, ripetizioni: int) -> float:
+    if ripetizioni <= 0 or carico <= 0:
+        return 0.0
+    return carico * (1 + ripetizioni / 30)
+
+
+class RegistroSerie:
+    """
+    Registro colonnare delle serie eseguite: una riga per serie, con esercizio, settimana, giorno, carico,
+    ripetizioni, rep range (codificato come intero) e i feedback della sessione (MMC, pump, dolori).
+
+    Le righe si accodano in array.array compatti; con NumPy disponibile le colonne diventano array
+    (copiati una volta e tenuti fino alla riga successiva) e 1RM di Epley, medie per gruppo e
+    variazioni tra settimane sono calcolate in forma vettoriale, con gli stessi risultati del calcolo in Python.
+    """
+
+    def __init__(self):
+        self._colonne = {nome: array(typecode) for nome, typecode in COLONNE.items()}
+        self._codici_zona: Dict[str, int] = {}
+        self.rep_range: list[str] = []  # rep range per codice zona
+        self._viste = None
+        self._one_rm = None
+
+    def __len__(self):
+        return len(self._colonne["carico"])
+
+    def _codice_zona(self, rep_range: str) -> int:
+        codice = self._codici_zona.get(rep_range)
+        if codice is None:
+            codice = self._codici_zona[rep_range] = len(self.rep_range)
+            self.rep_range.append(rep_range)
+        return codice
+
+    def aggiungi(self, settimana: int, performance: "PerformanceData"):
+        """Accoda una riga per ogni serie della sessione, registrata nella settimana indicata."""
+        c = self._colonne
+        for carico, ripetizioni, rep_range in performance.sets:
+            c["esercizio_id"].append(performance.esercizio_id)
+            c["settimana"].append(settimana)
+            c["giorno"].append(performance.giorno)
+            c["carico"].append(carico)
+            c["ripetizioni"].append(ripetizioni)
+            c["zona"].append(self._codice_zona(rep_range))
+            c["mmc"].append(performance.mmc)
+            c["pump"].append(performance.pump)
+            c["dolori_articolari"].append(performance.dolori_articolari)
+        if performance.sets:
+            self._viste = self._one_rm = None
+
+    def colonne(self) -> dict:
+        """Le colonne del registro: array NumPy se disponibile, altrimenti gli array.array interni (da non modificare)."""
+        if np is None:
+            return self._colonne
+        if self._viste is None:
+            self._viste = {nome: np.array(colonna, dtype=colonna.typecode) for nome, colonna in self._colonne.items()}
+        return self._viste
+
+    def stime_1rm(self):
+        """1RM di Epley di ogni serie (0 per carichi o ripetizioni non positivi)."""
+        if self._one_rm is None:
+            if np is None:
+                self._one_rm = array("d", map(_epley, self._colonne["carico"], self._colonne["ripetizioni"]))
+            else:
+                c = self.colonne()
+                carico, ripetizioni = c["carico"], c["ripetizioni"]
+                self._one_rm = np.where((carico > 0) & (ripetizioni > 0), carico * (1 + ripetizioni / 30), 0.0)
+        return self._one_rm
+
+    def medie_1rm(self, settimana: int) -> Dict[Tuple[int, str], float]:
+        """
+        1RM medio della settimana per (esercizio_id, rep_range), considerando solo le serie con 1RM positivo.
+        I gruppi sono nell'ordine della loro prima serie.
+        """
+        one_rm = self.stime_1rm()
+        c = self.colonne()
+        if np is None:
+            gruppi = {}
+            for esercizio_id, sett, zona, rm in zip(c["esercizio_id"], c["settimana"], c["zona"], one_rm):
+                if sett == settimana and rm > 0:
+                    somma_conteggio = gruppi.setdefault((esercizio_id, zona), [0.0, 0])
+                    somma_conteggio[0] += rm
+                    somma_conteggio[1] += 1
+            return {(esercizio_id, self.rep_range[zona]): somma / conteggio
+                    for (esercizio_id, zona), (somma, conteggio) in gruppi.items()}
+
+        chiavi, medie = self._medie_1rm_vettoriali(settimana)
+        n_zone = len(self.rep_range)
+        return {(chiave // n_zone, self.rep_range[chiave % n_zone]): media
+                for chiave, media in zip(chiavi.tolist(), medie.tolist())}
+
+    def _medie_1rm_vettoriali(self, settimana: int):
+        """
+        Versione NumPy di medie_1rm: chiavi dei gruppi (esercizio_id * numero di zone + codice zona)
+        e relative medie, nell'ordine della prima serie di ogni gruppo.
+        """
+        one_rm = self.stime_1rm()
+        c = self.colonne()
+        righe = np.flatnonzero((c["settimana"] == settimana) & (one_rm > 0))
+        chiavi = c["esercizio_id"][righe].astype(np.int64) * len(self.rep_range) + c["zona"][righe]
+        uniche, prima_riga, gruppo = np.unique(chiavi, return_index=True, return_inverse=True)
+        # bincount somma nell'ordine delle righe: stesse somme (bit per bit) dell'accumulo in Python
+        medie = np.bincount(gruppo, weights=one_rm[righe], minlength=len(uniche)) / np.bincount(
+            gruppo, minlength=len(uniche))
+        ordine = np.argsort(prima_riga, kind="stable")
+        return uniche[ordine], medie[ordine]
+
+    def miglioramento_percentuale(self, da: int, a: int) -> Dict[int, float]:
+        """
+        Variazione percentuale dell'1RM medio dalla settimana `da` alla settimana `a` per ogni esercizio:
+        media delle variazioni dei rep range eseguiti in entrambe le settimane.
+        """
+        if np is not None:
+            return self._miglioramento_vettoriale(da, a)
+
+        medie_da = self.medie_1rm(da)
+        medie_a = self.medie_1rm(a)
+        variazioni = {}
+        for (esercizio_id, rep_range), media_da in medie_da.items():
+            media_a = medie_a.get((esercizio_id, rep_range))
+            if media_a is not None and media_da > 0:
+                variazioni.setdefault(esercizio_id, []).append(((media_a - media_da) / media_da) * 100)
+        return {esercizio_id: sum(valori) / len(valori) for esercizio_id, valori in variazioni.items()}
+
+    def _miglioramento_vettoriale(self, da: int, a: int) -> Dict[int, float]:
+        chiavi_da, medie_da = self._medie_1rm_vettoriali(da)
+        chiavi_a, medie_a = self._medie_1rm_vettoriali(a)
+        if not len(chiavi_da) or not len(chiavi_a):
+            return {}
+        # per ogni gruppo di `da` cerca lo stesso gruppo in `a` (chiavi ordinate per la ricerca binaria)
+        ordine_a = np.argsort(chiavi_a)
+        chiavi_a, medie_a = chiavi_a[ordine_a], medie_a[ordine_a]
+        posizioni = np.minimum(np.searchsorted(chiavi_a, chiavi_da), len(chiavi_a) - 1)
+        comuni = (chiavi_a[posizioni] == chiavi_da) & (medie_da > 0)
+        variazioni = ((medie_a[posizioni[comuni]] - medie_da[comuni]) / medie_da[comuni]) * 100
+        esercizi = chiavi_da[comuni] // len(self.rep_range)
+        # media per esercizio, sommando le variazioni nell'ordine dei gruppi come nel calcolo in Python
+        ids, primo, gruppo = np.unique(esercizi, return_index=True, return_inverse=True)
+        medie = np.bincount(gruppo, weights=variazioni, minlength=len(ids)) / np.bincount(gruppo, minlength=len(ids))
+        ordine = np.argsort(primo, kind="stable")
+        return dict(zip(ids[ordine].tolist(), medie[ordine].tolist()))
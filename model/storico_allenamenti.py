@@ -0,0 +1,140 @@
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from model.archivio_performance import ArchivioPerformance, StatisticheEsercizio
+
+if TYPE_CHECKING:
+    from model.adattaScheda import DOMSData, PerformanceData
+
+
+class StoricoAllenamenti:
+    """
+    Storico longitudinale dei mesocicli: ogni mesociclo è un ArchivioPerformance accodato a `mesocicli`
+    e non viene mai scartato; si registra solo nel mesociclo corrente (l'ultimo).
+
+    Oltre alla numerazione del mesociclo, le settimane hanno un numero assoluto (la settimana 1 del primo
+    mesociclo è la 1, ogni mesociclo prosegue dall'ultima settimana registrata nel precedente), così le
+    analisi possono usare finestre di settimane che attraversano più mesocicli. Per ogni esercizio il
+    miglior 1RM di ogni settimana assoluta è tenuto in liste ordinate: la finestra delle ultime N settimane
+    si legge con una ricerca binaria, in tempo proporzionale alla finestra e non allo storico.
+    """
+
+    def __init__(self):
+        self.mesocicli: List[ArchivioPerformance] = []
+        self._inizi: List[int] = []  # settimana assoluta della settimana 1 di ogni mesociclo
+        self._settimane_1rm: Dict[int, List[int]] = {}  # esercizio_id -> settimane assolute (ordinate)
+        self._migliori_1rm: Dict[int, List[float]] = {}  # esercizio_id -> miglior 1RM di ciascuna settimana
+
+    @property
+    def corrente(self) -> Optional[ArchivioPerformance]:
+        return self.mesocicli[-1] if self.mesocicli else None
+
+    def apri_mesociclo(self, archivio: ArchivioPerformance = None) -> ArchivioPerformance:
+        """
+        Accoda un nuovo mesociclo, che diventa il corrente, e lo restituisce; il precedente resta nello storico.
+        Un mesociclo corrente in cui non è stato registrato nulla viene sostituito invece che conservato.
+        """
+        archivio = archivio if archivio is not None else ArchivioPerformance()
+        if self.mesocicli and not self.mesocicli[-1].per_settimana:
+            self.mesocicli.pop()
+            self._inizi.pop()
+        inizio = self._inizi[-1] + max(1, self.mesocicli[-1].durata) if self.mesocicli else 1
+        self.mesocicli.append(archivio)
+        self._inizi.append(inizio)
+        # sessioni già presenti nell'archivio ricevuto
+        for settimana, performances in archivio.per_settimana.items():
+            for performance in performances:
+                self._indicizza_1rm(inizio + settimana - 1, performance)
+        return archivio
+
+    def aggiungi_performance(self, settimana: int, performance: "PerformanceData"):
+        """Registra la sessione nella `settimana` (numerata nel mesociclo) del mesociclo corrente."""
+        if not self.mesocicli:
+            self.apri_mesociclo()
+        self.corrente.aggiungi_performance(settimana, performance)
+        self._indicizza_1rm(self._inizi[-1] + settimana - 1, performance)
+
+    def aggiungi_doms(self, settimana: int, doms: "DOMSData"):
+        if not self.mesocicli:
+            self.apri_mesociclo()
+        self.corrente.aggiungi_doms(settimana, doms)
+
+    def _indicizza_1rm(self, settimana_assoluta: int, performance: "PerformanceData"):
+        settimane = self._settimane_1rm.setdefault(performance.esercizio_id, [])
+        migliori = self._migliori_1rm.setdefault(performance.esercizio_id, [])
+        if not settimane or settimane[-1] < settimana_assoluta:
+            settimane.append(settimana_assoluta)
+            migliori.append(performance.one_rm)
+            return
+        # settimana già presente o precedente all'ultima (registrazione fuori ordine nel mesociclo corrente)
+        i = bisect_left(settimane, settimana_assoluta)
+        if settimane[i] == settimana_assoluta:
+            migliori[i] = max(migliori[i], performance.one_rm)
+        else:
+            settimane.insert(i, settimana_assoluta)
+            migliori.insert(i, performance.one_rm)
+
+    # ===== SETTIMANE ASSOLUTE =====
+
+    def settimana_assoluta(self, settimana: int, mesociclo: int = -1) -> int:
+        """Numero assoluto della `settimana` del mesociclo indicato (indice in `mesocicli`, default il corrente)."""
+        return self._inizi[mesociclo] + settimana - 1
+
+    def posizione(self, settimana_assoluta: int) -> Tuple[int, int]:
+        """(indice del mesociclo, settimana nel mesociclo) di una settimana assoluta."""
+        if not self._inizi or settimana_assoluta < 1:
+            raise ValueError(f"Settimana {settimana_assoluta} fuori dallo storico")
+        mesociclo = bisect_right(self._inizi, settimana_assoluta) - 1
+        return mesociclo, settimana_assoluta - self._inizi[mesociclo] + 1
+
+    @property
+    def ultima_settimana(self) -> int:
+        """Ultima settimana assoluta registrata (0 se lo storico è vuoto)."""
+        if not self.mesocicli:
+            return 0
+        # un mesociclo corrente ancora vuoto non aggiunge settimane
+        return self._inizi[-1] + self.corrente.durata - 1
+
+    # ===== ANALISI SU FINESTRE DI SETTIMANE =====
+
+    def statistiche(self, esercizio_id: int, settimana_assoluta: int) -> Optional[StatisticheEsercizio]:
+        mesociclo, settimana = self.posizione(settimana_assoluta)
+        return self.mesocicli[mesociclo].statistiche(esercizio_id, settimana)
+
+    def sfr_medio(self, esercizio_id: int, da: int, a: int) -> Optional[float]:
+        """SFR medio delle sessioni dell'esercizio nelle settimane assolute da `da` ad `a` (None se non eseguito)."""
+        somma_sfr, sessioni = 0.0, 0
+        for settimana_assoluta in range(max(1, da), min(a, self.ultima_settimana) + 1):
+            statistiche = self.statistiche(esercizio_id, settimana_assoluta)
+            if statistiche is not None:
+                somma_sfr += statistiche.somma_sfr
+                sessioni += statistiche.sessioni
+        return somma_sfr / sessioni if sessioni else None
+
+    def andamento_1rm(self, esercizio_id: int, ultime_settimane: int = None,
+                      fino_a: int = None) -> List[Tuple[int, float]]:
+        """
+        Miglior 1RM settimanale dell'esercizio come lista di (settimana assoluta, 1RM), limitata alle
+        `ultime_settimane` settimane che terminano con `fino_a` (default l'ultima settimana registrata).
+        """
+        settimane = self._settimane_1rm.get(esercizio_id)
+        if not settimane:
+            return []
+        fino_a = self.ultima_settimana if fino_a is None else fino_a
+        da = fino_a - ultime_settimane + 1 if ultime_settimane else 1
+        i, j = bisect_left(settimane, da), bisect_right(settimane, fino_a)
+        return list(zip(settimane[i:j], self._migliori_1rm[esercizio_id][i:j]))
+
+    def tendenza_1rm(self, esercizio_id: int, ultime_settimane: int, fino_a: int = None) -> Optional[float]:
+        """
+        Tendenza dell'1RM nella finestra: pendenza della retta dei minimi quadrati (variazione dell'1RM
+        per settimana). None se nella finestra ci sono meno di due settimane con dati.
+        """
+        punti = self.andamento_1rm(esercizio_id, ultime_settimane, fino_a)
+        if len(punti) < 2:
+            return None
+        n = len(punti)
+        media_x = sum(x for x, _ in punti) / n
+        media_y = sum(y for _, y in punti) / n
+        varianza = sum((x - media_x) ** 2 for x, _ in punti)
+        return sum((x - media_x) * (y - media_y) for x, y in punti) / varianza
@@ -1,24 +1,65 @@
-from dataclasses import dataclass, field
+import io
+from dataclasses import dataclass, replace
 from datetime import datetime
+from typing import Iterable, TextIO
 
 from model.workoutday import WorkoutDay
 
 
-@dataclass
+@dataclass(frozen=True)
 class TrainingWeek:
-    """Rappresenta un'intera settimana di allenamento."""
+    """
+    Rappresenta un'intera settimana di allenamento.
+    Come i suoi giorni è immutabile: sostituire un giorno crea una nuova settimana che condivide gli altri.
+    """
     numero_settimana: int
     start_date: datetime
-    workout_days: list[WorkoutDay] = field(default_factory=list)
+    workout_days: tuple[WorkoutDay, ...] = ()
 
-    def __str__(self):
-        descrizione = f"{'=' * 60}\n"
-        descrizione += f"           TRAINING WEEK {self.numero_settimana}\n"
-        descrizione += f"      Inizio: {self.start_date.strftime('%d/%m/%Y')}\n"
-        descrizione += f"{'=' * 60}\n"
+    def __post_init__(self):
+        if not isinstance(self.workout_days, tuple):
+            object.__setattr__(self, "workout_days", tuple(self.workout_days))
+
+    def con_giorno(self, day: WorkoutDay) -> "TrainingWeek":
+        """Nuova settimana in cui il giorno con lo stesso id_giorno è sostituito da `day`."""
+        return replace(self, workout_days=tuple(day if d.id_giorno == day.id_giorno else d
+                                                for d in self.workout_days))
+
+    def con_data_inizio(self, data_inizio: datetime) -> "TrainingWeek":
+        """La stessa settimana con un'altra data di inizio (riportata su tutti i giorni)."""
+        return replace(self, start_date=data_inizio,
+                       workout_days=tuple(day.con_data(data_inizio) for day in self.workout_days))
+
+    def get_volume_per_muscolo(self) -> dict[str, int]:
+        """Restituisce il numero di serie pianificate nella settimana per ogni muscolo primario."""
+        volume = {}
+        for day in self.workout_days:
+            for prescrizione in day.performance_log.values():
+                muscolo = prescrizione.muscolo_primario
+                volume[muscolo] = volume.get(muscolo, 0) + prescrizione.serie
+        return volume
 
+    def scrivi(self, out: TextIO):
+        """Scrive la descrizione della settimana su uno stream di testo (il testo di ogni giorno è in cache)."""
+        out.write(f"{'=' * 60}\n"
+                  f"           TRAINING WEEK {self.numero_settimana}\n"
+                  f"      Inizio: {self.start_date.strftime('%d/%m/%Y')}\n"
+                  f"{'=' * 60}\n")
         for day in self.workout_days:
-            descrizione += f"\n{day}"
+            out.write("\n")
+            out.write(str(day))
+        out.write(f"\n{'=' * 60}\n")
+
+    def __str__(self):
+        buffer = io.StringIO()
+        self.scrivi(buffer)
+        return buffer.getvalue()
+
 
-        descrizione += f"\n{'=' * 60}\n"
-        return descrizione
+def scrivi_piano(settimane: Iterable[TrainingWeek], out: TextIO):
+    """
+    Scrive un piano di più settimane (es. un mesociclo) su uno stream di testo, una settimana alla volta:
+    l'esportazione non costruisce mai il testo dell'intero piano in memoria.
+    """
+    for week in settimane:
+        week.scrivi(out)
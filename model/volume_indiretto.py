@@ -0,0 +1,65 @@
+import threading
+
+# Frazione delle serie di un esercizio conteggiata come volume per ciascun muscolo secondario
+FATTORE_VOLUME_INDIRETTO = 0.5
+
+
+class MatriceContributi:
+    """
+    Matrice sparsa esercizio × muscolo del lavoro indiretto: per ogni esercizio memorizza gli indici dei
+    muscoli secondari (diversi dal primario, senza duplicati) che ricevono volume indiretto.
+    Il catalogo la costruisce al caricamento per tutti gli esercizi; gli esercizi non ancora presenti
+    (es. letti direttamente dal DB) vengono aggiunti al primo utilizzo.
+    """
+
+    def __init__(self, esercizi=()):
+        self._lock = threading.Lock()
+        self.indice_muscoli: dict[str, int] = {}
+        self._righe: dict[int, tuple] = {}  # {id: (esercizio, indici dei muscoli secondari)}
+        for esercizio in esercizi:
+            self.aggiungi(esercizio)
+
+    def aggiungi(self, esercizio) -> tuple[int, ...]:
+        """Calcola e memorizza la riga dell'esercizio (sostituendo quella di una versione precedente)."""
+        with self._lock:
+            riga = tuple(self.indice_muscoli.setdefault(muscolo, len(self.indice_muscoli))
+                         for muscolo in dict.fromkeys(esercizio.muscoli_secondari)
+                         if muscolo != esercizio.muscolo_primario)
+            self._righe[esercizio.id] = (esercizio, riga)
+        return riga
+
+    def riga(self, esercizio) -> tuple[int, ...]:
+        """Indici dei muscoli che ricevono volume indiretto dall'esercizio."""
+        voce = self._righe.get(esercizio.id)
+        # gli esercizi sono flyweight: un oggetto diverso con lo stesso id è una versione modificata
+        if voce is None or voce[0] is not esercizio:
+            return self.aggiungi(esercizio)
+        return voce[1]
+
+    def nuovo_volume(self) -> "VolumeIndiretto":
+        return VolumeIndiretto(self)
+
+
+class VolumeIndiretto:
+    """
+    Vettore del volume indiretto accumulato per muscolo, aggiornato in modo incrementale a ogni esercizio
+    scelto: la lettura del volume di un muscolo costa O(1) invece di riscandire gli esercizi già scelti.
+    """
+
+    def __init__(self, matrice: MatriceContributi):
+        self._matrice = matrice
+        self._volumi = [0.0] * len(matrice.indice_muscoli)
+
+    def aggiungi(self, esercizio, serie):
+        contributo = serie * FATTORE_VOLUME_INDIRETTO
+        volumi = self._volumi
+        for indice in self._matrice.riga(esercizio):
+            if indice >= len(volumi):
+                volumi.extend([0.0] * (indice + 1 - len(volumi)))
+            volumi[indice] += contributo
+
+    def get(self, muscolo) -> float:
+        indice = self._matrice.indice_muscoli.get(muscolo)
+        if indice is None or indice >= len(self._volumi):
+            return 0.0
+        return self._volumi[indice]
@@ -1,79 +1,179 @@
-from dataclasses import field, dataclass
+from dataclasses import field, dataclass, replace
 from datetime import datetime
+from functools import cached_property
+from typing import Iterable, Mapping
+
 from model.esercizio import Esercizio
+from model.prescrizione import Prescrizione
+
+
+class MappaSolaLettura(dict):
+    """
+    Dizionario immutabile usato per il log e l'ordine dei muscoli dei giorni di allenamento:
+    si legge come un dict (stessa velocità di accesso), ma ogni modifica solleva TypeError.
+    Essendo immutabile, copy e deepcopy restituiscono l'oggetto stesso.
+    """
+    __slots__ = ()
+
+    def _sola_lettura(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' non supporta modifiche")
+
+    __setitem__ = __delitem__ = __ior__ = _sola_lettura
+    clear = pop = popitem = setdefault = update = _sola_lettura
+
+    def __reduce__(self):
+        # il pickle standard dei dict ripopola l'oggetto con __setitem__, qui disabilitato
+        return type(self), (dict(self),)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
 
 
-@dataclass
+@dataclass(frozen=True)
 class WorkoutDay:
-    """Rappresenta un singolo giorno di allenamento."""
+    """
+    Rappresenta un singolo giorno di allenamento.
+
+    Il giorno è immutabile: le modifiche (es. gli aggiustamenti di readiness) restituiscono un nuovo
+    giorno che condivide con l'originale gli esercizi e le voci del log non modificate, quindi può
+    essere condiviso tra settimane, cache e viste senza copie difensive.
+
+    `esercizi` è l'ordine di esecuzione, `performance_log` l'indice per id (stesso ordine), quindi
+    appartenenza e ricerca per id sono O(1); il raggruppamento per muscolo viene calcolato una sola volta.
+    """
     id_giorno: int
     settimana: int
     split_type: str
     data: datetime
-    esercizi: list[Esercizio] = field(default_factory=list)
-    performance_log: dict[int, dict] = field(default_factory=dict)
-    ordine_muscoli: dict[str, int] = field(default_factory=dict)
+    esercizi: tuple[Esercizio, ...] = ()
+    performance_log: Mapping[int, Prescrizione] = field(default_factory=MappaSolaLettura)
+    ordine_muscoli: Mapping[str, int] = field(default_factory=MappaSolaLettura)
     adjustment_message: str = ""  # Messaggio dall'algoritmo di autoregolazione
+    rir_adjustment: int = 0  # RIR da aggiungere a tutte le serie del giorno (autoregolazione)
 
-    def aggiungi_esercizio(self, esercizio: Esercizio, serie: int, reps: list[str], ordine_muscolo: int = None):
+    def __post_init__(self):
+        # accetta liste e dict in ingresso, ma li conserva in forma immutabile
+        if not isinstance(self.esercizi, tuple):
+            object.__setattr__(self, "esercizi", tuple(self.esercizi))
+        if not isinstance(self.performance_log, MappaSolaLettura):
+            object.__setattr__(self, "performance_log", MappaSolaLettura(self.performance_log))
+        if not isinstance(self.ordine_muscoli, MappaSolaLettura):
+            object.__setattr__(self, "ordine_muscoli", MappaSolaLettura(self.ordine_muscoli))
+
+    @classmethod
+    def crea(cls, id_giorno: int, settimana: int, split_type: str, data: datetime,
+             voci: Iterable[tuple] = ()) -> "WorkoutDay":
+        """
+        Crea un giorno a partire dalle voci (esercizio, serie, zone, ordine_muscolo) nell'ordine di esecuzione.
+        Se un esercizio compare più volte resta nella posizione della prima e il log tiene l'ultima voce.
         """
-        Aggiunge un esercizio al giorno di allenamento.
+        esercizi = []
+        log = {}
+        ordine_muscoli = {}
+        for esercizio, serie, zone, ordine_muscolo in voci:
+            if esercizio.id not in log:
+                esercizi.append(esercizio)
+            if ordine_muscolo is not None:
+                ordine_muscoli[esercizio.muscolo_primario] = ordine_muscolo
+            log[esercizio.id] = Prescrizione.crea(esercizio, serie, zone)
+        return cls(id_giorno, settimana, split_type, data, tuple(esercizi), MappaSolaLettura(log),
+                   MappaSolaLettura(ordine_muscoli))
+
+    def __contains__(self, esercizio) -> bool:
+        """True se il giorno contiene l'esercizio (accetta l'Esercizio o il suo id)."""
+        return getattr(esercizio, "id", esercizio) in self.performance_log
+
+    def prescrizione(self, esercizio_id: int) -> Prescrizione | None:
+        """Voce del log dell'esercizio con id `esercizio_id`, o None se non è nel giorno."""
+        return self.performance_log.get(esercizio_id)
+
+    @cached_property
+    def esercizi_per_muscolo(self) -> Mapping[str, tuple[Esercizio, ...]]:
+        """
+        Esercizi raggruppati per muscolo primario, con i muscoli nell'ordine della gerarchia (`ordine_muscoli`,
+        quelli senza ordine in coda) e gli esercizi di ogni muscolo nell'ordine di esecuzione.
+        """
+        gruppi = {}
+        for esercizio in self.esercizi:
+            gruppi.setdefault(esercizio.muscolo_primario, []).append(esercizio)
+        ordine = self.ordine_muscoli
+        return MappaSolaLettura({muscolo: tuple(gruppi[muscolo])
+                                 for muscolo in sorted(gruppi, key=lambda m: ordine.get(m, 999))})
+
+    def __getstate__(self):
+        # raggruppamento per muscolo e testo sono derivati: non vengono serializzati e si ricalcolano al primo accesso
+        stato = dict(self.__dict__)
+        stato.pop("esercizi_per_muscolo", None)
+        stato.pop("_testo", None)
+        return stato
+
+    def con_esercizio(self, esercizio: Esercizio, serie: int, zone, ordine_muscolo: int = None) -> "WorkoutDay":
+        """
+        Restituisce un nuovo giorno con l'esercizio aggiunto (o con la sua voce sostituita, se già presente).
 
         Args:
             esercizio: L'esercizio da aggiungere
             serie: Numero di serie
-            reps: Lista di stringhe con i rep ranges (es. ["6-8", "6-8", "12-14"])
+            zone: Zona di ripetizioni di ogni serie (es. [ZonaRipetizioni.PESANTE, ZonaRipetizioni.MEDIA])
             ordine_muscolo: Ordine del muscolo nella gerarchia (opzionale)
         """
-        if esercizio not in self.esercizi:
-            self.esercizi.append(esercizio)
-
+        esercizi = self.esercizi if esercizio.id in self.performance_log else self.esercizi + (esercizio,)
+        ordine_muscoli = self.ordine_muscoli
         if ordine_muscolo is not None:
-            self.ordine_muscoli[esercizio.muscolo_primario] = ordine_muscolo
-
-        # Converti reps in lista se è una stringa singola
-        if isinstance(reps, str):
-            reps = [reps] * serie
-
-        # Assicurati che ci siano abbastanza rep ranges
-        if len(reps) < serie:
-            reps.extend([reps[-1]] * (serie - len(reps)))
-
-        self.performance_log[esercizio.id] = {
-            "nome": esercizio.nome,
-            "muscolo_primario": esercizio.muscolo_primario,
-            "serie": serie,
-            "reps": reps  # Salva la lista completa dei rep ranges
-        }
-    def __str__(self):
-        descrizione = f"┌─ GIORNO {self.id_giorno} ({self.split_type}) ─ {self.data.strftime('%d/%m/%Y')} ─┐\n"
+            ordine_muscoli = MappaSolaLettura({**ordine_muscoli, esercizio.muscolo_primario: ordine_muscolo})
+        log = MappaSolaLettura({**self.performance_log, esercizio.id: Prescrizione.crea(esercizio, serie, zone)})
+        return replace(self, esercizi=esercizi, performance_log=log, ordine_muscoli=ordine_muscoli)
+
+    def con_data(self, data: datetime) -> "WorkoutDay":
+        return replace(self, data=data)
+
+    def come_riposo(self, messaggio: str = "") -> "WorkoutDay":
+        """Lo stesso giorno trasformato in giorno di riposo (nessun esercizio)."""
+        return replace(self, esercizi=(), performance_log=MappaSolaLettura(), adjustment_message=messaggio)
+
+    def con_aggiustamenti(self, riduzioni_serie: Mapping[int, int], rir_adjustment: int = 0,
+                          messaggio: str = "") -> "WorkoutDay":
+        """
+        Applica un aggiustamento di autoregolazione: toglie `riduzioni_serie[id]` serie (minimo 1) agli esercizi
+        indicati, troncandone le zone di ripetizioni, e aggiunge `rir_adjustment` al RIR di tutto il giorno.
+        Solo le voci del log effettivamente modificate vengono ricreate, le altre restano condivise.
+        """
+        log = self.performance_log
+        modificate = {}
+        for ex_id, riduzione in riduzioni_serie.items():
+            prescrizione = log.get(ex_id)
+            if prescrizione is None or riduzione <= 0:
+                continue
+            serie = max(1, prescrizione.serie - riduzione)
+            if serie != prescrizione.serie:
+                modificate[ex_id] = prescrizione.con_serie(serie)
+        if modificate:
+            log = MappaSolaLettura({**log, **modificate})
+        return replace(self, performance_log=log, rir_adjustment=rir_adjustment, adjustment_message=messaggio)
+
+    @cached_property
+    def _testo(self) -> str:
+        # il giorno è immutabile: il testo si compone una volta sola (righe unite con join) e resta valido
+        righe = [f"┌─ GIORNO {self.id_giorno} ({self.split_type}) ─ {self.data.strftime('%d/%m/%Y')} ─┐\n"]
 
         if not self.esercizi:
-            descrizione += "│  💤 GIORNO DI RIPOSO                     │\n"
-            descrizione += "└─────────────────────────────────────────┘\n"
-            return descrizione
-
-        def get_ordine_muscolo(item):
-            muscolo = item[0]
-            return self.ordine_muscoli.get(muscolo, 999)
-
-        esercizi_per_muscolo = {}
-        for esercizio in esercizi:
-            perf = self.performance_log.get(esercizio.id, {})
-            serie_txt = f"{perf.get('serie', 0)} serie"
-            reps = perf.get('reps', ['N/D'])
-            note_txt = ", ".join(reps)  # Unisce i rep ranges con virgole
-            descrizione += f"│   • {esercizio.nome:<30} │ {serie_txt:<8} │ {note_txt:<18} │\n"
-
-        muscoli_ordinati = sorted(esercizi_per_muscolo.items(), key=get_ordine_muscolo)
-
-        for muscolo, esercizi in muscoli_ordinati:
-            descrizione += f"│\n│ 🎯 {muscolo.upper()}\n"
+            righe.append("│  💤 GIORNO DI RIPOSO                     │\n")
+            righe.append("└─────────────────────────────────────────┘\n")
+            return "".join(righe)
+
+        for muscolo, esercizi in self.esercizi_per_muscolo.items():
+            righe.append(f"│\n│ 🎯 {muscolo.upper()}\n")
             for esercizio in esercizi:
-                perf = self.performance_log.get(esercizio.id, {})
-                serie_txt = f"{perf.get('serie', 0)} serie"
-                note_txt = perf.get('note', 'N/A')
-                descrizione += f"│   • {esercizio.nome:<30} │ {serie_txt:<8} │ {note_txt:<18} │\n"
+                prescrizione = self.performance_log[esercizio.id]
+                serie_txt = f"{prescrizione.serie} serie"
+                note_txt = ", ".join(map(str, prescrizione.zone))  # Unisce i rep ranges con virgole
+                righe.append(f"│   • {esercizio.nome:<30} │ {serie_txt:<8} │ {note_txt:<18} │\n")
+
+        righe.append("└────────────────────────────────────────────────────────────────────────┘\n")
+        return "".join(righe)
 
-        descrizione += "└────────────────────────────────────────────────────────────────────────┘\n"
-        return descrizione
+    def __str__(self):
+        return self._testo
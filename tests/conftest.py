@@ -0,0 +1,21 @@
+import pytest
+
+from database.DAO import DAO
+from model.catalogo_esercizi import CatalogoEsercizi
+
+
+@pytest.fixture(autouse=True)
+def ripristina_singleton():
+    """Backend DAO e catalogo condiviso sono attributi di classe: ogni test riparte da quelli precedenti."""
+    backend, catalogo = DAO._backend, CatalogoEsercizi._istanza
+    yield
+    DAO._backend, CatalogoEsercizi._istanza = backend, catalogo
+
+
+@pytest.fixture
+def catalogo_fittizio():
+    """Catalogo fittizio dei benchmark installato nel backend in memoria e nel catalogo condiviso."""
+    from benchmarks.catalogo_fittizio import installa_catalogo
+    CatalogoEsercizi._istanza = None
+    installa_catalogo()
+    return CatalogoEsercizi.get_istanza()
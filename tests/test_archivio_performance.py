@@ -0,0 +1,120 @@
+import random
+
+import pytest
+
+from model.adattaScheda import PerformanceData, TrainingAlgorithm
+
+MUSCOLI = ("Petto", "Schiena", "Spalle")
+
+
+def _performance(rng, settimana, esercizio_id):
+    sets = [(rng.choice([40.0, 42.5, 45.0, 47.5]), rng.randint(5, 12), "6-8") for _ in range(rng.randint(1, 4))]
+    return PerformanceData(esercizio_id=esercizio_id, giorno=rng.randint(1, 3), settimana=settimana,
+                           muscolo_primario=MUSCOLI[esercizio_id % len(MUSCOLI)], mmc=rng.randint(1, 3),
+                           pump=rng.randint(1, 3), dolori_articolari=rng.randint(1, 3), sets=sets)
+
+
+def _sessioni(seed, settimane=(1, 2, 3), esercizi=8):
+    """Più sessioni per esercizio e settimana, in ordine casuale (anche la settimana 2 dopo la 3)."""
+    rng = random.Random(seed)
+    sessioni = [(settimana, _performance(rng, settimana, esercizio_id))
+                for settimana in settimane for esercizio_id in range(esercizi) for _ in range(rng.randint(1, 3))]
+    rng.shuffle(sessioni)
+    return sessioni
+
+
+def test_indici_per_esercizio_e_muscolo():
+    algo = TrainingAlgorithm()
+    sessioni = _sessioni(1)
+    for settimana, performance in sessioni:
+        algo.aggiungi_performance(settimana, performance)
+
+    for settimana in (1, 2, 3):
+        della_settimana = [p for s, p in sessioni if s == settimana]
+        for muscolo in MUSCOLI:
+            attesi = list(dict.fromkeys(p.esercizio_id for p in della_settimana if p.muscolo_primario == muscolo))
+            assert algo.get_esercizi_per_muscolo(muscolo.upper(), settimana) == attesi
+        for esercizio_id in range(8):
+            dell_esercizio = [p for p in della_settimana if p.esercizio_id == esercizio_id]
+            statistiche = algo.archivio.statistiche(esercizio_id, settimana)
+            assert statistiche.sessioni == len(dell_esercizio)
+            assert algo.get_rsm_esercizio(esercizio_id, settimana) == pytest.approx(
+                sum(p.rsm for p in dell_esercizio) / len(dell_esercizio))
+            assert statistiche.migliore_1rm == max(p.one_rm for p in dell_esercizio)
+    assert algo.get_rsm_esercizio(99, 1) == 0.0
+    assert algo.get_esercizi_per_muscolo("Quadricipiti", 1) == []
+    assert algo.archivio.numero_sessioni == len(sessioni)
+
+
+def _sfr_ricalcolato(sessioni, settimana, confronto=None):
+    """SFR medio per esercizio ricalcolato da zero su tutte le sessioni, come prima degli aggregati incrementali."""
+    risultato = {}
+    for esercizio_id in dict.fromkeys(p.esercizio_id for s, p in sessioni if s == settimana):
+        valori = []
+        rm_confronto = [p.one_rm for s, p in sessioni if s == confronto and p.esercizio_id == esercizio_id]
+        media_confronto = sum(rm_confronto) / len(rm_confronto) if rm_confronto else 0
+        for s, p in sessioni:
+            if s != settimana or p.esercizio_id != esercizio_id:
+                continue
+            perdita = 0.0
+            if confronto is not None and media_confronto > 0:
+                perdita = max(0, (media_confronto - p.one_rm) / media_confronto * 100)
+            valori.append(p.rsm / max(1, p.dolori_articolari + perdita))
+        risultato[esercizio_id] = sum(valori) / len(valori)
+    return risultato
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_sfr_incrementale_uguale_al_ricalcolo(seed):
+    algo = TrainingAlgorithm()
+    sessioni = _sessioni(seed)
+    for settimana, performance in sessioni:
+        algo.aggiungi_performance(settimana, performance)
+
+    sfr_1 = algo.calcola_sfr_settimana_1()
+    sfr_3 = algo.calcola_sfr_settimana_3()
+    assert list(sfr_1) == list(_sfr_ricalcolato(sessioni, 1))
+    assert sfr_1 == pytest.approx(_sfr_ricalcolato(sessioni, 1))
+    assert sfr_3 == pytest.approx(_sfr_ricalcolato(sessioni, 3, confronto=2))
+    assert algo.calcola_sfr_medio_finale() == pytest.approx(
+        {esercizio_id: (sfr_1[esercizio_id] + sfr_3[esercizio_id]) / 2 for esercizio_id in sfr_1})
+
+
+def test_sfr_aggiornato_dopo_nuove_sessioni_di_confronto():
+    algo = TrainingAlgorithm()
+    sessioni = _sessioni(7)
+    tarde = [(s, p) for s, p in sessioni if s == 2][::2]
+    prime = [voce for voce in sessioni if voce not in tarde]
+    for settimana, performance in prime:
+        algo.aggiungi_performance(settimana, performance)
+    assert algo.calcola_sfr_settimana_3() == pytest.approx(_sfr_ricalcolato(prime, 3, confronto=2))
+
+    # le sessioni della settimana 2 registrate dopo la 3 cambiano la media di confronto
+    for settimana, performance in tarde:
+        algo.aggiungi_performance(settimana, performance)
+    assert algo.calcola_sfr_settimana_3() == pytest.approx(_sfr_ricalcolato(sessioni, 3, confronto=2))
+    perdite = {p.esercizio_id: p.perdita_performance for s, p in sessioni if s == 3}
+    assert any(perdite.values())
+
+
+def test_confronto_dalla_durata_del_mesociclo():
+    algo = TrainingAlgorithm(settimane_mesociclo=4)
+    sessioni = _sessioni(3, settimane=(1, 2, 3, 4))
+    for settimana, performance in sessioni:
+        algo.aggiungi_performance(settimana, performance)
+    assert algo.calcola_sfr_settimana(3) == pytest.approx(_sfr_ricalcolato(sessioni, 3))
+    assert algo.calcola_sfr_settimana(4) == pytest.approx(_sfr_ricalcolato(sessioni, 4, confronto=3))
+
+
+def test_ricostruzione_dai_dati_salvati():
+    # il costruttore indicizza in blocco i dizionari ricaricati dal database
+    sessioni = _sessioni(4)
+    incrementale = TrainingAlgorithm()
+    per_settimana = {}
+    for settimana, performance in sessioni:
+        incrementale.aggiungi_performance(settimana, performance)
+        per_settimana.setdefault(settimana, []).append(performance)
+    ricostruito = TrainingAlgorithm(performance_data=per_settimana)
+    for settimana in (1, 2, 3):
+        assert ricostruito.calcola_sfr_settimana(settimana) == pytest.approx(
+            incrementale.calcola_sfr_settimana(settimana))
@@ -0,0 +1,41 @@
+import pytest
+
+from benchmarks.catalogo_fittizio import CONTESTI, _ESERCIZI_PER_MUSCOLO, backend_memoria, backend_sqlite
+
+MUSCOLI = list(_ESERCIZI_PER_MUSCOLO) + ["Avambracci"]  # un muscolo senza esercizi
+
+
+@pytest.fixture(scope="module")
+def backends():
+    return backend_sqlite(), backend_memoria()
+
+
+def _id(esercizi):
+    return [esercizio.id for esercizio in esercizi]
+
+
+@pytest.mark.parametrize("context", [contesto["nome"] for contesto in CONTESTI])
+def test_esercizi_per_muscolo_uguali(backends, context):
+    sqlite, memoria = backends
+    for muscolo in MUSCOLI:
+        assert _id(sqlite.getEsercizi(context, muscolo)) == _id(memoria.getEsercizi(context, muscolo))
+
+
+@pytest.mark.parametrize("context", [contesto["nome"] for contesto in CONTESTI])
+@pytest.mark.parametrize("top_n", [None, 1, 2])
+def test_query_unica_per_piu_muscoli(backends, context, top_n):
+    for backend in backends:
+        per_muscoli = backend.getEserciziPerMuscoli(context, MUSCOLI, top_n)
+        assert list(per_muscoli) == MUSCOLI
+        for muscolo in MUSCOLI:
+            assert _id(per_muscoli[muscolo]) == _id(backend.getEsercizi(context, muscolo))[:top_n]
+
+
+def test_catalogo_uguale(backends):
+    sqlite, memoria = backends
+    assert _id(sqlite.getAllEsercizi()) == _id(memoria.getAllEsercizi())
+    assert sqlite.getAllContesti() == memoria.getAllContesti()
+    assert sqlite.getAllPriorita() == memoria.getAllPriorita()
+    assert sqlite.getDescrizioneEsercizio(1) == memoria.getDescrizioneEsercizio(1)
+    assert sqlite.getDescrizioneEsercizio(-1) is memoria.getDescrizioneEsercizio(-1) is None
+
@@ -0,0 +1,10 @@
+from database.DAO import DAO
+
+
+def test_benchmark_sqlite_ripristina_il_backend(catalogo_fittizio):
+    from benchmarks.run_benchmarks import BENCHMARKS
+    backend = DAO.get_backend()
+    genera = BENCHMARKS["generazione.intermedio_3_giorni_senza_catalogo_sqlite"]()
+    assert DAO.get_backend() is backend
+    assert genera().workout_days
+    assert DAO.get_backend() is backend
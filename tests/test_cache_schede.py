@@ -0,0 +1,83 @@
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+from model.creascheda import Model
+
+DATA = datetime(2025, 1, 6)
+
+
+@pytest.fixture
+def model(catalogo_fittizio):
+    return Model(dimensione_cache=2)
+
+
+def _genera(model, muscolo="Petto", seed=1, data_inizio=DATA, volume_overrides=None):
+    return model.getSchedaFullBodyIntermedio("Palestra Completa", muscolo, 3, volume_overrides, seed=seed,
+                                             data_inizio=data_inizio)
+
+
+def test_hit_con_la_data_richiesta(model):
+    prima = _genera(model)
+    seconda = _genera(model, data_inizio=datetime(2025, 3, 3))
+    assert model.cache_schede.statistiche()["hit"] == 1
+    assert seconda.start_date == datetime(2025, 3, 3)
+    assert {day.data for day in seconda.workout_days} == {datetime(2025, 3, 3)}
+    assert prima.start_date == DATA
+    # i giorni condividono esercizi e log con quelli in cache
+    assert all(a.performance_log is b.performance_log for a, b in zip(prima.workout_days, seconda.workout_days))
+
+
+def test_override_normalizzati(model):
+    _genera(model, volume_overrides={"Petto": 12, "Schiena": 10})
+    _genera(model, volume_overrides={"Schiena": 10, "Petto": 12})
+    assert model.cache_schede.statistiche()["hit"] == 1
+
+
+def test_senza_seme_nessuna_cache(model):
+    _genera(model, seed=None)
+    assert model.cache_schede.statistiche()["miss"] == 0
+
+
+def test_rimozione_lru(model):
+    _genera(model, seed=1)
+    _genera(model, seed=2)
+    _genera(model, seed=1)
+    _genera(model, seed=3)  # rimuove il seme 2, il meno usato di recente
+    _genera(model, seed=1)
+    statistiche = model.cache_schede.statistiche()
+    assert (statistiche["dimensione"], statistiche["rimozioni"], statistiche["hit"]) == (2, 1, 2)
+    _genera(model, seed=2)
+    assert model.cache_schede.statistiche()["miss"] == 4
+
+
+def test_settimane_in_cache_non_modificabili(model):
+    settimana = _genera(model)
+    giorno = settimana.workout_days[0]
+    with pytest.raises(FrozenInstanceError):
+        settimana.workout_days = ()
+    with pytest.raises(FrozenInstanceError):
+        giorno.esercizi = ()
+    with pytest.raises(TypeError):
+        giorno.performance_log[giorno.esercizi[0].id] = None
+    with pytest.raises(AttributeError):
+        giorno.esercizi.append(giorno.esercizi[0])
+
+
+def test_aggiustamenti_non_alterano_la_cache(model):
+    settimana = _genera(model)
+    giorno = settimana.workout_days[0]
+    testo = str(settimana)
+    riduzioni = {esercizio.id: 1 for esercizio in giorno.esercizi}
+    aggiustato = giorno.con_aggiustamenti(riduzioni, 1, "Giorno giallo")
+    settimana.con_giorno(giorno.come_riposo("Riposo"))
+    assert aggiustato.performance_log != giorno.performance_log
+    assert str(_genera(model)) == testo
+
+
+def test_nuova_versione_del_catalogo_non_usa_la_cache(model):
+    _genera(model)
+    model.catalogo.carica()
+    _genera(model)
+    assert model.cache_schede.statistiche()["miss"] == 2
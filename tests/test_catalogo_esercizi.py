@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import pytest
+
+from benchmarks.catalogo_fittizio import backend_sqlite
+from database.DAO import DAO
+from model.catalogo_esercizi import CatalogoEsercizi
+
+PETTO = ("Palestra Completa", "Petto")
+
+
+@pytest.fixture
+def sqlite():
+    backend = DAO.usa_backend(backend_sqlite())
+    return backend
+
+
+@pytest.fixture
+def catalogo(sqlite):
+    catalogo = CatalogoEsercizi(ttl_secondi=float("inf"))
+    catalogo.carica()
+    return catalogo
+
+
+def _esegui(backend, query, parametri=()):
+    with backend._lock, backend._cnx:
+        backend._cnx.execute(query, parametri)
+
+
+def test_versione_uguale_tra_sqlite_e_memoria():
+    from benchmarks.catalogo_fittizio import backend_memoria
+    assert backend_sqlite().getVersioneCatalogo() == backend_memoria().getVersioneCatalogo()
+
+
+def test_aggiornamento_incrementale(sqlite, catalogo):
+    generazione = catalogo.get_generazione()
+    _esegui(sqlite, "update exercises set nome = 'Panca Piana', updated_at = ? where id = 1",
+            ("2025-02-01 00:00:00",))
+    catalogo.verifica_versione()
+    assert catalogo.get_esercizio(1).nome == "Panca Piana"
+    assert catalogo.get_generazione() == generazione + 1
+
+
+def test_aggiornamento_con_updated_at_uguale_al_massimo(sqlite, catalogo):
+    # id 1 passa a un updated_at più vecchio, poi id 2 viene aggiornato allo stesso massimo corrente
+    _esegui(sqlite, "update exercises set updated_at = '2024-01-01 00:00:00' where id = 1")
+    catalogo.carica()
+    massimo = catalogo.snapshot()[3][0]
+    _esegui(sqlite, "update exercises set nome = 'Panca Piana', updated_at = ? where id = 1",
+            (massimo.isoformat(sep=" "),))
+    catalogo.verifica_versione()
+    assert catalogo.get_esercizio(1).nome == "Panca Piana"
+
+
+def test_aggiornamento_con_updated_at_riportato_indietro(sqlite, catalogo):
+    _esegui(sqlite, "update exercises set nome = 'Panca Piana', updated_at = '2020-01-01 00:00:00' where id = 1")
+    catalogo.verifica_versione()
+    assert catalogo.get_esercizio(1).nome == "Panca Piana"
+
+
+def test_cancellazione_e_inserimento_in_egual_numero(sqlite, catalogo):
+    assert any(e.id == 1 for e in catalogo.get_esercizi(*PETTO))
+    _esegui(sqlite, "delete from exercise_context_priority where exercise_id = 1")
+    _esegui(sqlite, "delete from exercises where id = 1")
+    riga = {c: None for c in ("attrezzatura", "livello", "muscoli_secondari", "recupero_secondi", "affaticamento",
+                              "tipologia", "articolazioni", "descrizione", "range_ripetizioni")}
+    riga.update(id=1000, nome="Dip", muscolo_primario="Petto", created_at=datetime(2025, 1, 1),
+                updated_at=datetime(2025, 1, 1))
+    sqlite.importa([riga], [], [])
+    assert sqlite.getVersioneCatalogo()[:2] == catalogo.snapshot()[3][:2]  # stessi max updated_at e conteggio
+
+    catalogo.verifica_versione()
+    assert catalogo.get_esercizio(1) is None
+    assert catalogo.get_esercizio(1000).nome == "Dip"
+    assert all(e.id != 1 for e in catalogo.get_esercizi(*PETTO))
+
+
+def test_catalogo_invariato_non_ricostruisce_indice(sqlite, catalogo):
+    generazione = catalogo.get_generazione()
+    catalogo.verifica_versione()
+    assert catalogo.get_generazione() == generazione
@@ -0,0 +1,101 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flet")
+
+from database.DAO import DAO  # noqa: E402
+from UI.controller import Controller  # noqa: E402
+
+CONFIG = {"esperienza": "intermedio", "attrezzatura": "palestra_completa", "muscolo_target": "Petto",
+          "frequenza": "3"}
+
+
+class ViewFittizia:
+    """Solo ciò che il controller usa durante la creazione della scheda e il salvataggio delle performance."""
+
+    def __init__(self):
+        self.snackbar = []
+        self.readiness = []
+        self.performance = []
+        self.btn_crea_scheda = SimpleNamespace(disabled=False)
+        self.btn_salva_performance = SimpleNamespace(disabled=False)
+
+    def get_config_values(self):
+        return dict(CONFIG)
+
+    def get_performance_data_from_cards(self):
+        return self.performance
+
+    def show_snackbar(self, messaggio, color=None, duration=None):
+        self.snackbar.append(messaggio)
+
+    def mostra_schermata_readiness(self, muscoli):
+        self.readiness.append(muscoli)
+
+    def update_view(self):
+        pass
+
+
+def _controller():
+    controller = Controller()
+    controller.view = ViewFittizia()
+    return controller
+
+
+def _allena_giorno(controller):
+    """Registra una serie per ogni esercizio del giorno corrente e salva come farebbe la vista."""
+    giorno = controller.training_week.workout_days[controller.current_day_index]
+    controlli = {nome: SimpleNamespace(value="2") for nome in ("mmc", "pump", "dolori")}
+    controller.view.performance = [
+        {"esercizio_id": esercizio.id, "muscolo_primario": esercizio.muscolo_primario,
+         "settimana": controller.current_week_num, "giorno": giorno.id_giorno,
+         "sets": [(40.0, 10, "8-12")], "controls": controlli} for esercizio in giorno.esercizi]
+    controller.handle_salva_performance(None)
+
+
+def _esercizi_per_giorno(training_week):
+    return [[esercizio.id for esercizio in giorno.esercizi] for giorno in training_week.workout_days]
+
+
+@pytest.fixture
+def controller(catalogo_fittizio):
+    controller = _controller()
+    asyncio.run(controller.handle_crea_scheda(None))
+    return controller
+
+
+def test_ripresa_del_mesociclo(controller):
+    _allena_giorno(controller)
+    ripreso = _controller()
+    asyncio.run(ripreso.carica_mesociclo_attivo())
+
+    assert ripreso.mesociclo_id == controller.mesociclo_id
+    assert (ripreso.current_week_num, ripreso.current_day_index) == (1, controller.current_day_index)
+    assert _esercizi_per_giorno(ripreso.training_week) == _esercizi_per_giorno(controller.training_week)
+    assert ripreso.training_week.start_date == controller.training_week.start_date
+    assert ripreso.training_algo.archivio.numero_sessioni == controller.training_algo.archivio.numero_sessioni
+    assert ripreso.view.readiness == controller.view.readiness[-1:]
+
+
+def test_scritture_fallite_ritentate_al_salvataggio_successivo(controller, monkeypatch):
+    backend = DAO.get_backend()
+    salva = backend.salvaPerformance
+
+    def non_disponibile(*args):
+        raise ConnectionError("database non raggiungibile")
+
+    monkeypatch.setattr(backend, "salvaPerformance", non_disponibile)
+    _allena_giorno(controller)
+    assert "Performance del giorno salvate solo in locale." in controller.view.snackbar
+    assert [operazione for operazione, _ in controller._scritture_in_sospeso] == [DAO.salvaPerformance,
+                                                                                  DAO.salvaStatoMesociclo]
+
+    monkeypatch.setattr(backend, "salvaPerformance", salva)
+    _allena_giorno(controller)
+    assert controller._scritture_in_sospeso == []
+    _, stato, performance_data, _ = DAO.caricaMesocicloAttivo(controller.utente)
+    assert stato["giorno_corrente"] == controller.current_day_index
+    assert [p.esercizio_id for p in performance_data[1]] == \
+        [p.esercizio_id for p in controller.training_algo.performance_data[1]]
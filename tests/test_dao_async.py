@@ -0,0 +1,24 @@
+import asyncio
+from types import SimpleNamespace
+
+from database import DAO_async
+from database.DAO_async import DAOAsync
+from model.catalogo_esercizi import CatalogoEsercizi
+
+
+def test_executor_dimensionato_sul_pool(monkeypatch):
+    monkeypatch.setattr(DAO_async, "DBConnect", SimpleNamespace(dimensione_pool=lambda: 6))
+    assert DAOAsync.dimensione_predefinita() == 6
+    monkeypatch.setattr(DAO_async, "DBConnect", None)
+    assert DAOAsync.dimensione_predefinita() == DAOAsync.DIMENSIONE_EXECUTOR_SENZA_POOL
+
+
+def test_query_del_catalogo_tutte_in_parallelo():
+    # carica_async esegue quattro query con asyncio.gather: nessuna deve attendere un thread o una connessione
+    assert DAOAsync.dimensione_predefinita() >= 4
+
+
+def test_caricamento_async_del_catalogo(catalogo_fittizio):
+    catalogo = CatalogoEsercizi(ttl_secondi=float("inf"))
+    asyncio.run(catalogo.carica_async())
+    assert catalogo.snapshot()[3] == catalogo_fittizio.snapshot()[3]
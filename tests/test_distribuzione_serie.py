@@ -0,0 +1,110 @@
+import random
+from itertools import permutations
+
+import pytest
+
+from model.distribuzione_serie import GIORNI_SUPPORTATI, TabelleDistribuzione, schema_equilibrato
+
+# schema (giorni attivi, dal più carico) per i volumi da 1 a 10
+SCHEMI = {
+    ("intermedio", 2): [(1,), (2,), (3,), (2, 2), (3, 2), (3, 3), (4, 3), (4, 4), (5, 4), (5, 5)],
+    ("intermedio", 3): [(1,), (2,), (3,), (2, 2), (3, 2), (3, 3), (3, 2, 2), (3, 3, 2), (3, 3, 3), (4, 3, 3)],
+    ("intermedio", 4): [(1,), (2,), (3,), (2, 2), (3, 2), (3, 3), (3, 2, 2), (3, 3, 2), (3, 3, 3), (3, 3, 2, 2)],
+    ("intermedio", 5): [(1,), (2,), (3,), (2, 2), (3, 2), (3, 3), (3, 2, 2), (3, 3, 2), (3, 3, 3), (3, 3, 2, 2)],
+    ("intermedio", 6): [(1,), (2,), (3,), (2, 2), (3, 2), (3, 3), (3, 2, 2), (3, 3, 2), (3, 3, 3), (3, 3, 2, 2)],
+    ("principiante", 2): [(1,), (2,), (2, 1), (2, 2), (3, 2), (3, 3), (4, 3), (4, 4), (5, 4), (5, 5)],
+    ("principiante", 3): [(1,), (2,), (2, 1), (2, 2), (3, 2), (2, 2, 2), (3, 2, 2), (3, 3, 2), (3, 3, 3),
+                          (4, 3, 3)],
+    ("principiante", 4): [(1,), (2,), (2, 1), (2, 2), (3, 2), (2, 2, 2), (3, 2, 2), (2, 2, 2, 2), (3, 2, 2, 2),
+                          (3, 3, 2, 2)],
+    ("principiante", 5): [(1,), (2,), (3,), (2, 2), (3, 2), (2, 2, 2), (3, 2, 2), (2, 2, 2, 2), (3, 2, 2, 2),
+                          (2, 2, 2, 2, 2)],
+    ("principiante", 6): [(1,), (2,), (3,), (2, 2), (3, 2), (2, 2, 2), (3, 2, 2), (2, 2, 2, 2), (3, 2, 2, 2),
+                          (2, 2, 2, 2, 2)],
+}
+
+
+def _disposizioni(schema, giorni):
+    return set(permutations(schema + (0,) * (giorni - len(schema))))
+
+
+@pytest.mark.parametrize("livello, giorni", list(SCHEMI))
+def test_tabelle_per_livello_e_giorni(livello, giorni):
+    tabella = TabelleDistribuzione.tabella(livello, giorni)
+    assert tabella[0] == ((0,) * giorni,)
+    for volume, schema in enumerate(SCHEMI[livello, giorni], start=1):
+        # tutte le disposizioni distinte dello schema, una volta sola
+        assert sorted(tabella[volume]) == sorted(_disposizioni(schema, giorni))
+
+
+def test_split_a_frequenza_fissa():
+    tabella = TabelleDistribuzione.tabella("frequenza_fissa", 2)
+    assert [tabella[volume] for volume in range(6)] == [((0, 0),), ((1, 0),), ((1, 1),), ((2, 1),), ((2, 2),),
+                                                        ((3, 2),)]
+
+
+def _intermedio_originale(volume):
+    """Scale della distribuzione originale per intermedi a 3 giorni (prima di TabelleDistribuzione)."""
+    if volume <= 6:
+        return {2: (2,), 3: (3,), 4: (2, 2), 5: (3, 2), 6: (3, 3)}[volume]
+    return schema_equilibrato(volume, 3)
+
+
+def _principiante_originale(volume, giorni):
+    attivi = 1 if volume <= 2 else 2 if volume <= 5 else giorni
+    return schema_equilibrato(volume, attivi)
+
+
+@pytest.mark.parametrize("volume", range(2, TabelleDistribuzione.VOLUME_MASSIMO + 1))
+def test_come_la_distribuzione_originale(volume):
+    # alle frequenze già supportate le distribuzioni possibili restano quelle di prima
+    assert set(TabelleDistribuzione.tabella("intermedio", 3)[volume]) == _disposizioni(
+        _intermedio_originale(volume), 3)
+    for giorni in (2, 3):
+        assert set(TabelleDistribuzione.tabella("principiante", giorni)[volume]) == _disposizioni(
+            _principiante_originale(volume, giorni), giorni)
+    base, extra = divmod(volume, 2)
+    assert TabelleDistribuzione.tabella("frequenza_fissa", 2)[volume] == ((base + extra, base),)
+
+
+@pytest.mark.parametrize("livello", ["intermedio", "principiante", "frequenza_fissa"])
+@pytest.mark.parametrize("giorni", GIORNI_SUPPORTATI)
+def test_somma_uguale_al_volume(livello, giorni):
+    for volume, distribuzioni in TabelleDistribuzione.tabella(livello, giorni).items():
+        assert len(set(distribuzioni)) == len(distribuzioni)
+        assert all(len(d) == giorni and sum(d) == volume for d in distribuzioni)
+
+
+@pytest.mark.parametrize("livello", ["intermedio", "principiante"])
+@pytest.mark.parametrize("giorni", GIORNI_SUPPORTATI)
+def test_nessun_giorno_con_una_sola_serie(livello, giorni):
+    for volume, distribuzioni in TabelleDistribuzione.tabella(livello, giorni).items():
+        if volume < 2 or (livello == "principiante" and volume == 3 and giorni <= 4):
+            continue  # 1 serie, e il 2-1 dei principianti fino a 4 giorni
+        assert all(serie != 1 for d in distribuzioni for serie in d), (volume, distribuzioni)
+
+
+def test_frequenza_non_supportata():
+    with pytest.raises(ValueError):
+        TabelleDistribuzione.tabella("intermedio", 7)
+    with pytest.raises(ValueError):
+        TabelleDistribuzione.tabella("avanzato", 3)
+
+
+def test_volume_oltre_il_massimo_calcolato_una_volta(monkeypatch):
+    monkeypatch.setattr(TabelleDistribuzione, "_tabelle", {})
+    calcoli = []
+    calcola = TabelleDistribuzione._calcola
+
+    def conta(regola, volume, giorni):
+        calcoli.append(volume)
+        return calcola(regola, volume, giorni)
+
+    monkeypatch.setattr(TabelleDistribuzione, "_calcola", staticmethod(conta))
+    volume = TabelleDistribuzione.VOLUME_MASSIMO + 5
+    rng = random.Random(1)
+    distribuzione = TabelleDistribuzione.distribuisci("intermedio", volume, 3, rng)
+    assert sum(distribuzione) == volume
+    TabelleDistribuzione.distribuisci("intermedio", volume, 3, rng)
+    assert calcoli.count(volume) == 1
+    assert TabelleDistribuzione.tabella("intermedio", 3)[volume] == ((15, 15, 15),)
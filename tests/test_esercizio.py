@@ -0,0 +1,67 @@
+import copy
+import pickle
+import sys
+from dataclasses import FrozenInstanceError
+from datetime import datetime
+
+import pytest
+
+from benchmarks.catalogo_fittizio import backend_memoria, backend_sqlite
+from database.DAO import DAO
+from model.esercizio import Esercizio
+
+RIGA = {"id": 9001, "nome": "Panca Test", "attrezzatura": '["Bilanciere", "Panca"]', "livello": 2,
+        "muscolo_primario": "Petto", "muscoli_secondari": '["Tricipiti"]', "recupero_secondi": 120,
+        "affaticamento": 3, "tipologia": "Multiarticolare", "articolazioni": "Spalla", "range_ripetizioni": "6-8",
+        "created_at": datetime(2025, 1, 1), "updated_at": datetime(2025, 1, 1)}
+
+
+def test_campi_normalizzati_e_internati():
+    esercizio = Esercizio.da_riga(dict(RIGA))
+    assert esercizio.attrezzatura == ("Bilanciere", "Panca")
+    assert esercizio.articolazioni == ("Spalla",)
+    assert esercizio.range_ripetizioni == (6, 8)
+    assert esercizio.muscolo_primario is sys.intern("Petto")
+    assert esercizio.tipologia is sys.intern("Multiarticolare")
+    assert not hasattr(esercizio, "__dict__")
+
+
+@pytest.mark.parametrize("valore, atteso", [("[8, 12]", (8, 12)), ("12-8", (8, 12)), ("10", (10, 12)),
+                                            ([5, 8], (5, 8)), ("?", (5, 10)), (None, (5, 10))])
+def test_range_ripetizioni(valore, atteso):
+    assert Esercizio.da_riga({**RIGA, "id": 9002, "range_ripetizioni": valore}).range_ripetizioni == atteso
+    Esercizio._registro.pop(9002, None)
+
+
+def test_immutabile():
+    esercizio = Esercizio.da_riga(dict(RIGA))
+    with pytest.raises(FrozenInstanceError):
+        esercizio.nome = "Altro"
+    with pytest.raises(FrozenInstanceError):
+        del esercizio.nome
+
+
+def test_flyweight_per_id_e_versione():
+    esercizio = Esercizio.da_riga(dict(RIGA))
+    assert Esercizio.da_riga(dict(RIGA)) is esercizio
+    assert copy.deepcopy(esercizio) is esercizio
+    assert pickle.loads(pickle.dumps(esercizio)) is esercizio
+
+    modificato = Esercizio.da_riga({**RIGA, "nome": "Panca Modificata", "updated_at": datetime(2025, 2, 1)})
+    assert modificato is not esercizio and modificato.nome == "Panca Modificata"
+    assert Esercizio.da_riga({**RIGA, "updated_at": datetime(2025, 2, 1)}) is modificato
+
+
+def test_stesse_istanze_tra_backend():
+    sqlite, memoria = backend_sqlite(), backend_memoria()
+    assert all(a is b for a, b in zip(sqlite.getAllEsercizi(), memoria.getAllEsercizi()))
+
+
+def test_descrizione_caricata_al_primo_accesso():
+    backend = DAO.usa_backend(backend_memoria())
+    # riga letta senza descrizione, come fanno le query del catalogo
+    riga = {**backend.getAllEsercizi()[0].come_riga(), "descrizione": None, "updated_at": datetime(2030, 1, 1)}
+    esercizio = Esercizio.da_riga(riga)
+    assert esercizio.come_riga()["descrizione"] is None
+    assert esercizio.descrizione == backend.getDescrizioneEsercizio(esercizio.id)
+    assert esercizio.come_riga()["descrizione"] == esercizio.descrizione
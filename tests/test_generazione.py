@@ -0,0 +1,74 @@
+import random
+from datetime import datetime
+
+import pytest
+
+from model.creascheda import Model, deriva_semi
+
+DATA = datetime(2025, 1, 6)
+
+
+@pytest.fixture
+def model(catalogo_fittizio):
+    return Model()
+
+
+def test_batch_uguale_alle_chiamate_singole(model):
+    configs = [{"context": "Palestra Completa", "livello": livello, "muscolo_target": muscolo, "giorni": giorni,
+                "settimana": settimana, "seed": indice, "data_inizio": DATA}
+               for indice, (livello, muscolo, giorni, settimana) in enumerate([
+                   ("intermedio", "Petto", 3, 1), ("intermedio", "Petto", 3, 2), ("intermedio", "Schiena", 5, 1),
+                   ("intermedio", "Glutei", 4, 1), ("principiante", "Petto", 3, 1), ("principiante", "Petto", 2, 1)])]
+    singole = Model(dimensione_cache=0)
+    attese = []
+    for config in configs:
+        genera = (singole.getSchedaFullBodyPrincipiante if config["livello"] == "principiante"
+                  else singole.getSchedaFullBodyIntermedio)
+        attese.append(genera(config["context"], config["muscolo_target"], config["giorni"],
+                             settimana=config["settimana"], seed=config["seed"], data_inizio=DATA))
+    assert model.generate_batch(configs) == attese
+
+
+def test_seme_del_batch_derivato_per_posizione(model):
+    # ogni configurazione senza seme riceve il seme derivato dalla sua posizione, qualunque sia il suo gruppo
+    config = {"context": "Palestra Completa", "livello": "intermedio", "muscolo_target": "Petto", "giorni": 3,
+              "data_inizio": DATA}
+    configs = [config, {**config, "muscolo_target": "Schiena"}, config]
+    semi = deriva_semi(11, len(configs))
+    attese = [model.getSchedaFullBodyIntermedio(c["context"], c["muscolo_target"], 3, seed=seme, data_inizio=DATA)
+              for c, seme in zip(configs, semi)]
+    assert model.generate_batch(configs, seed=11) == attese
+
+
+@pytest.mark.parametrize("livello, giorni", [("intermedio", 3), ("intermedio", 5), ("principiante", 2),
+                                             ("principiante", 3)])
+def test_stesso_seme_stessa_settimana(livello, giorni, catalogo_fittizio):
+    # modelli senza cache: il risultato deve dipendere solo dagli argomenti, non dal generatore globale
+    settimane = []
+    for _ in range(2):
+        model = Model(dimensione_cache=0)
+        genera = model.getSchedaFullBodyPrincipiante if livello == "principiante" else model.getSchedaFullBodyIntermedio
+        settimane.append(genera("Palestra Completa", "Petto", giorni, settimana=2, seed=42, data_inizio=DATA))
+    assert settimane[0] == settimane[1]
+    assert str(settimane[0]) == str(settimane[1])
+    assert any(day.esercizi for day in settimane[0].workout_days)
+
+
+def test_semi_diversi_settimane_diverse(model):
+    settimane = {str(model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", 3, seed=seed, data_inizio=DATA))
+                 for seed in range(5)}
+    assert len(settimane) > 1
+
+
+def test_random_random_usato_in_sequenza(model):
+    rng, riferimento = random.Random(3), random.Random(3)
+    assert (model.getSchedaFullBodyIntermedio("Palestra Completa", "Petto", 3, seed=rng, data_inizio=DATA) ==
+            Model(dimensione_cache=0).getSchedaFullBodyIntermedio("Palestra Completa", "Petto", 3, seed=riferimento,
+                                                                  data_inizio=DATA))
+
+
+def test_mesociclo_riproducibile(model):
+    primo = model.genera_mesociclo("Palestra Completa", "intermedio", "Schiena", 3, seed=5, data_inizio=DATA)
+    secondo = Model().genera_mesociclo("Palestra Completa", "intermedio", "Schiena", 3, seed=5, data_inizio=DATA)
+    assert primo == secondo
+    assert [settimana.numero_settimana for settimana in primo] == [1, 2, 3, 4]
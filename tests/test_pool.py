@@ -0,0 +1,137 @@
+import threading
+
+import pytest
+
+from database.pool import PoolConnessioni, PoolEsauritoError
+
+
+class ConnessioneFittizia:
+    def __init__(self, numero):
+        self.numero = numero
+        self.rollback = 0
+        self.chiusa = False
+        self.valida = True
+
+    def close(self):
+        self.chiusa = True
+
+
+class Fabbrica:
+    def __init__(self):
+        self.create = []
+
+    def __call__(self):
+        connessione = ConnessioneFittizia(len(self.create))
+        self.create.append(connessione)
+        return connessione
+
+
+def _rollback(connessione):
+    if not connessione.valida:
+        raise ConnectionError("connessione persa")
+    connessione.rollback += 1
+
+
+@pytest.fixture
+def fabbrica():
+    return Fabbrica()
+
+
+def test_connessioni_create_al_bisogno_e_riusate(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=2)
+    with pool.connessione() as prima:
+        pass
+    with pool.connessione() as seconda:
+        assert seconda is prima
+    assert len(fabbrica.create) == 1
+    assert pool.statistiche()["libere"] == 1
+
+
+def test_esaurimento_e_timeout(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, timeout_acquisizione=0.05)
+    connessione = pool.acquisisci()
+    with pytest.raises(PoolEsauritoError):
+        pool.acquisisci()
+    pool.rilascia(connessione)
+    statistiche = pool.statistiche()
+    assert (statistiche["esaurimenti"], statistiche["timeout"], statistiche["in_uso"]) == (1, 1, 0)
+
+
+def test_attesa_fino_al_rilascio(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, timeout_acquisizione=5)
+    connessione = pool.acquisisci()
+    in_attesa = threading.Event()
+    acquisite = []
+
+    def attendi():
+        in_attesa.set()
+        with pool.connessione() as altra:
+            acquisite.append(altra)
+
+    thread = threading.Thread(target=attendi)
+    thread.start()
+    in_attesa.wait()
+    threading.Timer(0.05, pool.rilascia, (connessione,)).start()
+    thread.join(5)
+    assert acquisite == [connessione]
+    statistiche = pool.statistiche()
+    assert (statistiche["attese"], statistiche["timeout"], statistiche["aperte"]) == (1, 0, 1)
+
+
+def test_rollback_al_rilascio(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, ripristina_connessione=_rollback)
+    with pool.connessione() as connessione:
+        pass
+    assert connessione.rollback == 1
+
+
+def test_ripristino_fallito_scarta_la_connessione(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, ripristina_connessione=_rollback)
+    with pool.connessione() as connessione:
+        connessione.valida = False
+    assert connessione.chiusa
+    with pool.connessione() as nuova:
+        assert nuova is not connessione
+    assert pool.statistiche()["aperte"] == 1
+
+
+def test_errore_di_connessione_scarta_senza_ripristino(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, errori_connessione=(ConnectionError,),
+                           ripristina_connessione=_rollback)
+    with pytest.raises(ConnectionError):
+        with pool.connessione() as connessione:
+            raise ConnectionError("server non raggiungibile")
+    assert (connessione.chiusa, connessione.rollback) == (True, 0)
+    assert pool.statistiche()["aperte"] == 0
+
+
+def test_altri_errori_restituiscono_la_connessione(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, errori_connessione=(ConnectionError,),
+                           ripristina_connessione=_rollback)
+    with pytest.raises(ValueError):
+        with pool.connessione() as connessione:
+            raise ValueError("query non valida")
+    assert (connessione.chiusa, connessione.rollback) == (False, 1)
+    assert pool.statistiche()["libere"] == 1
+
+
+def test_riconnessione_delle_connessioni_inattive(fabbrica):
+    pool = PoolConnessioni(fabbrica, dimensione=1, verifica_dopo_secondi=0,
+                           verifica_connessione=lambda connessione: connessione.valida)
+    with pool.connessione() as connessione:
+        connessione.valida = False
+    with pool.connessione() as nuova:
+        assert nuova is not connessione
+    assert connessione.chiusa
+    assert pool.statistiche()["riconnessioni"] == 1
+
+
+def test_creazione_fallita_libera_il_posto():
+    def non_disponibile():
+        raise ConnectionError("server non raggiungibile")
+
+    pool = PoolConnessioni(non_disponibile, dimensione=1, timeout_acquisizione=0.01)
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            pool.acquisisci()
+    assert pool.statistiche()["aperte"] == 0
@@ -0,0 +1,70 @@
+import pytest
+
+from benchmarks.catalogo_fittizio import backend_memoria, backend_sqlite
+from benchmarks.run_benchmarks import _mesociclo_con_performance
+
+STATO = {"config_values": {"esperienza": "intermedio", "frequenza": "3"}, "seme": 7,
+         "settimana_corrente": 2, "giorno_corrente": 1, "volume_history": {"1": {"Petto": 10}},
+         "volume_overrides": {"Petto": 11}, "data_inizio": "2025-01-06T00:00:00"}
+
+
+@pytest.fixture(params=["sqlite", "memoria"])
+def backend(request):
+    return backend_sqlite() if request.param == "sqlite" else backend_memoria()
+
+
+@pytest.fixture
+def algo(catalogo_fittizio):
+    return _mesociclo_con_performance(settimane=(1, 2))
+
+
+def _riassunto(performance_data):
+    return {settimana: [(p.esercizio_id, p.giorno, p.muscolo_primario, p.mmc, p.pump, p.dolori_articolari,
+                         [tuple(s) for s in p.sets]) for p in performances]
+            for settimana, performances in performance_data.items()}
+
+
+def _salva(backend, mesociclo_id, algo):
+    progressivo = 1
+    for settimana, performances in algo.performance_data.items():
+        backend.salvaPerformance(mesociclo_id, settimana, progressivo, performances)
+        progressivo += len(performances)
+    backend.salvaDoms(mesociclo_id, 2, 1, algo.doms_data[2])
+
+
+def test_nessun_mesociclo_attivo(backend):
+    assert backend.caricaMesocicloAttivo("nessuno") is None
+
+
+def test_mesociclo_vuoto_con_stato(backend):
+    mesociclo_id = backend.apriMesociclo("utente", STATO)
+    assert backend.caricaMesocicloAttivo("utente") == (mesociclo_id, STATO, {}, {})
+
+
+def test_round_trip(backend, algo):
+    mesociclo_id = backend.apriMesociclo("utente")
+    _salva(backend, mesociclo_id, algo)
+    caricato_id, stato, performance_data, doms_data = backend.caricaMesocicloAttivo("utente")
+    assert (caricato_id, stato) == (mesociclo_id, None)
+    assert _riassunto(performance_data) == _riassunto(algo.performance_data)
+    assert doms_data == algo.doms_data
+
+
+def test_scritture_ripetute_non_duplicano(backend, algo):
+    # una scrittura ritentata dopo un errore può arrivare su righe già salvate
+    mesociclo_id = backend.apriMesociclo("utente")
+    _salva(backend, mesociclo_id, algo)
+    _salva(backend, mesociclo_id, algo)
+    _, _, performance_data, doms_data = backend.caricaMesocicloAttivo("utente")
+    assert _riassunto(performance_data) == _riassunto(algo.performance_data)
+    assert doms_data == algo.doms_data
+
+
+def test_stato_aggiornato_e_nuovo_mesociclo(backend, algo):
+    primo = backend.apriMesociclo("utente")
+    _salva(backend, primo, algo)
+    backend.salvaStatoMesociclo(primo, STATO)
+    assert backend.caricaMesocicloAttivo("utente")[1] == STATO
+
+    secondo = backend.apriMesociclo("utente")
+    assert backend.caricaMesocicloAttivo("utente") == (secondo, None, {}, {})
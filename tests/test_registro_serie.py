@@ -0,0 +1,76 @@
+import random
+
+import pytest
+
+from model import registro_serie
+from model.adattaScheda import PerformanceData
+from model.registro_serie import RegistroSerie
+
+REP_RANGE = ("6-8", "8-12", "12-15")
+CONFRONTI = [(1, 2), (2, 3), (1, 3), (3, 1), (1, 9)]
+
+
+@pytest.fixture
+def sessioni():
+    # serie con carico o ripetizioni nulli comprese: non contano nelle medie
+    rng = random.Random(5)
+    sessioni = []
+    for _ in range(300):
+        settimana = rng.randint(1, 3)
+        sets = [(rng.choice([0.0, 20.0, 22.5, 40.0, 61.25]), rng.randint(0, 15), rng.choice(REP_RANGE))
+                for _ in range(rng.randint(0, 4))]
+        sessioni.append((settimana, PerformanceData(esercizio_id=rng.randint(1, 12), giorno=rng.randint(1, 3),
+                                                    settimana=settimana, muscolo_primario="Petto",
+                                                    mmc=rng.randint(1, 3), pump=rng.randint(1, 3),
+                                                    dolori_articolari=rng.randint(1, 3), sets=sets)))
+    return sessioni
+
+
+def _registro(sessioni):
+    registro = RegistroSerie()
+    for settimana, performance in sessioni:
+        registro.aggiungi(settimana, performance)
+    return registro
+
+
+def _risultati(registro):
+    return (list(registro.stime_1rm()), [list(registro.medie_1rm(settimana).items()) for settimana in (1, 2, 3, 9)],
+            [list(registro.miglioramento_percentuale(da, a).items()) for da, a in CONFRONTI])
+
+
+def test_python_puro_uguale_al_calcolo_per_sessione(sessioni, monkeypatch):
+    monkeypatch.setattr(registro_serie, "np", None)
+    registro = _registro(sessioni)
+    assert len(registro) == sum(len(performance.sets) for _, performance in sessioni)
+
+    for settimana in (1, 2, 3):
+        gruppi = {}
+        for s, performance in sessioni:
+            for carico, ripetizioni, rep_range in performance.sets:
+                one_rm = performance._calcola_1rm_epley(carico, ripetizioni)
+                if s == settimana and one_rm > 0:
+                    gruppi.setdefault((performance.esercizio_id, rep_range), []).append(one_rm)
+        assert registro.medie_1rm(settimana) == pytest.approx(
+            {chiave: sum(valori) / len(valori) for chiave, valori in gruppi.items()})
+
+
+def test_numpy_uguale_al_python_puro(sessioni, monkeypatch):
+    pytest.importorskip("numpy")
+    vettoriale = _risultati(_registro(sessioni))
+    monkeypatch.setattr(registro_serie, "np", None)
+    # stessi valori, bit per bit, e stesso ordine delle chiavi
+    assert vettoriale == _risultati(_registro(sessioni))
+
+
+def test_registro_aggiornato_dopo_nuove_serie(sessioni):
+    registro = _registro(sessioni[:100])
+    prima = registro.miglioramento_percentuale(1, 2)
+    for settimana, performance in sessioni[100:]:
+        registro.aggiungi(settimana, performance)
+    assert registro.miglioramento_percentuale(1, 2) == _registro(sessioni).miglioramento_percentuale(1, 2)
+    assert registro.miglioramento_percentuale(1, 2) != prima
+
+
+def test_registro_vuoto():
+    registro = RegistroSerie()
+    assert (len(registro), registro.medie_1rm(1), registro.miglioramento_percentuale(1, 2)) == (0, {}, {})
@@ -0,0 +1,75 @@
+import pytest
+
+from model.adattaScheda import PerformanceData, TrainingAlgorithm, rir_progressivo_per_durata
+
+
+def _sessione(esercizio_id, settimana, carico, ripetizioni=10, dolori=1):
+    return PerformanceData(esercizio_id=esercizio_id, giorno=1, settimana=settimana, muscolo_primario="Petto",
+                           mmc=2, pump=2, dolori_articolari=dolori, sets=[(carico, ripetizioni, "6-8")])
+
+
+def test_rir_progressivo_ricavato_dalla_durata():
+    assert TrainingAlgorithm().rir_progressivo == {1: 4, 2: 3, 3: 2}
+    rir = TrainingAlgorithm(settimane_mesociclo=5).rir_progressivo
+    assert list(rir) == [1, 2, 3, 4, 5]
+    assert rir[1] == 4 and rir[5] == 2
+    assert all(a >= b for a, b in zip(rir.values(), list(rir.values())[1:]))
+    with pytest.raises(ValueError):
+        rir_progressivo_per_durata(0)
+
+
+def test_perdita_di_performance_sull_ultima_settimana_del_mesociclo():
+    algo = TrainingAlgorithm(settimane_mesociclo=5)
+    algo.aggiungi_performance(4, _sessione(1, 4, 100))
+    algo.aggiungi_performance(5, _sessione(1, 5, 90))
+    algo.aggiungi_performance(3, _sessione(1, 3, 100))
+    assert algo.performance_data[5][0].perdita_performance == pytest.approx(10)
+    assert algo.performance_data[3][0].perdita_performance == 0
+
+
+def test_nuovo_mesociclo_conserva_lo_storico():
+    algo = TrainingAlgorithm()
+    for settimana in (1, 2, 3):
+        algo.aggiungi_performance(settimana, _sessione(1, settimana, 100 + settimana))
+    primo = algo.archivio
+    algo.nuovo_mesociclo(settimane=4)
+    algo.aggiungi_performance(1, _sessione(1, 1, 110))
+
+    assert algo.performance_data == {1: [algo.performance_data[1][0]]}
+    assert algo.storico.mesocicli == [primo, algo.archivio]
+    assert algo.rir_progressivo == rir_progressivo_per_durata(4)
+    # la settimana 1 del secondo mesociclo prosegue la numerazione assoluta
+    assert algo.storico.settimana_assoluta(1) == 4
+    assert algo.storico.posizione(4) == (1, 1)
+    assert [s for s, _ in algo.storico.andamento_1rm(1)] == [1, 2, 3, 4]
+
+
+def test_mesociclo_vuoto_non_resta_nello_storico():
+    algo = TrainingAlgorithm()
+    algo.nuovo_mesociclo()
+    algo.nuovo_mesociclo()
+    assert len(algo.storico.mesocicli) == 1
+
+
+def test_finestra_1rm_e_tendenza():
+    algo = TrainingAlgorithm()
+    for mesociclo in range(4):
+        for settimana in (1, 2, 3):
+            algo.aggiungi_performance(settimana, _sessione(7, settimana, 100 + 10 * (3 * mesociclo + settimana)))
+        algo.nuovo_mesociclo()
+    andamento = algo.storico.andamento_1rm(7, ultime_settimane=3)
+    assert [s for s, _ in andamento] == [10, 11, 12]
+    # 1RM di Epley con 10 ripetizioni: +10 kg di carico a settimana
+    assert algo.storico.tendenza_1rm(7, 6) == pytest.approx(10 * (1 + 10 / 30))
+    assert algo.storico.tendenza_1rm(7, 1) is None
+    assert algo.storico.andamento_1rm(99) == []
+
+
+def test_sfr_medio_su_finestra_tra_mesocicli():
+    algo = TrainingAlgorithm()
+    algo.aggiungi_performance(3, _sessione(1, 3, 100, dolori=2))
+    algo.nuovo_mesociclo()
+    algo.aggiungi_performance(1, _sessione(1, 1, 100, dolori=4))
+    # RSM 4: SFR 2 nella settimana 3 e 1 nella prima settimana del mesociclo successivo
+    assert algo.storico.sfr_medio(1, 3, 4) == pytest.approx(1.5)
+    assert algo.storico.sfr_medio(1, 1, 2) is None
@@ -0,0 +1,59 @@
+import copy
+import pickle
+from datetime import datetime
+
+import pytest
+
+from model.creascheda import Model
+
+
+@pytest.fixture
+def giorno(catalogo_fittizio):
+    settimana = Model().getSchedaFullBodyIntermedio("Palestra Completa", "Petto", 3, seed=1,
+                                                    data_inizio=datetime(2025, 1, 6))
+    giorno = max(settimana.workout_days, key=lambda day: len(day.esercizi))
+    assert sum(prescrizione.serie > 1 for prescrizione in giorno.performance_log.values()) >= 2
+    return giorno
+
+
+def _ridotti(giorno):
+    return [esercizio.id for esercizio in giorno.esercizi if giorno.performance_log[esercizio.id].serie > 1]
+
+
+def test_aggiustamenti_ricreano_solo_le_voci_modificate(giorno):
+    ridotto = _ridotti(giorno)[0]
+    aggiustato = giorno.con_aggiustamenti({ridotto: 1}, 2, "Giorno giallo")
+
+    assert aggiustato.esercizi is giorno.esercizi
+    assert aggiustato.performance_log[ridotto].serie == giorno.performance_log[ridotto].serie - 1
+    assert len(aggiustato.performance_log[ridotto].zone) == aggiustato.performance_log[ridotto].serie
+    assert all(aggiustato.performance_log[ex_id] is prescrizione
+               for ex_id, prescrizione in giorno.performance_log.items() if ex_id != ridotto)
+    assert (aggiustato.rir_adjustment, aggiustato.adjustment_message) == (2, "Giorno giallo")
+    assert (giorno.rir_adjustment, giorno.adjustment_message) == (0, "")
+
+
+def test_riduzioni_senza_effetto_condividono_il_log(giorno):
+    # esercizi assenti, riduzioni nulle e serie già al minimo non creano un nuovo log
+    al_minimo = [esercizio.id for esercizio in giorno.esercizi if giorno.performance_log[esercizio.id].serie == 1]
+    riduzioni = {-1: 2, _ridotti(giorno)[0]: 0, **{ex_id: 1 for ex_id in al_minimo}}
+    assert giorno.con_aggiustamenti(riduzioni).performance_log is giorno.performance_log
+
+
+def test_riduzione_minimo_una_serie(giorno):
+    ridotto = _ridotti(giorno)[0]
+    assert giorno.con_aggiustamenti({ridotto: 99}).performance_log[ridotto].serie == 1
+
+
+def test_riposo(giorno):
+    riposo = giorno.come_riposo("Riposo")
+    assert (riposo.esercizi, dict(riposo.performance_log), riposo.adjustment_message) == ((), {}, "Riposo")
+    assert giorno.esercizi
+
+
+def test_copie_e_pickle(giorno):
+    assert copy.deepcopy(giorno.performance_log) is giorno.performance_log
+    ripristinato = pickle.loads(pickle.dumps(giorno))
+    assert ripristinato == giorno
+    assert str(ripristinato) == str(giorno)
+    assert ripristinato.esercizi_per_muscolo == giorno.esercizi_per_muscolo